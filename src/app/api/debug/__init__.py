@@ -0,0 +1 @@
+"""Пакет для отладочного api."""
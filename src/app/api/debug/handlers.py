@@ -0,0 +1,8 @@
+from app.api.routes import debug
+from app.system.loop_monitor import LoopStats, loop_monitor
+
+
+@debug.get('/loop')
+async def loop_stats() -> LoopStats:
+    """Статистика цикла событий и стеки последних блокирующих вызовов."""
+    return loop_monitor.stats()
@@ -1,16 +1,50 @@
 from typing import Annotated
 
 from fastapi import Depends, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
-from app.api import routes
-from app.api.models import Report, Token
+from app.api import limits, routes
+from app.api.models import Report, Token, validation_rules
 from app.external.clients import clients
+from app.external.streaming import ReportStream
+from app.system.serialization import ModelResponse
+from config.config import get_settings
+
+is_upload_streamed = get_settings().verify_upload.streaming
+verify_upload = (
+    clients.auth_client.verify_stream
+    if is_upload_streamed
+    else clients.auth_client.verify
+)
+verify_upload_body = {
+    'requestBody': {
+        'required': True,
+        'content': {
+            'multipart/form-data': {
+                'schema': {
+                    'type': 'object',
+                    'required': ['username', 'upload_file'],
+                    'properties': {
+                        'username': {
+                            'type': 'string',
+                            'maxLength': validation_rules.username_max_len,
+                        },
+                        'upload_file': {'type': 'string', 'format': 'binary'},
+                    },
+                },
+            },
+        },
+    },
+}
 
 
-@routes.auth.post('/login')
-def authenticate(
+@routes.auth.post(
+    '/login', response_model=Token, dependencies=limits.user_limits,
+)
+async def authenticate(
     token: Annotated[Token, Depends(clients.auth_client.authenticate)],
-) -> Token:
+) -> ModelResponse:
     """
     Аутентифицирует пользователя.
 
@@ -20,15 +54,17 @@ def authenticate(
     :param token: Токен получаемый от клиента сервиса auth.
     :type token: Token
     :return: Токен пользователя.
-    :rtype: Token
+    :rtype: ModelResponse
     """
-    return token
+    return ModelResponse(token)
 
 
-@routes.auth.post('/register')
-def register(
+@routes.auth.post(
+    '/register', response_model=Token, dependencies=limits.user_limits,
+)
+async def register(
     token: Annotated[Token, Depends(clients.auth_client.register)],
-) -> Token:
+) -> ModelResponse:
     """
     Регистрирует пользователя.
 
@@ -38,50 +74,60 @@ def register(
     :param token: Токен получаемый от клиента сервиса auth.
     :type token: Token
     :return: Токен пользователя.
-    :rtype: Token
+    :rtype: ModelResponse
     """
-    return token
+    return ModelResponse(token)
 
 
 @routes.auth.post(
-    '/verify', dependencies=[Depends(clients.auth_client.check_token)],
+    '/verify',
+    response_model=dict[str, str],
+    dependencies=[Depends(clients.auth_client.check_token)],
+    openapi_extra=verify_upload_body if is_upload_streamed else None,
 )
-def verify(
-    message: Annotated[dict[str, str], Depends(clients.auth_client.verify)],
-) -> dict[str, str]:
+async def verify(
+    message: Annotated[dict[str, str], Depends(verify_upload)],
+) -> ModelResponse:
     """
     Верифицирует пользователя.
 
     Валидирует токен пользователя,
-    загружает изображение пользователя.
+    загружает изображение пользователя. Если включена потоковая
+    передача, изображение передается сервису auth по мере получения.
 
     :param message: Сообщение о успешности операции.
     :type message: dict[str, str]
     :return: Сообщение о успешности операции.
-    :rtype: dict[str, str]
+    :rtype: ModelResponse
     """
-    return message
+    return ModelResponse(message)
 
 
-@routes.transaction.post('/transaction', status_code=status.HTTP_201_CREATED)
-def create_transaction(
+@routes.transaction.post(
+    '/transaction',
+    response_model=dict[str, str],
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_transaction(
     message: Annotated[dict[str, str], Depends(clients.transactions_client.create_transaction)],  # noqa: E501 annotation
-) -> dict[str, str]:
+) -> ModelResponse:
     """
     Создает транзакцию.
 
     :param message: Сообщение о успешности операции.
     :type message: dict[str, str]
     :return: Сообщение о успешности операции.
-    :rtype: dict[str, str]
+    :rtype: ModelResponse
     """
-    return message
+    return ModelResponse(message, status_code=status.HTTP_201_CREATED)
 
 
-@routes.transaction.post('/report')
-def create_report(
+@routes.transaction.post(
+    '/report', response_model=Report, dependencies=limits.report_limits,
+)
+async def create_report(
     report: Annotated[Report, Depends(clients.transactions_client.get_report)],
-) -> Report:
+) -> ModelResponse:
     """
     Создает отчет о транзакциях.
 
@@ -90,6 +136,32 @@ def create_report(
     :param report: Отчет о транзакциях созданный клиентом сервиса транзакций.
     :type report: Report
     :return: Отчет о транзакциях.
-    :rtype: Report
+    :rtype: ModelResponse
+    """
+    return ModelResponse(report)
+
+
+@routes.transaction.post(
+    '/report/stream',
+    response_class=StreamingResponse,
+    dependencies=limits.report_limits,
+)
+async def stream_report(
+    report: Annotated[ReportStream, Depends(clients.transactions_client.stream_report)],  # noqa: E501 annotation
+) -> StreamingResponse:
+    """
+    Создает отчет о транзакциях в потоковом режиме.
+
+    Транзакции выдаются клиенту по мере получения от сервиса
+    транзакций в формате NDJSON или JSON массива.
+
+    :param report: Потоковый отчет созданный клиентом сервиса транзакций.
+    :type report: ReportStream
+    :return: Потоковый ответ с транзакциями.
+    :rtype: StreamingResponse
     """
-    return report
+    return StreamingResponse(
+        report.encode(),
+        media_type=report.media_type,
+        background=BackgroundTask(report.close),
+    )
@@ -1,9 +1,10 @@
 import logging
-
-from fastapi import Depends
+from typing import Any
 
 from app.api.routes import healthz
-from app.external.clients import clients
+from app.external.readiness import readiness_checker
+from app.external.stats import breaker_stats
+from app.system import errors
 
 logger = logging.getLogger(__name__)
 
@@ -18,13 +19,33 @@ async def up_check() -> dict[str, str]:
     return up_message
 
 
-@healthz.get(
-    '/ready',
-    dependencies=[
-        Depends(clients.auth_client.is_ready),
-        Depends(clients.transactions_client.is_ready),
-    ],
-)
-async def ready_check() -> dict[str, str]:
-    """Healthcheck для зависимостей приложения."""
-    return ready_message
+@healthz.get('/ready')
+async def ready_check() -> dict[str, Any]:
+    """
+    Healthcheck для зависимостей приложения и их автоматов защиты.
+
+    Ответ формируется по результатам фоновой проверки готовности
+    зависимостей без запросов к ним.
+
+    :return: Готовность и длительность проверки зависимостей.
+    :rtype: dict[str, Any]
+    :raises ServerError: Если какая-либо зависимость не готова.
+    """
+    dependencies = await readiness_checker.current()
+    not_ready = [
+        dependency.name
+        for dependency in dependencies
+        if not dependency.is_ready
+    ]
+    if not_ready:
+        logger.error(f'dependencies are not ready: {not_ready}')
+        raise errors.ServerError()
+    breakers = {stats.name: stats.state for stats in breaker_stats()}
+    return {
+        **ready_message,
+        'dependencies': {
+            dependency.name: {'latency': dependency.latency}
+            for dependency in dependencies
+        },
+        'breakers': breakers,
+    }
@@ -0,0 +1,57 @@
+from typing import Annotated
+
+from fastapi import Depends, Request
+
+from app.api.models import ReportRequest, UserCredentials
+from app.external.auth import header_scheme
+from app.external.cache import hash_token
+from app.system.ratelimit import rate_limiter
+
+
+async def limit_user(request: Request, user_creds: UserCredentials) -> None:
+    """
+    Ограничивает частоту запросов по имени пользователя из данных входа.
+
+    :param request: Запрос к сервису.
+    :type request: Request
+    :param user_creds: Данные аутентификации пользователя.
+    :type user_creds: UserCredentials
+    """
+    await rate_limiter.check(
+        request.scope['route'].path, f'user:{user_creds.username}',
+    )
+
+
+async def limit_report_user(
+    request: Request, report_request: ReportRequest,
+) -> None:
+    """
+    Ограничивает частоту запросов по имени пользователя из запроса отчета.
+
+    :param request: Запрос к сервису.
+    :type request: Request
+    :param report_request: Запрос на получение отчета.
+    :type report_request: ReportRequest
+    """
+    await rate_limiter.check(
+        request.scope['route'].path, f'user:{report_request.username}',
+    )
+
+
+async def limit_token(
+    request: Request, token: Annotated[str, Depends(header_scheme)],
+) -> None:
+    """
+    Ограничивает частоту запросов по хэшу токена пользователя.
+
+    :param request: Запрос к сервису.
+    :type request: Request
+    :param token: Токен пользователя.
+    :type token: str
+    """
+    token_hash = hash_token(token).hex()
+    await rate_limiter.check(request.scope['route'].path, f'token:{token_hash}')
+
+
+user_limits = [Depends(limit_user)]
+report_limits = [Depends(limit_token), Depends(limit_report_user)]
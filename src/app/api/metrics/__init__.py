@@ -0,0 +1 @@
+"""Пакет для api выгрузки метрик."""
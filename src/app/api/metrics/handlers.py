@@ -0,0 +1,96 @@
+from fastapi.responses import PlainTextResponse
+
+from app.api.routes import metrics
+from app.external.breaker import BreakerState
+from app.external.stats import (
+    breaker_stats,
+    cache_stats,
+    endpoint_stats,
+    flight_stats,
+    pool_stats,
+    retry_stats,
+)
+from app.metrics import instrumentation
+from app.metrics.registry import content_type
+from app.system.admission import admission_limiter
+
+
+@metrics.get('/metrics', response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """Выгрузка метрик сервиса в формате Prometheus."""
+    _collect_client_stats()
+    _collect_breaker_stats()
+    _collect_retry_stats()
+    _collect_flight_stats()
+    _collect_admission_stats()
+    return PlainTextResponse(
+        instrumentation.registry.render(), media_type=content_type,
+    )
+
+
+def _collect_admission_stats() -> None:
+    admission = admission_limiter.stats()
+    instrumentation.admission_limit.labels().set(admission.limit)
+    instrumentation.admission_in_flight.labels().set(admission.in_flight)
+    instrumentation.admission_queued.labels().set(admission.queued)
+    for priority, rejected in admission.rejected.items():
+        instrumentation.admission_rejected.labels(priority).set(rejected)
+
+
+def _collect_breaker_stats() -> None:
+    for breaker in breaker_stats():
+        for state in BreakerState:
+            labels = (breaker.name, state)
+            instrumentation.breaker_state.labels(*labels).set(
+                int(breaker.state is state),
+            )
+            instrumentation.breaker_transitions.labels(*labels).set(
+                breaker.transitions.get(state, 0),
+            )
+
+
+def _collect_retry_stats() -> None:
+    for retry in retry_stats():
+        instrumentation.upstream_retries.labels(retry.name).set(retry.retries)
+        instrumentation.upstream_hedges.labels(retry.name).set(retry.hedges)
+        instrumentation.upstream_hedge_wins.labels(retry.name).set(
+            retry.hedge_wins,
+        )
+        instrumentation.retry_budget_exhausted.labels(retry.name).set(
+            retry.budget_exhausted,
+        )
+
+
+def _collect_flight_stats() -> None:
+    for service, groups in flight_stats().items():
+        for group, flights in groups.items():
+            instrumentation.flight_executions.labels(service, group).set(
+                flights.executions,
+            )
+            instrumentation.flight_merged.labels(service, group).set(
+                flights.merged,
+            )
+
+
+def _collect_client_stats() -> None:
+    for pool in pool_stats():
+        instrumentation.pool_in_flight.labels(pool.name).set(pool.in_flight)
+        instrumentation.pool_max_connections.labels(pool.name).set(
+            pool.max_connections,
+        )
+    for endpoint in endpoint_stats():
+        labels = (endpoint.service, endpoint.address)
+        instrumentation.upstream_in_flight.labels(*labels).set(
+            endpoint.in_flight,
+        )
+        instrumentation.upstream_ejected.labels(*labels).set(
+            int(endpoint.is_ejected),
+        )
+        instrumentation.upstream_ejections.labels(*labels).set(
+            endpoint.ejections_total,
+        )
+    for cache_name, stats in cache_stats().items():
+        instrumentation.cache_hits.labels(cache_name).set(stats.hits)
+        instrumentation.cache_misses.labels(cache_name).set(stats.misses)
+        instrumentation.cache_hit_ratio.labels(cache_name).set(stats.hit_ratio)
+        instrumentation.cache_size.labels(cache_name).set(stats.size)
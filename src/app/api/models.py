@@ -1,9 +1,15 @@
 from collections import namedtuple
 from datetime import datetime
-from enum import IntEnum
+from enum import IntEnum, StrEnum
 from typing import Self
 
-from pydantic import BaseModel, Field, field_serializer, model_validator
+from pydantic import (
+    BaseModel,
+    Field,
+    TypeAdapter,
+    field_serializer,
+    model_validator,
+)
 
 ValidationRules = namedtuple(
     'ValidationRules',
@@ -11,6 +17,7 @@ ValidationRules = namedtuple(
         'username_max_len',
         'password_max_len',
         'password_min_len',
+        'idempotency_key_max_len',
     ],
 )
 
@@ -18,6 +25,7 @@ validation_rules = ValidationRules(
     username_max_len=50,  # noqa: WPS432 not magic
     password_max_len=100,
     password_min_len=8,
+    idempotency_key_max_len=255,  # noqa: WPS432 not magic
 )
 
 
@@ -78,6 +86,9 @@ class Transaction(BaseModel):
         return timestamp.isoformat()
 
 
+transactions_adapter = TypeAdapter(list[Transaction])
+
+
 class ReportRequest(BaseModel):
     """Запрос на получения отчета."""
 
@@ -122,3 +133,15 @@ class Report(BaseModel):
 
     request: ReportRequest = Field(title='Параметры запрошенного отчета')
     transactions: list[Transaction] = Field(title='Список транзакций')
+
+
+class ReportFormat(StrEnum):
+    """
+    Формат потоковой выдачи отчета.
+
+    ndjson - транзакции по одной в строке,
+    json - JSON массив транзакций.
+    """
+
+    ndjson = 'ndjson'
+    json = 'json'
@@ -12,3 +12,5 @@ transaction = APIRouter(
     dependencies=[Depends(clients.auth_client.check_token)],
 )
 healthz = APIRouter(prefix='/healthz', tags=['healthz'])
+metrics = APIRouter(tags=['metrics'])
+debug = APIRouter(prefix='/debug', tags=['debug'])
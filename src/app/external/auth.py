@@ -0,0 +1,239 @@
+import logging
+from functools import partial
+from typing import Annotated
+
+from fastapi import Depends, Form, Request, UploadFile
+from fastapi.security import APIKeyHeader
+
+from app.api.models import Token, UserCredentials, validation_rules
+from app.external.balancer import Upstream
+from app.external.cache import TokenStatusCache, hash_token
+from app.external.payloads import TokenPayload
+from app.external.service_client import Key, ServiceClient, good_response
+from app.external.tokens import LocalTokenVerifier, TokenDecision
+from app.external.uploads import MultipartRelay
+from app.metrics.tracing import ChildSpan
+from app.system import errors, serialization
+from config.config import (
+    BreakerSettings,
+    RetrySettings,
+    TokenCacheSettings,
+    VerifyUploadSettings,
+    get_settings,
+)
+
+logger = logging.getLogger(__name__)
+
+verify_upload_renames = {'upload_file': 'image'}
+
+header_scheme = APIKeyHeader(
+    name='Authorization',
+    description='Токен аутентификации',
+)
+
+
+class AuthServiceClient(ServiceClient):  # noqa: WPS214 auth service API
+    """Клиент для доступа к сервису аутентификации."""
+
+    service_name = 'authentication'
+
+    def __init__(  # noqa: WPS211 optional client features
+        self,
+        client: Upstream,
+        token_cache: TokenCacheSettings | None = None,
+        token_verifier: LocalTokenVerifier | None = None,
+        breaker: BreakerSettings | None = None,
+        retries: dict[str, RetrySettings] | None = None,
+        verify_upload: VerifyUploadSettings | None = None,
+    ) -> None:
+        """
+        Метод инициализации.
+
+        :param client: Клиент для создания запросов.
+        :type client: Upstream
+        :param token_cache: Конфигурация кэша проверки токенов.
+        :type token_cache: TokenCacheSettings | None
+        :param token_verifier: Объект локальной проверки токенов.
+        :type token_verifier: LocalTokenVerifier | None
+        :param breaker: Конфигурация автомата защиты сервиса.
+        :type breaker: BreakerSettings | None
+        :param retries: Конфигурация повторов по методам клиента.
+        :type retries: dict[str, RetrySettings] | None
+        :param verify_upload: Конфигурация передачи изображений.
+        :type verify_upload: VerifyUploadSettings | None
+        """
+        super().__init__(client, breaker, retries)
+        self.token_verifier = token_verifier
+        self.token_cache = TokenStatusCache(
+            token_cache or get_settings().token_cache,
+        )
+        self.verify_upload = verify_upload or get_settings().verify_upload
+
+    async def register(self, user_creds: UserCredentials) -> Token:
+        """
+        Метод аутентификации пользователя.
+
+        :param user_creds: Данные авторизации пользователя.
+        :type user_creds: UserCredentials
+        :return: Токен пользователя
+        :rtype: Token
+        """
+        with ChildSpan('register') as span:
+            span.set_tag('register_data', user_creds.username)
+            resp = await self._call(
+                self.client.post,
+                '/register',
+                **serialization.json_request(user_creds),
+            )
+            span.set_tag(Key.response_status, resp.status_code)
+            errors.handle_status_code(resp.status_code)
+            logger.info(f'successful register for {user_creds.username}')
+            payload = serialization.validate_json(TokenPayload, resp.content)
+            return Token(token=payload.encoded_token or '')
+
+    async def authenticate(
+        self,
+        user_creds: UserCredentials,
+        token: Annotated[str, Depends(header_scheme)],
+    ) -> Token:
+        """
+        Метод аутентификации пользователя.
+
+        :param user_creds: Данные авторизации пользователя.
+        :type user_creds: UserCredentials
+        :param token: токен пользователя
+        :type token: str
+        :return: Токен пользователя
+        :rtype: Token
+        """
+        with ChildSpan('login') as span:
+            span.set_tag('authentication_data', user_creds.username)
+            headers = {str(Key.authorization): token}
+            resp = await self._call(
+                self.client.post,
+                '/login',
+                **serialization.json_request(user_creds, headers),
+            )
+            span.set_tag(Key.response_status, resp.status_code)
+            errors.handle_status_code(resp.status_code)
+            logger.info(f'successful login for {user_creds.username}')
+            payload = serialization.validate_json(TokenPayload, resp.content)
+            return Token(token=payload.encoded_token)  # type: ignore[arg-type]
+
+    async def verify(
+        self,
+        username: Annotated[str, Form(max_length=validation_rules.username_max_len)],  # noqa: E501 can't shorten hint
+        upload_file: UploadFile,
+    ) -> dict[str, str]:
+        """
+        Метод верификации пользователя.
+
+        Изображение читается асинхронно целиком и передается сервису
+        auth одним телом.
+
+        :param username: Имя пользователя.
+        :type username: str
+        :param upload_file: Изображение пользователя
+        :type upload_file: UploadFile
+        :return: Сообщение
+        :rtype: dict[str, str]
+        """
+        with ChildSpan('verify') as span:
+            span.set_tag('verification_data', username)
+            files = {
+                'image': (
+                    upload_file.filename,
+                    await upload_file.read(),
+                    upload_file.content_type,
+                ),
+            }
+            resp = await self._call(
+                self.client.post,
+                '/verify',
+                files=files,
+                data={'username': username},
+            )
+            span.set_tag(Key.response_status, resp.status_code)
+            errors.handle_status_code(resp.status_code)
+            logger.info(f'verification for {username}')
+            return good_response
+
+    async def verify_stream(self, request: Request) -> dict[str, str]:
+        """
+        Метод верификации пользователя с потоковой передачей изображения.
+
+        Multipart тело запроса передается сервису auth по частям по
+        мере получения, без сохранения изображения в память или на
+        диск. Часть upload_file передается под именем image.
+
+        :param request: Запрос к сервису с multipart телом.
+        :type request: Request
+        :return: Сообщение
+        :rtype: dict[str, str]
+        """
+        relay = MultipartRelay(
+            request, self.verify_upload, verify_upload_renames,
+        )
+        with ChildSpan('verify') as span:
+            resp = await self._call(
+                self.client.post,
+                '/verify',
+                content=relay,
+                headers={'Content-Type': relay.content_type},
+            )
+            username = relay.fields.get('username')
+            span.set_tag('verification_data', username)
+            span.set_tag(Key.response_status, resp.status_code)
+            errors.handle_status_code(resp.status_code)
+            logger.info(f'verification for {username}')
+            return good_response
+
+    async def check_token(
+        self, token: Annotated[str, Depends(header_scheme)],
+    ) -> None:
+        """
+        Валидирует токен пользователя.
+
+        Если включена локальная проверка, токен проверяется без
+        обращения к сервису auth. Сервис auth проверяет только токены,
+        которые нельзя проверить локально.
+
+        Результат проверки сервисом auth сохраняется в кэш: успешный
+        на время ttl, отказ в авторизации на время negative_ttl.
+        Одновременные проверки одного токена объединяются в один запрос.
+
+        :param token: Заголовок с токеном пользователя
+        :type token: str
+        """
+        if self._is_verified_locally(token):
+            return
+        token_key = hash_token(token)
+        status_code = self.token_cache.get(token_key)
+        if status_code is None:
+            status_code = await self.flights.run(
+                'check_token',
+                token_key,
+                partial(self._check_token_remote, token, token_key),
+            )
+        errors.handle_status_code(status_code)
+
+    async def _check_token_remote(self, token: str, token_key: bytes) -> int:
+        with ChildSpan('check_token') as span:
+            headers = {str(Key.authorization): token}
+            resp = await self._call_idempotent(
+                'check_token',
+                self.client.post,
+                '/check_token',
+                headers=headers,
+            )
+            span.set_tag(Key.response_status, resp.status_code)
+            self.token_cache.remember(token_key, resp.status_code)
+            return resp.status_code
+
+    def _is_verified_locally(self, token: str) -> bool:
+        if self.token_verifier is None:
+            return False
+        decision = self.token_verifier.verify(token)
+        if decision is TokenDecision.invalid:
+            raise errors.UnauthorizedError()
+        return decision is TokenDecision.valid
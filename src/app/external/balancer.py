@@ -0,0 +1,358 @@
+import asyncio
+import logging
+import random
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from enum import StrEnum
+
+import httpx
+from fastapi import status
+
+from app.external.pool import Client, PoolStats
+from config.config import BalancerSettings
+
+logger = logging.getLogger(__name__)
+
+
+class BalancingStrategy(StrEnum):
+    """Способ выбора экземпляра внешнего сервиса."""
+
+    least_outstanding = 'least_outstanding'
+    power_of_two_choices = 'p2c'
+
+
+@dataclass
+class EndpointStats:
+    """Статистика экземпляра внешнего сервиса."""
+
+    service: str
+    address: str
+    in_flight: int
+    requests_total: int
+    consecutive_failures: int
+    ejections_total: int
+    is_ejected: bool
+
+
+class Endpoint:
+    """Экземпляр внешнего сервиса с собственным пулом соединений."""
+
+    def __init__(self, address: str, client: Client) -> None:
+        """
+        Метод инициализации.
+
+        :param address: Адрес экземпляра в виде host:port.
+        :type address: str
+        :param client: Клиент с пулом соединений к экземпляру.
+        :type client: Client
+        """
+        self.address = address
+        self.client = client
+        self.consecutive_failures = 0
+        self.ejections_total = 0
+        self.ejected_until: float | None = None
+        self._backoff_level = 0
+
+    @property
+    def is_ejected(self) -> bool:
+        """
+        Исключен ли экземпляр из балансировки.
+
+        :return: Исключен ли экземпляр.
+        :rtype: bool
+        """
+        return self.ejected_until is not None
+
+    def is_probe_due(self, now: float) -> bool:
+        """
+        Истекло ли время исключения экземпляра.
+
+        :param now: Текущее время time.monotonic.
+        :type now: float
+        :return: Нужно ли проверить экземпляр.
+        :rtype: bool
+        """
+        ejected_until = self.ejected_until
+        return ejected_until is not None and ejected_until <= now
+
+    def eject(self, balancer: BalancerSettings) -> None:
+        """
+        Исключает экземпляр из балансировки.
+
+        Каждое повторное исключение без успешной проверки удваивает
+        время исключения, но не больше max_ejection_duration.
+
+        :param balancer: Конфигурация балансировки.
+        :type balancer: BalancerSettings
+        """
+        duration = min(
+            balancer.ejection_duration * 2 ** self._backoff_level,
+            balancer.max_ejection_duration,
+        )
+        self.ejected_until = time.monotonic() + duration
+        self.ejections_total += 1
+        self._backoff_level += 1
+
+    def readmit(self) -> None:
+        """Возвращает экземпляр в балансировку."""
+        self.ejected_until = None
+        self.consecutive_failures = 0
+        self._backoff_level = 0
+
+    def stats(self, service: str) -> EndpointStats:
+        """
+        Возвращает статистику экземпляра.
+
+        :param service: Имя внешнего сервиса.
+        :type service: str
+        :return: Статистика экземпляра.
+        :rtype: EndpointStats
+        """
+        pool = self.client.stats()
+        return EndpointStats(
+            service=service,
+            address=self.address,
+            in_flight=pool.in_flight,
+            requests_total=pool.requests_total,
+            consecutive_failures=self.consecutive_failures,
+            ejections_total=self.ejections_total,
+            is_ejected=self.is_ejected,
+        )
+
+
+class UpstreamGroup:  # noqa: WPS214 client interface and health steps
+    """
+    Группа экземпляров внешнего сервиса.
+
+    Повторяет интерфейс Client и распределяет запросы между
+    экземплярами: экземпляр с наименьшим числом выполняемых запросов
+    (least_outstanding) или лучший из двух случайных (p2c). Экземпляр
+    после failure_threshold ошибок соединения или ответов 5xx подряд
+    исключается из балансировки, но не больше max_ejection_ratio
+    экземпляров группы. Фоновая задача проверяет исключенные
+    экземпляры по истечении времени исключения запросом probe_path
+    и возвращает их в балансировку при успешном ответе.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        endpoints: list[Endpoint],
+        balancer: BalancerSettings,
+    ) -> None:
+        """
+        Метод инициализации.
+
+        :param name: Имя внешнего сервиса.
+        :type name: str
+        :param endpoints: Экземпляры внешнего сервиса.
+        :type endpoints: list[Endpoint]
+        :param balancer: Конфигурация балансировки.
+        :type balancer: BalancerSettings
+        """
+        self.name = name
+        self.endpoints = endpoints
+        self.settings = balancer
+        self.strategy = BalancingStrategy(balancer.strategy)
+        self._turn = 0
+        self._prober: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """Создает пулы соединений и запускает проверку экземпляров."""
+        for endpoint in self.endpoints:
+            await endpoint.client.start()
+        if self._prober is None:
+            self._prober = asyncio.create_task(self._probe_ejected())
+
+    async def close(self) -> None:
+        """Останавливает проверку экземпляров и закрывает пулы."""
+        if self._prober is not None:
+            self._prober.cancel()
+            await asyncio.gather(self._prober, return_exceptions=True)
+            self._prober = None
+        for endpoint in self.endpoints:
+            await endpoint.client.close()
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """
+        Метод GET.
+
+        :param url: Путь запроса.
+        :type url: str
+        :param kwargs: Параметры запроса.
+        :return: Ответ сервиса.
+        :rtype: httpx.Response
+        """
+        endpoint = self.pick()
+        return await self._send(endpoint, endpoint.client.get, url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        """
+        Метод POST.
+
+        :param url: Путь запроса.
+        :type url: str
+        :param kwargs: Параметры запроса.
+        :return: Ответ сервиса.
+        :rtype: httpx.Response
+        """
+        endpoint = self.pick()
+        return await self._send(endpoint, endpoint.client.post, url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(
+        self, method: str, url: str, **kwargs,
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Выполняет запрос с потоковым чтением тела ответа.
+
+        :param method: HTTP метод.
+        :type method: str
+        :param url: Путь запроса.
+        :type url: str
+        :param kwargs: Параметры запроса.
+        :yield: Ответ сервиса с непрочитанным телом.
+        :ytype: httpx.Response
+        :raises httpx.TransportError: При ошибке соединения с экземпляром.
+        """
+        endpoint = self.pick()
+        try:
+            async with endpoint.client.stream(method, url, **kwargs) as resp:
+                self.record(endpoint, _is_failure(resp.status_code))
+                yield resp
+        except httpx.TransportError:
+            self.record(endpoint, is_failure=True)
+            raise
+
+    def pick(self) -> Endpoint:
+        """
+        Выбирает экземпляр для запроса.
+
+        Если исключены все экземпляры, выбор идет среди всех.
+
+        :return: Экземпляр внешнего сервиса.
+        :rtype: Endpoint
+        """
+        candidates = [
+            endpoint for endpoint in self.endpoints if not endpoint.is_ejected
+        ] or self.endpoints
+        if len(candidates) == 1:
+            return candidates[0]
+        if self.strategy is BalancingStrategy.power_of_two_choices:
+            candidates = random.sample(candidates, 2)  # noqa: S311 balancing
+        else:
+            self._turn = (self._turn + 1) % len(candidates)
+            candidates = candidates[self._turn:] + candidates[:self._turn]
+        return min(candidates, key=_outstanding)
+
+    def record(self, endpoint: Endpoint, is_failure: bool) -> None:
+        """
+        Учитывает результат запроса к экземпляру.
+
+        :param endpoint: Экземпляр внешнего сервиса.
+        :type endpoint: Endpoint
+        :param is_failure: Завершился ли запрос отказом экземпляра.
+        :type is_failure: bool
+        """
+        if not is_failure:
+            endpoint.consecutive_failures = 0
+            return
+        endpoint.consecutive_failures += 1
+        is_over_threshold = (
+            endpoint.consecutive_failures >= self.settings.failure_threshold
+        )
+        if is_over_threshold and self._can_eject(endpoint):
+            endpoint.eject(self.settings)
+            logger.warning(f'{self.name} endpoint {endpoint.address} ejected')
+
+    def stats(self) -> PoolStats:
+        """
+        Возвращает суммарную статистику пулов соединений группы.
+
+        :return: Статистика пулов соединений.
+        :rtype: PoolStats
+        """
+        pools = [endpoint.client.stats() for endpoint in self.endpoints]
+        return PoolStats(
+            name=self.name,
+            max_connections=sum(pool.max_connections for pool in pools),
+            in_flight=sum(pool.in_flight for pool in pools),
+            max_in_flight=sum(pool.max_in_flight for pool in pools),
+            requests_total=sum(pool.requests_total for pool in pools),
+            is_open=any(pool.is_open for pool in pools),
+        )
+
+    def endpoint_stats(self) -> list[EndpointStats]:
+        """
+        Возвращает статистику экземпляров группы.
+
+        :return: Статистика экземпляров.
+        :rtype: list[EndpointStats]
+        """
+        return [endpoint.stats(self.name) for endpoint in self.endpoints]
+
+    async def probe(self, endpoint: Endpoint) -> None:
+        """
+        Проверяет исключенный экземпляр и возвращает его в балансировку.
+
+        При ошибке проверки экземпляр исключается снова.
+
+        :param endpoint: Исключенный экземпляр.
+        :type endpoint: Endpoint
+        """
+        try:
+            resp = await endpoint.client.get(self.settings.probe_path)
+        except httpx.TransportError as error:
+            logger.info(f'{endpoint.address} probe failed: {error!r}')
+            endpoint.eject(self.settings)
+            return
+        if resp.status_code != status.HTTP_200_OK:
+            endpoint.eject(self.settings)
+            return
+        endpoint.readmit()
+        logger.info(f'{self.name} endpoint {endpoint.address} readmitted')
+
+    async def _send(
+        self,
+        endpoint: Endpoint,
+        send: Callable[..., Awaitable[httpx.Response]],
+        url: str,
+        **kwargs,
+    ) -> httpx.Response:
+        try:
+            resp = await send(url, **kwargs)
+        except httpx.TransportError:
+            self.record(endpoint, is_failure=True)
+            raise
+        self.record(endpoint, _is_failure(resp.status_code))
+        return resp
+
+    async def _probe_ejected(self) -> None:
+        while True:  # noqa: WPS457 runs until the task is cancelled
+            await asyncio.sleep(self.settings.probe_interval)
+            now = time.monotonic()
+            await asyncio.gather(*(
+                self.probe(endpoint)
+                for endpoint in self.endpoints
+                if endpoint.is_probe_due(now)
+            ))
+
+    def _can_eject(self, endpoint: Endpoint) -> bool:
+        if endpoint.is_ejected:
+            return False
+        ejected = sum(endpoint.is_ejected for endpoint in self.endpoints)
+        ratio = self.settings.max_ejection_ratio
+        return ejected < int(len(self.endpoints) * ratio)
+
+
+Upstream = Client | UpstreamGroup
+
+
+def _outstanding(endpoint: Endpoint) -> int:
+    return endpoint.client.in_flight
+
+
+def _is_failure(status_code: int) -> bool:
+    return status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR
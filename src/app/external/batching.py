@@ -0,0 +1,146 @@
+import asyncio
+import contextvars
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, replace
+from typing import Any, Generic, TypeVar
+
+from app.system import errors
+from config.config import BatchingSettings
+
+logger = logging.getLogger(__name__)
+
+RequestT = TypeVar('RequestT')
+ResponseT = TypeVar('ResponseT')
+SendBatch = Callable[[list[RequestT]], Awaitable[list[ResponseT]]]
+
+
+@dataclass
+class BatchStats:
+    """Статистика объединения запросов в пакеты."""
+
+    batches: int = 0
+    requests: int = 0
+    max_batch_size: int = 0
+
+
+@dataclass
+class PendingRequest(Generic[RequestT, ResponseT]):
+    """Запрос, ожидающий отправки в пакете."""
+
+    request: RequestT
+    response: asyncio.Future[ResponseT]
+
+
+class MicroBatcher(Generic[RequestT, ResponseT]):
+    """
+    Объединение одиночных запросов в пакеты.
+
+    Запросы копятся до max_size штук, но не дольше max_delay секунд
+    с первого запроса пакета, и отправляются одним вызовом send.
+    send возвращает ответы в порядке запросов пакета, и каждый
+    вызывающий получает свой ответ. Если отправка пакета
+    завершилась ошибкой, ошибку получает каждый запрос пакета.
+
+    Пакет отправляется в отдельной задаче без контекста вызывающих,
+    поэтому срок обработки одного запроса не ограничивает весь
+    пакет, а отмена ожидания одного запроса не отменяет отправку.
+    """
+
+    def __init__(
+        self,
+        batching: BatchingSettings,
+        send: SendBatch[RequestT, ResponseT],
+    ) -> None:
+        """
+        Метод инициализации.
+
+        :param batching: Конфигурация объединения запросов.
+        :type batching: BatchingSettings
+        :param send: Функция отправки пакета.
+        :type send: SendBatch
+        """
+        self.settings = batching
+        self.counters = BatchStats()
+        self._send = send
+        self._pending: list[PendingRequest[RequestT, ResponseT]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._sending: set[asyncio.Task[None]] = set()
+
+    async def submit(self, request: RequestT) -> ResponseT:
+        """
+        Добавляет запрос в пакет и ожидает ответа на него.
+
+        :param request: Запрос.
+        :type request: RequestT
+        :return: Ответ на запрос.
+        :rtype: ResponseT
+        """
+        loop = asyncio.get_running_loop()
+        response: asyncio.Future[ResponseT] = loop.create_future()
+        pending = PendingRequest(request, response)
+        self._pending.append(pending)
+        if len(self._pending) >= self.settings.max_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.settings.max_delay, self.flush)
+        return await response
+
+    def flush(self) -> None:
+        """Отправляет накопленный пакет, не дожидаясь срока."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch = self._pending
+        self._pending = []
+        self.counters.batches += 1
+        self.counters.requests += len(batch)
+        self.counters.max_batch_size = max(
+            self.counters.max_batch_size, len(batch),
+        )
+        task = asyncio.create_task(
+            self._send_batch(batch), context=contextvars.Context(),
+        )
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def close(self) -> None:
+        """Отправляет накопленный пакет и дожидается всех отправок."""
+        self.flush()
+        await asyncio.gather(*self._sending, return_exceptions=True)
+
+    def stats(self) -> BatchStats:
+        """
+        Возвращает статистику объединения запросов.
+
+        :return: Статистика объединения запросов.
+        :rtype: BatchStats
+        """
+        return replace(self.counters)
+
+    async def _send_batch(
+        self, batch: list[PendingRequest[RequestT, ResponseT]],
+    ) -> None:
+        try:
+            responses = await self._send([
+                pending.request for pending in batch
+            ])
+        except Exception as error:  # noqa: B902 every caller gets the error
+            _fail(batch, error)
+            return
+        if len(responses) != len(batch):
+            _fail(batch, errors.ServerError(detail='Неполный ответ на пакет'))
+            return
+        for pending, response in zip(batch, responses):
+            if not pending.response.done():
+                pending.response.set_result(response)
+
+
+def _fail(batch: list[PendingRequest[Any, Any]], error: Exception) -> None:
+    batch_size = len(batch)
+    logger.error(f'batch of {batch_size} requests failed: {error!r}')
+    for pending in batch:
+        if not pending.response.done():
+            pending.response.set_exception(error)
@@ -0,0 +1,197 @@
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import StrEnum
+
+from app.system import errors
+from config.config import BreakerSettings
+
+logger = logging.getLogger(__name__)
+
+
+class BreakerState(StrEnum):
+    """Состояние автомата защиты внешнего сервиса."""
+
+    closed = 'closed'
+    open = 'open'
+    half_open = 'half_open'
+
+
+@dataclass
+class BreakerStats:
+    """Статистика автомата защиты внешнего сервиса."""
+
+    name: str
+    state: BreakerState
+    window_calls: int
+    window_failures: int
+    window_slow_calls: int
+    opened_total: int
+    rejected_total: int
+    transitions: dict[BreakerState, int] = field(default_factory=dict)
+
+
+class CircuitBreaker:  # noqa: WPS214 breaker state machine
+    """
+    Автомат защиты внешнего сервиса.
+
+    Хранит результаты последних вызовов в скользящем окне, а число
+    ошибок и медленных вызовов в окне обновляет при добавлении и
+    вытеснении вызова. Если доля ошибок или медленных вызовов
+    превышает порог, автомат открывается и вызовы сразу завершаются
+    ошибкой 503. Через open_duration секунд автомат пропускает
+    пробные вызовы и закрывается, если они успешны.
+    """
+
+    def __init__(self, name: str, breaker: BreakerSettings) -> None:
+        """
+        Метод инициализации.
+
+        :param name: Имя внешнего сервиса.
+        :type name: str
+        :param breaker: Конфигурация автомата защиты.
+        :type breaker: BreakerSettings
+        """
+        self.name = name
+        self.settings = breaker
+        self.opened_total = 0
+        self.rejected_total = 0
+        self.transitions: dict[BreakerState, int] = {}
+        self._window: deque[tuple[bool, bool]] = deque(
+            maxlen=breaker.window_size,
+        )
+        self._failures = 0
+        self._slow_calls = 0
+        self._state = BreakerState.closed
+        self._opened_at: float = 0
+        self._trial_calls = 0
+
+    @property
+    def state(self) -> BreakerState:
+        """
+        Текущее состояние автомата.
+
+        :return: Состояние автомата.
+        :rtype: BreakerState
+        """
+        is_cooled_down = (
+            time.monotonic() - self._opened_at >= self.settings.open_duration
+        )
+        if self._state is BreakerState.open and is_cooled_down:
+            self._move_to(BreakerState.half_open)
+            self._trial_calls = 0
+            logger.info(f'circuit breaker {self.name} is half open')
+        return self._state
+
+    def before_call(self) -> None:
+        """
+        Проверяет, можно ли выполнить вызов внешнего сервиса.
+
+        :raises CircuitOpenError: Если автомат открыт.
+        """
+        if not self.settings.enabled:
+            return
+        state = self.state
+        is_trial_allowed = (
+            self._trial_calls < self.settings.half_open_max_calls
+        )
+        if state is BreakerState.half_open and is_trial_allowed:
+            self._trial_calls += 1
+            return
+        if state is not BreakerState.closed:
+            self.rejected_total += 1
+            raise errors.CircuitOpenError(
+                detail=f'Сервис {self.name} временно недоступен',
+            )
+
+    def record(self, is_failure: bool, latency: float) -> None:
+        """
+        Сохраняет результат вызова внешнего сервиса.
+
+        :param is_failure: Завершился ли вызов ошибкой.
+        :type is_failure: bool
+        :param latency: Длительность вызова в секундах.
+        :type latency: float
+        """
+        if not self.settings.enabled:
+            return
+        is_slow = latency >= self.settings.slow_call_threshold
+        if self._state is BreakerState.half_open:
+            self._record_trial(is_failure=is_failure or is_slow)
+            return
+        self._append(is_failure, is_slow)
+        if self._is_threshold_exceeded():
+            self._open()
+
+    def release(self) -> None:
+        """Освобождает пробный вызов, который был отменен."""
+        if self._state is BreakerState.half_open and self._trial_calls:
+            self._trial_calls -= 1
+
+    def reset(self) -> None:
+        """Закрывает автомат и очищает окно вызовов."""
+        self._move_to(BreakerState.closed)
+        self._clear_window()
+        self._trial_calls = 0
+
+    def stats(self) -> BreakerStats:
+        """
+        Возвращает статистику автомата.
+
+        :return: Статистика автомата.
+        :rtype: BreakerStats
+        """
+        return BreakerStats(
+            name=self.name,
+            state=self.state,
+            window_calls=len(self._window),
+            window_failures=self._failures,
+            window_slow_calls=self._slow_calls,
+            opened_total=self.opened_total,
+            rejected_total=self.rejected_total,
+            transitions=dict(self.transitions),
+        )
+
+    def _record_trial(self, is_failure: bool) -> None:
+        if is_failure:
+            self._open()
+            return
+        if self._trial_calls >= self.settings.half_open_max_calls:
+            self.reset()
+            logger.info(f'circuit breaker {self.name} is closed')
+
+    def _is_threshold_exceeded(self) -> bool:
+        calls = len(self._window)
+        if calls < self.settings.min_calls:
+            return False
+        return (
+            self._failures / calls >= self.settings.failure_rate_threshold or
+            self._slow_calls / calls >= self.settings.slow_call_rate_threshold
+        )
+
+    def _append(self, is_failure: bool, is_slow: bool) -> None:
+        if len(self._window) == self._window.maxlen:
+            was_failure, was_slow = self._window[0]
+            self._failures -= was_failure
+            self._slow_calls -= was_slow
+        self._window.append((is_failure, is_slow))
+        self._failures += is_failure
+        self._slow_calls += is_slow
+
+    def _clear_window(self) -> None:
+        self._window.clear()
+        self._failures = 0
+        self._slow_calls = 0
+
+    def _open(self) -> None:
+        self._move_to(BreakerState.open)
+        self._opened_at = time.monotonic()
+        self._clear_window()
+        self.opened_total += 1
+        logger.warning(f'circuit breaker {self.name} is open')
+
+    def _move_to(self, state: BreakerState) -> None:
+        if state is not self._state:
+            self.transitions[state] = self.transitions.get(state, 0) + 1
+        self._state = state
@@ -0,0 +1,357 @@
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Generic, TypeVar, cast
+
+from fastapi import status
+
+from app.api.models import Report, ReportRequest
+from app.system import errors
+from config.config import ReportCacheSettings, TokenCacheSettings
+
+ValueT = TypeVar('ValueT')
+
+
+@dataclass
+class CacheStats:
+    """Статистика работы кэша."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    size: int = 0
+    max_size: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """
+        Доля попаданий в кэш.
+
+        :return: Отношение попаданий к общему числу обращений.
+        :rtype: float
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0
+
+
+class TTLCache(Generic[ValueT]):  # noqa: WPS214 cache API and removal hook
+    """
+    Ограниченный по размеру кэш с временем жизни записей.
+
+    При переполнении вытесняет давно не использованные записи (LRU).
+    Кэш с нулевым размером ничего не сохраняет.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        """
+        Метод инициализации.
+
+        :param max_size: Максимальное число записей.
+        :type max_size: int
+        :param ttl: Время жизни записи по умолчанию в секундах.
+        :type ttl: float
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._stats = CacheStats(max_size=max_size)
+        self._entries: OrderedDict[Hashable, tuple[float, ValueT]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        """
+        Возвращает число записей в кэше.
+
+        :return: Число записей.
+        :rtype: int
+        """
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> ValueT | None:
+        """
+        Возвращает значение из кэша.
+
+        :param key: Ключ записи.
+        :type key: Hashable
+        :return: Значение или None, если записи нет или она устарела.
+        :rtype: ValueT | None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+        expires_at, cached_value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]  # noqa: WPS420 expired entry
+            self._on_remove(key)
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return cached_value
+
+    def set(
+        self, key: Hashable, cache_value: ValueT, ttl: float | None = None,
+    ) -> None:
+        """
+        Сохраняет значение в кэш.
+
+        :param key: Ключ записи.
+        :type key: Hashable
+        :param cache_value: Сохраняемое значение.
+        :type cache_value: ValueT
+        :param ttl: Время жизни записи в секундах.
+        :type ttl: float | None
+        """
+        if self.max_size <= 0:
+            return
+        lifetime = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + lifetime
+        self._entries[key] = (expires_at, cache_value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            evicted_key, _ = self._entries.popitem(last=False)
+            self._on_remove(evicted_key)
+            self._stats.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        """
+        Удаляет запись из кэша.
+
+        :param key: Ключ записи.
+        :type key: Hashable
+        """
+        if self._entries.pop(key, None) is not None:
+            self._on_remove(key)
+
+    def clear(self) -> None:
+        """Удаляет все записи и сбрасывает статистику."""
+        self._entries.clear()
+        self._stats = CacheStats(max_size=self.max_size)
+
+    def stats(self) -> CacheStats:
+        """
+        Возвращает статистику работы кэша.
+
+        :return: Статистика кэша.
+        :rtype: CacheStats
+        """
+        return replace(self._stats, size=len(self._entries))
+
+    def _on_remove(self, key: Hashable) -> None:
+        """
+        Вызывается после удаления записи из кэша.
+
+        :param key: Ключ удаленной записи.
+        :type key: Hashable
+        """
+
+
+class TokenStatusCache(TTLCache[int]):
+    """
+    Кэш результатов проверки токенов сервисом auth.
+
+    Хранит код ответа сервиса auth: успешный на время ttl,
+    отказ в авторизации на время negative_ttl. Ошибки сервиса
+    не кэшируются.
+    """
+
+    def __init__(self, cache_settings: TokenCacheSettings) -> None:
+        """
+        Метод инициализации.
+
+        :param cache_settings: Конфигурация кэша проверки токенов.
+        :type cache_settings: TokenCacheSettings
+        """
+        super().__init__(
+            max_size=cache_settings.max_size if cache_settings.enabled else 0,
+            ttl=cache_settings.ttl,
+        )
+        self.negative_ttl = cache_settings.negative_ttl
+
+    def remember(self, token_key: bytes, status_code: int) -> None:
+        """
+        Сохраняет результат проверки токена.
+
+        :param token_key: Хэш токена.
+        :type token_key: bytes
+        :param status_code: Код ответа сервиса auth.
+        :type status_code: int
+        """
+        if status_code in errors.good_status_codes:
+            self.set(token_key, status_code)
+        elif status_code == status.HTTP_401_UNAUTHORIZED:
+            self.set(token_key, status_code, ttl=self.negative_ttl)
+
+
+ReportKey = tuple[str, datetime, datetime]
+
+
+class ReportCache(TTLCache[Report]):  # noqa: WPS214 report cache API
+    """
+    Кэш отчетов о транзакциях.
+
+    Ключ записи - имя пользователя и границы периода отчета.
+    Отчеты за прошедшие периоды хранятся historical_ttl секунд,
+    отчеты за периоды, которые заканчиваются не раньше чем
+    live_margin секунд назад, хранятся live_ttl секунд. Отчеты
+    больше max_rows транзакций не кэшируются. Новая транзакция
+    пользователя удаляет из кэша отчеты, в период которых она попадает.
+    Ключи отчетов индексируются по имени пользователя, поэтому
+    инвалидация просматривает только отчеты этого пользователя, а
+    версия кэша ведется отдельно для каждого пользователя.
+    """
+
+    def __init__(self, cache_settings: ReportCacheSettings) -> None:
+        """
+        Метод инициализации.
+
+        :param cache_settings: Конфигурация кэша отчетов.
+        :type cache_settings: ReportCacheSettings
+        """
+        super().__init__(
+            max_size=cache_settings.max_size if cache_settings.enabled else 0,
+            ttl=cache_settings.historical_ttl,
+        )
+        self.settings = cache_settings
+        self._user_keys: dict[str, set[ReportKey]] = {}
+        self._versions: dict[str, int] = {}
+
+    def version(self, username: str) -> int:
+        """
+        Версия отчетов пользователя, меняется при каждой инвалидации.
+
+        Отчет, запрошенный до новой транзакции пользователя, может не
+        содержать ее, поэтому он не сохраняется в кэш. Транзакции
+        других пользователей не меняют версию.
+
+        :param username: Имя пользователя.
+        :type username: str
+        :return: Число инвалидаций отчетов пользователя.
+        :rtype: int
+        """
+        return self._versions.get(username, 0)
+
+    def lookup(self, report_request: ReportRequest) -> Report | None:
+        """
+        Возвращает отчет из кэша.
+
+        :param report_request: Данные запроса отчета.
+        :type report_request: ReportRequest
+        :return: Отчет или None, если его нет в кэше.
+        :rtype: Report | None
+        """
+        return self.get(report_key(report_request))
+
+    def remember(
+        self, report_request: ReportRequest, report: Report, version: int,
+    ) -> None:
+        """
+        Сохраняет отчет о транзакциях.
+
+        :param report_request: Данные запроса отчета.
+        :type report_request: ReportRequest
+        :param report: Отчет о транзакциях.
+        :type report: Report
+        :param version: Версия отчетов пользователя на момент запроса.
+        :type version: int
+        """
+        is_too_large = len(report.transactions) > self.settings.max_rows
+        if version != self.version(report_request.username) or is_too_large:
+            return
+        cache_key = report_key(report_request)
+        self.set(cache_key, report, ttl=self._ttl(report_request.end_date))
+        if cache_key in self._entries:
+            self._user_keys.setdefault(
+                report_request.username, set(),
+            ).add(cache_key)
+
+    def invalidate(self, username: str, timestamp: datetime) -> None:
+        """
+        Удаляет отчеты пользователя, в период которых попадает транзакция.
+
+        :param username: Имя пользователя.
+        :type username: str
+        :param timestamp: Время совершения транзакции.
+        :type timestamp: datetime
+        """
+        self._stats.invalidations += 1
+        self._versions[username] = self.version(username) + 1
+        stale_keys = [
+            cache_key
+            for cache_key in self._user_keys.get(username, ())
+            if _is_affected(cache_key, username, timestamp)
+        ]
+        for stale_key in stale_keys:
+            self.pop(stale_key)
+
+    def clear(self) -> None:
+        """Удаляет все отчеты и сбрасывает статистику."""
+        super().clear()
+        self._user_keys.clear()
+        self._versions.clear()
+
+    def _on_remove(self, key: Hashable) -> None:
+        username, _, _ = cast(ReportKey, key)
+        user_keys = self._user_keys.get(username)
+        if user_keys is None:
+            return
+        user_keys.discard(cast(ReportKey, key))
+        if not user_keys:
+            del self._user_keys[username]  # noqa: WPS420 last user report
+
+    def _ttl(self, end_date: datetime) -> float:
+        live_since = datetime.now(end_date.tzinfo) - timedelta(
+            seconds=self.settings.live_margin,
+        )
+        if end_date < live_since:
+            return self.settings.historical_ttl
+        return self.settings.live_ttl
+
+
+def report_key(report_request: ReportRequest) -> ReportKey:
+    """
+    Создает ключ кэша отчетов.
+
+    :param report_request: Данные запроса отчета.
+    :type report_request: ReportRequest
+    :return: Имя пользователя и границы периода отчета.
+    :rtype: ReportKey
+    """
+    return (
+        report_request.username,
+        report_request.start_date,
+        report_request.end_date,
+    )
+
+
+def _is_affected(
+    cache_key: ReportKey, username: str, timestamp: datetime,
+) -> bool:
+    key_username, start_date, end_date = cache_key
+    if key_username != username:
+        return False
+    try:
+        return start_date <= timestamp <= end_date
+    except TypeError:
+        return True
+
+
+def hash_token(token: str) -> bytes:
+    """
+    Хэширует токен для использования в качестве ключа.
+
+    Токен не хранится в памяти сервиса в открытом виде.
+
+    :param token: Заголовок с токеном пользователя.
+    :type token: str
+    :return: Хэш токена.
+    :rtype: bytes
+    """
+    return hashlib.sha256(token.encode()).digest()
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, replace
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+ResultT = TypeVar('ResultT')
+
+
+@dataclass
+class FlightStats:
+    """Статистика объединения одинаковых запросов."""
+
+    calls: int = 0
+    executions: int = 0
+    merged: int = 0
+
+    @property
+    def merge_ratio(self) -> float:
+        """
+        Доля вызовов, объединенных с уже выполняемым запросом.
+
+        :return: Отношение объединенных вызовов к общему числу вызовов.
+        :rtype: float
+        """
+        return self.merged / self.calls if self.calls else 0
+
+
+class SingleFlight:
+    """
+    Объединяет одновременные одинаковые запросы к внешнему сервису.
+
+    Пока запрос с ключом выполняется, остальные вызовы с тем же ключом
+    ожидают его результат, а не отправляют новый запрос. Запрос
+    выполняется в отдельной задаче, поэтому отмена одного из ожидающих
+    не отменяет запрос для остальных.
+    """
+
+    def __init__(self) -> None:
+        """Метод инициализации."""
+        self._flights: dict[tuple[str, Hashable], asyncio.Future[Any]] = {}
+        self._stats: dict[str, FlightStats] = {}
+
+    async def run(
+        self,
+        group: str,
+        key: Hashable,
+        func: Callable[[], Awaitable[ResultT]],
+    ) -> ResultT:
+        """
+        Выполняет запрос или присоединяется к уже выполняемому.
+
+        :param group: Имя группы запросов, например имя метода клиента.
+        :type group: str
+        :param key: Ключ запроса внутри группы.
+        :type key: Hashable
+        :param func: Функция, выполняющая запрос.
+        :type func: Callable[[], Awaitable[ResultT]]
+        :return: Результат запроса.
+        :rtype: ResultT
+        """
+        stats = self._stats.setdefault(group, FlightStats())
+        stats.calls += 1
+        flight_key = (group, key)
+        flight = self._flights.get(flight_key)
+        if flight is None:
+            stats.executions += 1
+            flight = asyncio.ensure_future(func())
+            self._flights[flight_key] = flight
+            flight.add_done_callback(
+                lambda done: self._land(flight_key, done),
+            )
+        else:
+            stats.merged += 1
+        return await asyncio.shield(flight)
+
+    def in_flight(self) -> int:
+        """
+        Возвращает число выполняемых запросов.
+
+        :return: Число выполняемых запросов.
+        :rtype: int
+        """
+        return len(self._flights)
+
+    def stats(self) -> dict[str, FlightStats]:
+        """
+        Возвращает статистику объединения запросов по группам.
+
+        :return: Статистика по именам групп.
+        :rtype: dict[str, FlightStats]
+        """
+        return {
+            group: replace(group_stats)
+            for group, group_stats in self._stats.items()
+        }
+
+    def _land(
+        self, flight_key: tuple[str, Hashable], flight: asyncio.Future[Any],
+    ) -> None:
+        if self._flights.get(flight_key) is flight:
+            del self._flights[flight_key]  # noqa: WPS420 finished flight
+        if not flight.cancelled() and flight.exception() is not None:
+            logger.debug(f'flight {flight_key[0]} failed')
@@ -0,0 +1,208 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar, cast
+
+from fastapi import HTTPException, status
+
+from app.external.cache import CacheStats, TTLCache
+from app.system import errors
+from config.config import IdempotencySettings
+
+logger = logging.getLogger(__name__)
+
+ResultT = TypeVar('ResultT')
+
+
+@dataclass
+class Outcome(Generic[ResultT]):
+    """Сохраненный результат запроса с ключом идемпотентности."""
+
+    fingerprint: bytes
+    response: ResultT | None = None
+    status_code: int | None = None
+    detail: Any = None
+    headers: dict[str, str] | None = None
+    is_unknown: bool = False
+
+    @classmethod
+    def from_error(
+        cls, fingerprint: bytes, error: HTTPException,
+    ) -> 'Outcome[ResultT] | None':
+        """
+        Создает результат запроса, завершенного ошибкой.
+
+        Ошибка после отправки запроса, когда результат запроса
+        неизвестен, сохраняется как UnknownOutcomeError с тем же кодом
+        ответа. Истечение времени обработки до отправки запроса можно
+        повторить, как и другие ошибки 5xx.
+
+        :param fingerprint: Отпечаток тела запроса.
+        :type fingerprint: bytes
+        :param error: Ошибка запроса.
+        :type error: HTTPException
+        :return: Результат или None, если запрос можно повторить.
+        :rtype: Outcome[ResultT] | None
+        """
+        unknown = (errors.UpstreamTimeoutError, errors.UnknownOutcomeError)
+        is_unknown = isinstance(error, unknown)
+        if is_unknown:
+            error = errors.UnknownOutcomeError(error.status_code)
+        elif error.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+            return None
+        return cls(
+            fingerprint,
+            status_code=error.status_code,
+            detail=error.detail,
+            headers=getattr(error, 'headers', None),
+            is_unknown=is_unknown,
+        )
+
+
+@dataclass
+class Flight(Generic[ResultT]):
+    """Выполняемый запрос с ключом идемпотентности."""
+
+    fingerprint: bytes
+    outcome: asyncio.Future[ResultT]
+
+
+class IdempotencyStore(Generic[ResultT]):
+    """
+    Хранилище результатов запросов с ключом идемпотентности.
+
+    Запрос с новым ключом выполняется один раз в отдельной задаче,
+    поэтому отмена ожидания не отменяет запрос. Одновременные запросы
+    с тем же ключом ожидают его результат, а запросы после завершения
+    получают сохраненный результат, пока он не вытеснен по ttl или
+    max_size. Ошибки сохраняются кодом, сообщением и заголовками
+    ответа, а при повторе поднимается новое исключение. Результаты
+    с ошибками 5xx не сохраняются, чтобы запрос можно было повторить,
+    кроме ошибок после отправки запроса, когда его результат
+    неизвестен. Такой запрос мог быть выполнен сервисом, поэтому он
+    не выполняется повторно, а повтор получает ответ о неизвестном
+    результате в течение unknown_ttl.
+
+    Вместе с результатом хранится отпечаток тела запроса. Запрос с
+    тем же ключом и другим телом отклоняется ответом 422.
+    """
+
+    def __init__(self, idempotency: IdempotencySettings) -> None:
+        """
+        Метод инициализации.
+
+        :param idempotency: Конфигурация повтора ответов.
+        :type idempotency: IdempotencySettings
+        """
+        self.settings = idempotency
+        self.outcomes: TTLCache[Outcome[ResultT]] = TTLCache(
+            max_size=idempotency.max_size if idempotency.enabled else 0,
+            ttl=idempotency.ttl,
+        )
+        self._flights: dict[str, Flight[ResultT]] = {}
+
+    async def run(
+        self,
+        key: str,
+        fingerprint: bytes,
+        func: Callable[[], Awaitable[ResultT]],
+    ) -> ResultT:
+        """
+        Выполняет запрос не больше одного раза для ключа.
+
+        :param key: Ключ идемпотентности.
+        :type key: str
+        :param fingerprint: Отпечаток тела запроса.
+        :type fingerprint: bytes
+        :param func: Функция выполнения запроса.
+        :type func: Callable[[], Awaitable[ResultT]]
+        :return: Результат запроса.
+        :rtype: ResultT
+        """
+        if not self.settings.enabled:
+            return await func()
+        outcome = self.outcomes.get(key)
+        if outcome is not None:
+            _check_fingerprint(outcome.fingerprint, fingerprint)
+            logger.info('idempotent request replayed')
+            return _replay(outcome)
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = Flight(
+                fingerprint,
+                asyncio.ensure_future(self._execute(key, fingerprint, func)),
+            )
+            self._flights[key] = flight
+            flight.outcome.add_done_callback(
+                lambda done: self._land(key, done),
+            )
+        else:
+            _check_fingerprint(flight.fingerprint, fingerprint)
+        return await asyncio.shield(flight.outcome)
+
+    def in_flight(self) -> int:
+        """
+        Возвращает число выполняемых запросов.
+
+        :return: Число выполняемых запросов.
+        :rtype: int
+        """
+        return len(self._flights)
+
+    def clear(self) -> None:
+        """Удаляет сохраненные результаты."""
+        self.outcomes.clear()
+
+    def stats(self) -> CacheStats:
+        """
+        Возвращает статистику хранилища результатов.
+
+        :return: Статистика хранилища.
+        :rtype: CacheStats
+        """
+        return self.outcomes.stats()
+
+    async def _execute(
+        self,
+        key: str,
+        fingerprint: bytes,
+        func: Callable[[], Awaitable[ResultT]],
+    ) -> ResultT:
+        try:
+            response = await func()
+        except HTTPException as error:
+            outcome: Outcome[ResultT] | None = Outcome.from_error(
+                fingerprint, error,
+            )
+            if outcome is not None:
+                ttl = self.settings.unknown_ttl if outcome.is_unknown else None
+                self.outcomes.set(key, outcome, ttl)
+            raise
+        self.outcomes.set(key, Outcome(fingerprint, response=response))
+        return response
+
+    def _land(self, key: str, flight: asyncio.Future[ResultT]) -> None:
+        current = self._flights.get(key)
+        if current is not None and current.outcome is flight:
+            del self._flights[key]  # noqa: WPS420 finished flight
+        if not flight.cancelled() and flight.exception() is not None:
+            logger.debug('idempotent request failed')
+
+
+def _check_fingerprint(stored: bytes, fingerprint: bytes) -> None:
+    if stored != fingerprint:
+        logger.warning('idempotency key reused with another request')
+        raise errors.UnprocessableError(
+            detail='Ключ идемпотентности использован для другого запроса',
+        )
+
+
+def _replay(outcome: Outcome[ResultT]) -> ResultT:
+    if outcome.status_code is not None:
+        raise HTTPException(
+            status_code=outcome.status_code,
+            detail=outcome.detail,
+            headers=outcome.headers,
+        )
+    return cast(ResultT, outcome.response)
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+
+from app.api.models import Transaction
+
+
+class TokenPayload(BaseModel):
+    """Ответ сервиса auth с токеном пользователя."""
+
+    encoded_token: str | None = None
+
+
+class ReportPayload(BaseModel):
+    """Ответ сервиса транзакций с транзакциями отчета."""
+
+    transactions: list[Transaction]
+
+
+class TransactionBatch(BaseModel):
+    """Пакет транзакций для создания одним запросом."""
+
+    transactions: list[Transaction]
+
+
+class TransactionBatchPayload(BaseModel):
+    """Ответ сервиса транзакций с кодами результата по транзакциям пакета."""
+
+    statuses: list[int]
@@ -0,0 +1,245 @@
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from app.system import deadline
+from config.config import PoolSettings
+
+logger = logging.getLogger(__name__)
+
+
+class PoolClosedError(RuntimeError):
+    """Запрос через не созданный или закрытый пул соединений."""
+
+
+@dataclass
+class PoolStats:
+    """Статистика занятости пула соединений к внешнему сервису."""
+
+    name: str
+    max_connections: int
+    in_flight: int
+    max_in_flight: int
+    requests_total: int
+    is_open: bool
+
+    @property
+    def occupancy(self) -> float:
+        """
+        Доля занятых соединений пула.
+
+        :return: Отношение выполняемых запросов к размеру пула.
+        :rtype: float
+        """
+        return self.in_flight / self.max_connections
+
+
+def create_timeout(
+    pool: PoolSettings, limit: float | None = None,
+) -> httpx.Timeout:
+    """
+    Создает таймауты запросов к внешнему сервису.
+
+    :param pool: Конфигурация пула соединений.
+    :type pool: PoolSettings
+    :param limit: Верхняя граница таймаутов в секундах.
+    :type limit: float | None
+    :return: Таймауты запросов.
+    :rtype: httpx.Timeout
+    """
+    if limit is None:
+        limit = float('inf')
+    return httpx.Timeout(
+        connect=min(pool.connect_timeout, limit),
+        read=min(pool.read_timeout, limit),
+        write=min(pool.write_timeout, limit),
+        pool=min(pool.pool_timeout, limit),
+    )
+
+
+def create_http_client(
+    base_url: str,
+    pool: PoolSettings,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
+    """
+    Создает HTTP клиент с ограниченным пулом соединений.
+
+    :param base_url: Базовый адрес внешнего сервиса.
+    :type base_url: str
+    :param pool: Конфигурация пула соединений.
+    :type pool: PoolSettings
+    :param transport: Транспорт HTTP клиента.
+    :type transport: httpx.AsyncBaseTransport | None
+    :return: HTTP клиент.
+    :rtype: httpx.AsyncClient
+    """
+    limits = httpx.Limits(
+        max_connections=pool.max_connections,
+        max_keepalive_connections=pool.max_keepalive_connections,
+        keepalive_expiry=pool.keepalive_expiry,
+    )
+    return httpx.AsyncClient(
+        base_url=base_url,
+        limits=limits,
+        timeout=create_timeout(pool),
+        transport=transport,
+    )
+
+
+def with_deadline(pool: PoolSettings, request_kwargs: dict[str, Any]) -> None:
+    """
+    Ограничивает запрос к внешнему сервису сроком обработки запроса.
+
+    Если у запроса задан срок обработки, таймауты запроса ограничиваются
+    оставшимся временем, а само время передается внешнему сервису
+    в заголовке X-Request-Timeout-Ms.
+
+    :param pool: Конфигурация пула соединений.
+    :type pool: PoolSettings
+    :param request_kwargs: Параметры запроса, дополняются на месте.
+    :type request_kwargs: dict[str, Any]
+    """
+    time_left = deadline.check()
+    if time_left is None:
+        return
+    request_kwargs['timeout'] = create_timeout(pool, time_left)
+    request_kwargs['headers'] = {
+        **(request_kwargs.get('headers') or {}),
+        deadline.deadline_header: str(
+            int(time_left * deadline.milliseconds_in_second),
+        ),
+    }
+
+
+class Client:  # noqa: WPS214 HTTP methods and pool lifecycle
+    """
+    Клиент библиотеки для формирования HTTP запросов.
+
+    Каждый клиент владеет собственным пулом соединений к одному
+    внешнему сервису. Пул создается методом start и закрывается
+    методом close в lifespan сервиса. Запрос до создания или после
+    закрытия пула завершается ошибкой PoolClosedError.
+    """
+
+    def __init__(
+        self,
+        name: str = 'default',
+        base_url: str = '',
+        pool: PoolSettings | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """
+        Метод инициализации.
+
+        :param name: Имя внешнего сервиса.
+        :type name: str
+        :param base_url: Базовый адрес внешнего сервиса.
+        :type base_url: str
+        :param pool: Конфигурация пула соединений.
+        :type pool: PoolSettings | None
+        :param transport: Транспорт HTTP клиента.
+        :type transport: httpx.AsyncBaseTransport | None
+        """
+        self.name = name
+        self.pool = pool or PoolSettings()
+        self._base_url = base_url
+        self._transport = transport
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests_total = 0
+        self._client: httpx.AsyncClient | None = None
+
+    async def start(self) -> None:
+        """Создает пул соединений, если он еще не создан."""
+        if self._client is None:
+            self._client = create_http_client(
+                self._base_url, self.pool, self._transport,
+            )
+            logger.info(f'connection pool {self.name} created')
+
+    async def close(self) -> None:
+        """Закрывает пул соединений."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info(f'connection pool {self.name} closed')
+
+    async def get(self, *args, **kwargs) -> httpx.Response:
+        """Метод GET."""
+        return await self._send('GET', *args, **kwargs)
+
+    async def post(self, *args, **kwargs) -> httpx.Response:
+        """Метод POST."""
+        return await self._send('POST', *args, **kwargs)
+
+    def stats(self) -> PoolStats:
+        """
+        Возвращает статистику занятости пула.
+
+        :return: Статистика пула соединений.
+        :rtype: PoolStats
+        """
+        return PoolStats(
+            name=self.name,
+            max_connections=self.pool.max_connections,
+            in_flight=self.in_flight,
+            max_in_flight=self.max_in_flight,
+            requests_total=self.requests_total,
+            is_open=self._client is not None,
+        )
+
+    @asynccontextmanager
+    async def stream(
+        self, method: str, url: str, **kwargs,
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Выполняет запрос с потоковым чтением тела ответа.
+
+        Соединение занято, пока не закрыт контекст ответа.
+
+        :param method: HTTP метод.
+        :type method: str
+        :param url: Путь запроса.
+        :type url: str
+        :param kwargs: Параметры запроса.
+        :yield: Ответ сервиса с непрочитанным телом.
+        :ytype: httpx.Response
+        """
+        with_deadline(self.pool, kwargs)
+        http_client = self._acquire()
+        try:  # noqa: WPS501 counter is released on any error
+            async with http_client.stream(method, url, **kwargs) as resp:
+                yield resp
+        finally:
+            self.in_flight -= 1
+
+    async def _send(self, method: str, *args, **kwargs) -> httpx.Response:
+        """
+        Выполняет запрос через пул соединений.
+
+        :param method: HTTP метод.
+        :type method: str
+        :param args: Аргументы запроса.
+        :param kwargs: Параметры запроса.
+        :return: Ответ сервиса.
+        :rtype: httpx.Response
+        """
+        with_deadline(self.pool, kwargs)
+        http_client = self._acquire()
+        try:  # noqa: WPS501 counter is released on any error
+            return await http_client.request(method, *args, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+    def _acquire(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise PoolClosedError(f'connection pool {self.name} is closed')
+        self.in_flight += 1
+        self.requests_total += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        return self._client
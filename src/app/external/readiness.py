@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, replace
+
+from app.external.clients import clients
+from app.external.service_client import ServiceClient
+from config.config import ReadinessSettings, get_settings
+
+logger = logging.getLogger(__name__)
+
+stale_error = 'stale'
+
+
+@dataclass
+class DependencyStatus:
+    """Результат последней проверки готовности внешнего сервиса."""
+
+    name: str
+    is_ready: bool = False
+    latency: float = 0
+    checked_at: float | None = None
+    error: str | None = None
+
+
+class ReadinessChecker:  # noqa: WPS214 probe lifecycle and results
+    """
+    Фоновая проверка готовности внешних сервисов.
+
+    Задача в цикле событий каждые interval секунд одновременно
+    проверяет готовность всех внешних сервисов и сохраняет результат
+    и длительность проверки каждого. Проверка дольше timeout секунд
+    считается неуспешной. Результат старше max_age секунд считается
+    неготовностью, так как проверки перестали выполняться.
+
+    Пока фоновая проверка не запущена, готовность проверяется при
+    каждом запросе результата.
+    """
+
+    def __init__(
+        self,
+        readiness: ReadinessSettings,
+        service_clients: list[ServiceClient],
+    ) -> None:
+        """
+        Метод инициализации.
+
+        :param readiness: Конфигурация проверки готовности.
+        :type readiness: ReadinessSettings
+        :param service_clients: Клиенты проверяемых внешних сервисов.
+        :type service_clients: list[ServiceClient]
+        """
+        self.settings = readiness
+        self.service_clients = service_clients
+        self.dependencies = {
+            service_client.service_name: DependencyStatus(
+                service_client.service_name,
+            )
+            for service_client in service_clients
+        }
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Запускает фоновую проверку в текущем цикле событий."""
+        if self.settings.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает фоновую проверку."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def check(self) -> list[DependencyStatus]:
+        """
+        Одновременно проверяет готовность всех внешних сервисов.
+
+        :return: Результаты проверки.
+        :rtype: list[DependencyStatus]
+        """
+        await asyncio.gather(*(
+            self._probe(service_client)
+            for service_client in self.service_clients
+        ))
+        return self.statuses()
+
+    async def current(self) -> list[DependencyStatus]:
+        """
+        Возвращает результаты проверки готовности.
+
+        :return: Сохраненные результаты при фоновой проверке, иначе
+            результаты новой проверки.
+        :rtype: list[DependencyStatus]
+        """
+        if self._task is None:
+            return await self.check()
+        return self.statuses()
+
+    def statuses(self) -> list[DependencyStatus]:
+        """
+        Возвращает сохраненные результаты проверки.
+
+        Устаревший или отсутствующий результат считается неготовностью.
+
+        :return: Результаты проверки.
+        :rtype: list[DependencyStatus]
+        """
+        oldest = time.monotonic() - self.settings.max_age
+        return [
+            _expire(dependency, oldest)
+            for dependency in self.dependencies.values()
+        ]
+
+    async def _run(self) -> None:
+        while True:  # noqa: WPS457 runs until the task is cancelled
+            await self.check()
+            await asyncio.sleep(self.settings.interval)
+
+    async def _probe(self, service_client: ServiceClient) -> None:
+        started_at = time.monotonic()
+        error = None
+        try:
+            async with asyncio.timeout(self.settings.timeout):
+                await service_client.is_ready()
+        except Exception as probe_error:
+            error = repr(probe_error)
+            logger.warning(
+                f'{service_client.service_name} is not ready: {error}',
+            )
+        checked_at = time.monotonic()
+        self.dependencies[service_client.service_name] = DependencyStatus(
+            name=service_client.service_name,
+            is_ready=error is None,
+            latency=checked_at - started_at,
+            checked_at=checked_at,
+            error=error,
+        )
+
+
+def _expire(dependency: DependencyStatus, oldest: float) -> DependencyStatus:
+    if dependency.checked_at is not None and dependency.checked_at >= oldest:
+        return dependency
+    return replace(dependency, is_ready=False, error=stale_error)
+
+
+readiness_checker = ReadinessChecker(get_settings().readiness, list(clients))
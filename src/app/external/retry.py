@@ -0,0 +1,283 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, replace
+
+import httpx
+
+from app.system import deadline, errors
+from config.config import RetrySettings
+
+logger = logging.getLogger(__name__)
+
+Send = Callable[[], Awaitable[httpx.Response]]
+
+
+@dataclass
+class RetryStats:
+    """Статистика повторов запросов к внешнему сервису."""
+
+    name: str
+    calls: int = 0
+    retries: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    budget_exhausted: int = 0
+    budget_tokens: float = 0
+
+
+class RetryBudget:
+    """
+    Бюджет повторов запросов.
+
+    Каждый вызов пополняет бюджет на ratio, каждый повтор или
+    дублирующий запрос тратит единицу. Поэтому доля повторов не
+    превышает ratio от числа вызовов, а при отказе сервиса повторы
+    не умножают нагрузку на него.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float) -> None:
+        """
+        Метод инициализации.
+
+        :param ratio: Пополнение бюджета за один вызов.
+        :type ratio: float
+        :param max_tokens: Максимальный размер бюджета.
+        :type max_tokens: float
+        """
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self) -> None:
+        """Пополняет бюджет за очередной вызов."""
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Списывает единицу бюджета на повтор.
+
+        :return: Разрешен ли повтор.
+        :rtype: bool
+        """
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class LatencyWindow:
+    """Скользящее окно длительностей последних запросов."""
+
+    def __init__(self, size: int) -> None:
+        """
+        Метод инициализации.
+
+        :param size: Число запоминаемых запросов.
+        :type size: int
+        """
+        self._latencies: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        """
+        Возвращает число запомненных запросов.
+
+        :return: Число запросов в окне.
+        :rtype: int
+        """
+        return len(self._latencies)
+
+    def record(self, latency: float) -> None:
+        """
+        Запоминает длительность запроса.
+
+        :param latency: Длительность запроса в секундах.
+        :type latency: float
+        """
+        self._latencies.append(latency)
+
+    def percentile(self, quantile: float) -> float:
+        """
+        Возвращает перцентиль длительности запросов.
+
+        :param quantile: Квантиль от 0 до 1.
+        :type quantile: float
+        :return: Длительность в секундах.
+        :rtype: float
+        """
+        latencies = sorted(self._latencies)
+        return latencies[int(quantile * (len(latencies) - 1))]
+
+
+class RetryPolicy:  # noqa: WPS214 retry and hedging steps
+    """
+    Политика повторов и дублирования запросов к внешнему сервису.
+
+    Запрос повторяется при ошибке соединения и при кодах ответа из
+    retry_statuses с экспоненциальной задержкой со случайным
+    разбросом. Повторы ограничены числом попыток, бюджетом повторов
+    и сроком обработки запроса: повтор не выполняется, если задержка
+    не укладывается в оставшееся время. Если включено дублирование,
+    а ответ не получен за перцентиль длительности последних запросов,
+    отправляется второй запрос и используется первый успешный ответ.
+    """
+
+    def __init__(self, name: str, retry: RetrySettings) -> None:
+        """
+        Метод инициализации.
+
+        :param name: Имя метода клиента внешнего сервиса.
+        :type name: str
+        :param retry: Конфигурация повторов.
+        :type retry: RetrySettings
+        """
+        self.name = name
+        self.settings = retry
+        self.budget = RetryBudget(retry.budget_ratio, retry.budget_max_tokens)
+        self.latencies = LatencyWindow(retry.latency_window)
+        self.counters = RetryStats(name=name)
+
+    async def run(self, send: Send) -> httpx.Response:
+        """
+        Выполняет запрос с повторами.
+
+        :param send: Функция, выполняющая запрос.
+        :type send: Send
+        :return: Ответ сервиса.
+        :rtype: httpx.Response
+        """
+        self.counters.calls += 1
+        self.budget.deposit()
+        for attempt in range(1, self.settings.max_attempts):
+            delay = self._backoff(attempt)
+            resp = await self._try_attempt(send, delay)
+            if resp is not None:
+                return resp
+            logger.warning(f'retry {self.name} after attempt {attempt}')
+            await asyncio.sleep(delay)
+        return await self._attempt(send)
+
+    def stats(self) -> RetryStats:
+        """
+        Возвращает статистику повторов.
+
+        :return: Статистика повторов.
+        :rtype: RetryStats
+        """
+        return replace(self.counters, budget_tokens=self.budget.tokens)
+
+    def reset(self) -> None:
+        """Сбрасывает статистику, бюджет и окно длительностей запросов."""
+        self.budget = RetryBudget(
+            self.settings.budget_ratio, self.settings.budget_max_tokens,
+        )
+        self.latencies = LatencyWindow(self.settings.latency_window)
+        self.counters = RetryStats(name=self.name)
+
+    async def _try_attempt(
+        self, send: Send, delay: float,
+    ) -> httpx.Response | None:
+        try:
+            resp = await self._attempt(send)
+        except errors.ServerError as error:
+            is_open = isinstance(error, errors.CircuitOpenError)
+            if is_open or not self._can_retry(delay):
+                raise
+            return None
+        if self._should_retry(resp, delay):
+            return None
+        return resp
+
+    async def _attempt(self, send: Send) -> httpx.Response:
+        hedge_delay = self._hedge_delay()
+        if hedge_delay is None:
+            return await self._timed(send)
+        tasks = [self._spawn(send)]
+        try:  # noqa: WPS501 losing requests are cancelled
+            winner = await self._race(send, tasks, hedge_delay)
+        finally:
+            for task in tasks:
+                task.cancel()
+        if winner is not tasks[0]:
+            self.counters.hedge_wins += 1
+        return winner.result()
+
+    async def _race(
+        self,
+        send: Send,
+        tasks: list[asyncio.Future[httpx.Response]],
+        hedge_delay: float,
+    ) -> asyncio.Future[httpx.Response]:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+        if not done and self._withdraw():
+            self.counters.hedges += 1
+            tasks.append(self._spawn(send))
+        return await _first_success(tasks)
+
+    async def _timed(self, send: Send) -> httpx.Response:
+        started_at = time.monotonic()
+        resp = await send()
+        self.latencies.record(time.monotonic() - started_at)
+        return resp
+
+    def _spawn(self, send: Send) -> asyncio.Future[httpx.Response]:
+        task = asyncio.ensure_future(self._timed(send))
+        task.add_done_callback(_retrieve_exception)
+        return task
+
+    def _hedge_delay(self) -> float | None:
+        is_warmed_up = len(self.latencies) >= self.settings.hedge_min_samples
+        if not self.settings.hedging or not is_warmed_up:
+            return None
+        return max(
+            self.latencies.percentile(self.settings.hedge_percentile),
+            self.settings.hedge_min_delay,
+        )
+
+    def _backoff(self, attempt: int) -> float:
+        ceiling = min(
+            self.settings.max_backoff,
+            self.settings.base_backoff * 2 ** (attempt - 1),
+        )
+        return random.uniform(0, ceiling)  # noqa: S311 jitter only
+
+    def _should_retry(self, resp: httpx.Response, delay: float) -> bool:
+        if resp.status_code not in self.settings.retry_statuses:
+            return False
+        return self._can_retry(delay)
+
+    def _can_retry(self, delay: float) -> bool:
+        time_left = deadline.remaining()
+        if time_left is not None and time_left <= delay:
+            return False
+        if not self._withdraw():
+            return False
+        self.counters.retries += 1
+        return True
+
+    def _withdraw(self) -> bool:
+        if self.budget.withdraw():
+            return True
+        self.counters.budget_exhausted += 1
+        return False
+
+
+async def _first_success(
+    tasks: list[asyncio.Future[httpx.Response]],
+) -> asyncio.Future[httpx.Response]:
+    pending = set(tasks)
+    while True:  # noqa: WPS457 exits when a task succeeds or all failed
+        done, pending = await asyncio.wait(
+            pending, return_when=asyncio.FIRST_COMPLETED,
+        )
+        succeeded = [task for task in done if task.exception() is None]
+        if succeeded or not pending:
+            return (succeeded or list(done))[0]
+
+
+def _retrieve_exception(task: asyncio.Future[httpx.Response]) -> None:
+    if not task.cancelled():
+        task.exception()
@@ -0,0 +1,200 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from enum import StrEnum
+from functools import partial
+from typing import NoReturn
+
+import httpx
+from fastapi import HTTPException, status
+
+from app.external.balancer import Upstream
+from app.external.breaker import CircuitBreaker
+from app.external.coalescing import SingleFlight
+from app.external.pool import PoolClosedError
+from app.external.retry import RetryPolicy
+from app.metrics import instrumentation
+from app.system import deadline, errors
+from config.config import BreakerSettings, RetrySettings
+
+logger = logging.getLogger(__name__)
+
+good_response = {'message': 'ok'}
+
+unsent_errors = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.PoolTimeout,
+    httpx.UnsupportedProtocol,
+    httpx.InvalidURL,
+    PoolClosedError,
+)
+
+
+class Key(StrEnum):
+    """Часто повторяемые ключи."""
+
+    authorization = 'Authorization'
+    idempotency_key = 'Idempotency-Key'
+    response_status = 'response_status'
+    http_protocol_prefix = 'http://'
+    https_protocol_prefix = 'https://'
+
+
+class ServiceClient:
+    """Базовый клиент внешнего сервиса."""
+
+    service_name = 'external'
+
+    def __init__(
+        self,
+        client: Upstream,
+        breaker: BreakerSettings | None = None,
+        retries: dict[str, RetrySettings] | None = None,
+    ) -> None:
+        """
+        Метод инициализации.
+
+        :param client: Клиент для создания запросов.
+        :type client: Upstream
+        :param breaker: Конфигурация автомата защиты сервиса.
+        :type breaker: BreakerSettings | None
+        :param retries: Конфигурация повторов по методам клиента.
+        :type retries: dict[str, RetrySettings] | None
+        """
+        self.client = client
+        self.flights = SingleFlight()
+        self.breaker = CircuitBreaker(
+            self.service_name, breaker or BreakerSettings(),
+        )
+        self.retries = {
+            method: RetryPolicy(f'{self.service_name}.{method}', retry)
+            for method, retry in (retries or {}).items()
+            if retry.enabled
+        }
+
+    async def is_ready(self) -> None:
+        """
+        Проверяет готовность сервиса к работе.
+
+        Одновременные проверки готовности объединяются в один запрос.
+        """
+        status_code = await self.flights.run(
+            'is_ready', None, self._probe_ready,
+        )
+        errors.handle_healthz_status_code(status_code)
+        logger.info(f'{self.service_name} service is ready')
+
+    async def _probe_ready(self) -> int:
+        resp = await self._call_idempotent(
+            'is_ready', self.client.get, '/healthz/ready',
+        )
+        return resp.status_code
+
+    async def _call_idempotent(
+        self,
+        method: str,
+        send: Callable[..., Awaitable[httpx.Response]],
+        url: str,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Выполняет повторяемый запрос к сервису.
+
+        Если для метода клиента настроены повторы, запрос выполняется
+        по политике повторов метода.
+
+        :param method: Имя метода клиента.
+        :type method: str
+        :param send: Метод клиента, выполняющий запрос.
+        :type send: Callable
+        :param url: Путь запроса.
+        :type url: str
+        :param kwargs: Параметры запроса.
+        :return: Ответ сервиса.
+        :rtype: httpx.Response
+        """
+        call = partial(self._call, send, url, **kwargs)
+        policy = self.retries.get(method)
+        if policy is None:
+            return await call()
+        return await policy.run(call)
+
+    async def _call(
+        self,
+        send: Callable[..., Awaitable[httpx.Response]],
+        url: str,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Выполняет запрос к сервису через автомат защиты.
+
+        Ошибки соединения, прочие ошибки выполнения запроса и коды
+        ответа 5xx считаются отказами сервиса. Если время на обработку
+        запроса истекло, запрос не выполняется. Ошибки выполнения
+        запроса, который не был отправлен, поднимаются как ServerError
+        или как GatewayTimeoutError, если время на обработку истекло.
+        Ошибки после отправки запроса, когда его результат неизвестен,
+        поднимаются как UnknownOutcomeError или как
+        UpstreamTimeoutError, если время на обработку истекло.
+
+        :param send: Метод клиента, выполняющий запрос.
+        :type send: Callable
+        :param url: Путь запроса.
+        :type url: str
+        :param kwargs: Параметры запроса.
+        :return: Ответ сервиса.
+        :rtype: httpx.Response
+        :raises asyncio.CancelledError: При отмене запроса.
+        :raises HTTPException: Если запрос отклонен самим сервисом.
+        """
+        deadline.check()
+        self.breaker.before_call()
+        started_at = time.monotonic()
+        try:
+            resp = await send(url, **kwargs)
+        except (asyncio.CancelledError, HTTPException):
+            self.breaker.release()
+            raise
+        except Exception as error:
+            self._fail(url, error, started_at)
+        self._record(url, resp.status_code, started_at)
+        return resp
+
+    def _fail(self, url: str, error: Exception, started_at: float) -> NoReturn:
+        self._record(url, None, started_at)
+        logger.error(f'{self.service_name} service error: {error!r}')
+        is_sent = not isinstance(error, unsent_errors)
+        if deadline.is_expired():
+            timeout_error = (
+                errors.UpstreamTimeoutError if is_sent
+                else errors.GatewayTimeoutError
+            )
+            raise timeout_error() from error
+        if is_sent:
+            raise errors.UnknownOutcomeError() from error
+        raise errors.ServerError() from error
+
+    def _record(
+        self, url: str, status_code: int | None, started_at: float,
+    ) -> None:
+        """
+        Учитывает результат запроса в автомате защиты и метриках.
+
+        :param url: Путь запроса.
+        :type url: str
+        :param status_code: Код ответа или None при ошибке соединения.
+        :type status_code: int | None
+        :param started_at: Время начала запроса.
+        :type started_at: float
+        """
+        latency = time.monotonic() - started_at
+        is_failure = (
+            status_code is None or
+            status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+        self.breaker.record(is_failure=is_failure, latency=latency)
+        instrumentation.observe_upstream(
+            self.service_name, url, status_code, latency,
+        )
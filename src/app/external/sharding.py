@@ -0,0 +1,122 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Iterator
+from datetime import datetime, timedelta
+from itertools import chain
+from operator import attrgetter
+from typing import TypeVar
+
+from app.api.models import Report, ReportRequest
+from config.config import ReportShardingSettings
+
+ResultT = TypeVar('ResultT')
+Call = Callable[[], Awaitable[ResultT]]
+IndexedCall = tuple[int, Call[ResultT]]
+
+shard_gap = timedelta(microseconds=1)
+
+
+def split_report_request(
+    report_request: ReportRequest, sharding: ReportShardingSettings,
+) -> list[ReportRequest]:
+    """
+    Разбивает период отчета на последовательные периоды.
+
+    Границы периодов выровнены по сетке shard_days дней от datetime.min,
+    поэтому внутренние периоды пересекающихся запросов совпадают
+    и переиспользуются из кэша. Соседние периоды не пересекаются.
+    Период, который разбивается больше чем на max_shards периодов,
+    запрашивается одним запросом.
+
+    :param report_request: Данные запроса отчета.
+    :type report_request: ReportRequest
+    :param sharding: Конфигурация разбиения отчетов.
+    :type sharding: ReportShardingSettings
+    :return: Запросы отчетов за периоды.
+    :rtype: list[ReportRequest]
+    """
+    if not sharding.enabled:
+        return [report_request]
+    shard_size = timedelta(days=sharding.shard_days)
+    epoch = datetime.min.replace(tzinfo=report_request.start_date.tzinfo)
+    if _count_shards(report_request, epoch, shard_size) > sharding.max_shards:
+        return [report_request]
+    shards = []
+    shard_start = report_request.start_date
+    while shard_start <= report_request.end_date:
+        boundary = epoch + shard_size * (
+            (shard_start - epoch) // shard_size + 1
+        )
+        shards.append(report_request.model_copy(update={
+            'start_date': shard_start,
+            'end_date': min(boundary - shard_gap, report_request.end_date),
+        }))
+        shard_start = boundary
+    return shards
+
+
+async def gather_bounded(
+    calls: list[Call[ResultT]], limit: int,
+) -> list[ResultT]:
+    """
+    Выполняет вызовы конкурентно, не более limit одновременно.
+
+    Вызовы выполняются limit задачами по очереди, поэтому задачи не
+    создаются заранее для каждого вызова. При ошибке одного из
+    вызовов остальные отменяются.
+
+    :param calls: Вызовы.
+    :type calls: list[Call[ResultT]]
+    :param limit: Максимальное число одновременных вызовов.
+    :type limit: int
+    :return: Результаты вызовов в порядке вызовов.
+    :rtype: list[ResultT]
+    """
+    outcomes: dict[int, ResultT] = {}
+    pending = iter(enumerate(calls))
+    workers = [
+        asyncio.ensure_future(_run_pending(pending, outcomes))
+        for _ in range(min(limit, len(calls)))
+    ]
+    try:  # noqa: WPS501 pending calls are cancelled on any error
+        await asyncio.gather(*workers)
+    finally:
+        for worker in workers:
+            worker.cancel()
+    return [outcomes[index] for index in range(len(calls))]
+
+
+def merge_reports(
+    report_request: ReportRequest, reports: list[Report],
+) -> Report:
+    """
+    Объединяет отчеты за периоды в один отчет.
+
+    :param report_request: Данные исходного запроса отчета.
+    :type report_request: ReportRequest
+    :param reports: Отчеты за периоды.
+    :type reports: list[Report]
+    :return: Отчет с транзакциями, упорядоченными по времени.
+    :rtype: Report
+    """
+    transactions = sorted(
+        chain.from_iterable(report.transactions for report in reports),
+        key=attrgetter('timestamp'),
+    )
+    return Report.model_construct(
+        request=report_request, transactions=transactions,
+    )
+
+
+def _count_shards(
+    report_request: ReportRequest, epoch: datetime, shard_size: timedelta,
+) -> int:
+    first_shard = (report_request.start_date - epoch) // shard_size
+    last_shard = (report_request.end_date - epoch) // shard_size
+    return last_shard - first_shard + 1
+
+
+async def _run_pending(
+    pending: Iterator[IndexedCall[ResultT]], outcomes: dict[int, ResultT],
+) -> None:
+    for index, call in pending:
+        outcomes[index] = await call()
@@ -0,0 +1,83 @@
+from app.external.balancer import EndpointStats, UpstreamGroup
+from app.external.breaker import BreakerStats
+from app.external.cache import CacheStats
+from app.external.clients import clients
+from app.external.coalescing import FlightStats
+from app.external.pool import PoolStats
+from app.external.retry import RetryStats
+
+
+def pool_stats() -> list[PoolStats]:
+    """
+    Возвращает статистику пулов соединений клиентов внешних сервисов.
+
+    :return: Статистика пулов соединений.
+    :rtype: list[PoolStats]
+    """
+    return [service_client.client.stats() for service_client in clients]
+
+
+def endpoint_stats() -> list[EndpointStats]:
+    """
+    Возвращает статистику экземпляров внешних сервисов.
+
+    :return: Статистика экземпляров.
+    :rtype: list[EndpointStats]
+    """
+    groups = [
+        service_client.client
+        for service_client in clients
+        if isinstance(service_client.client, UpstreamGroup)
+    ]
+    return [stats for group in groups for stats in group.endpoint_stats()]
+
+
+def cache_stats() -> dict[str, CacheStats]:
+    """
+    Возвращает статистику кэшей клиентов внешних сервисов.
+
+    :return: Статистика кэшей по их именам.
+    :rtype: dict[str, CacheStats]
+    """
+    return {
+        'token': clients.auth_client.token_cache.stats(),
+        'report': clients.transactions_client.report_cache.stats(),
+        'idempotency': clients.transactions_client.idempotency.stats(),
+    }
+
+
+def breaker_stats() -> list[BreakerStats]:
+    """
+    Возвращает статистику автоматов защиты клиентов внешних сервисов.
+
+    :return: Статистика автоматов защиты.
+    :rtype: list[BreakerStats]
+    """
+    return [service_client.breaker.stats() for service_client in clients]
+
+
+def flight_stats() -> dict[str, dict[str, FlightStats]]:
+    """
+    Возвращает статистику объединения запросов клиентов внешних сервисов.
+
+    :return: Статистика объединения запросов по именам сервисов.
+    :rtype: dict[str, dict[str, FlightStats]]
+    """
+    return {
+        service_client.service_name: service_client.flights.stats()
+        for service_client in clients
+    }
+
+
+def retry_stats() -> list[RetryStats]:
+    """
+    Возвращает статистику повторов запросов клиентов внешних сервисов.
+
+    :return: Статистика повторов по методам клиентов.
+    :rtype: list[RetryStats]
+    """
+    return [
+        policy.stats()
+        for service_client in clients
+        for policy in service_client.retries.values()
+    ]
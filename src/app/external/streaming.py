@@ -0,0 +1,247 @@
+import json
+import logging
+import re
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack
+from typing import Any
+
+import httpx
+
+from app.api.models import ReportFormat, Transaction, transactions_adapter
+from app.external.balancer import Upstream
+from config.config import ReportStreamSettings
+
+logger = logging.getLogger(__name__)
+
+media_types = {
+    ReportFormat.ndjson: 'application/x-ndjson',
+    ReportFormat.json: 'application/json',
+}
+
+item_separator = re.compile(r'[\s,]*')
+
+
+async def open_stream(
+    client: Upstream, exit_stack: AsyncExitStack, url: str, **kwargs,
+) -> httpx.Response:
+    """
+    Открывает POST запрос с потоковым чтением тела ответа.
+
+    Ответ остается открытым, пока не закрыт exit_stack.
+
+    :param client: Клиент внешнего сервиса.
+    :type client: Upstream
+    :param exit_stack: Контекст, владеющий открытым ответом.
+    :type exit_stack: AsyncExitStack
+    :param url: Путь запроса.
+    :type url: str
+    :param kwargs: Параметры запроса.
+    :return: Ответ сервиса с непрочитанным телом.
+    :rtype: httpx.Response
+    """
+    return await exit_stack.enter_async_context(
+        client.stream('POST', url, **kwargs),
+    )
+
+
+class JsonArrayParser:
+    """
+    Извлекает элементы JSON массива из тела ответа по частям.
+
+    Массив ищется по ключу объекта, например {"transactions": [...]}.
+    Каждый полностью полученный элемент разбирается сразу, поэтому
+    в памяти хранится только недополученный элемент, а не все тело.
+    До начала массива в памяти хранится только конец полученного тела,
+    в котором еще может начинаться ключ, и начало массива ищется
+    только в нем. Элементами массива должны быть объекты.
+    """
+
+    def __init__(self, key: str, max_item_size: int) -> None:
+        """
+        Метод инициализации.
+
+        :param key: Ключ объекта, под которым находится массив.
+        :type key: str
+        :param max_item_size: Максимальный размер элемента и части тела
+            до начала массива в символах.
+        :type max_item_size: int
+        """
+        self.key = key
+        self.max_item_size = max_item_size
+        self.is_finished = False
+        self._quoted_key = json.dumps(key)
+        self._array_start = re.compile(
+            r'(?<!\\){0}\s*:\s*\['.format(re.escape(self._quoted_key)),
+        )
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._is_started = False
+
+    def feed(self, text: str) -> list[Any]:
+        """
+        Разбирает очередную часть тела ответа.
+
+        :param text: Часть тела ответа.
+        :type text: str
+        :return: Полностью полученные элементы массива.
+        :rtype: list[Any]
+        :raises ValueError: Если элемент массива или часть тела до начала
+            массива превышает допустимый размер.
+        """
+        self._buffer += text
+        if self._is_started or self._find_array():
+            rows = self._decode_rows()
+        else:
+            rows = []
+        if len(self._buffer) > self.max_item_size:
+            raise ValueError(f'{self.key} item exceeds {self.max_item_size}')
+        return rows
+
+    def close(self) -> None:
+        """
+        Проверяет, что массив получен полностью.
+
+        :raises ValueError: Если тело ответа закончилось до конца массива.
+        """
+        if not self.is_finished:
+            raise ValueError(f'{self.key} array is incomplete')
+
+    def _find_array(self) -> bool:
+        match = self._array_start.search(self._buffer)
+        if match is None:
+            self._buffer = self._buffer[self._key_candidate():]
+            return False
+        self._buffer = self._buffer[match.end():]
+        self._is_started = True
+        return True
+
+    def _key_candidate(self) -> int:
+        key_start = self._buffer.rfind(self._quoted_key)
+        if key_start < 0:
+            key_start = len(self._buffer) - len(self._quoted_key) + 1
+        return max(key_start - 1, 0)
+
+    def _decode_rows(self) -> list[Any]:
+        rows = []
+        position = 0
+        while not self.is_finished:
+            row, position = self._decode_next(position)
+            if row is None:
+                break
+            rows.append(row)
+        self._buffer = self._buffer[position:]
+        return rows
+
+    def _decode_next(self, position: int) -> tuple[Any, int]:
+        separators = item_separator.match(self._buffer, position)
+        position = separators.end() if separators else position
+        if self._buffer.startswith(']', position):
+            self.is_finished = True
+            return None, position
+        try:
+            return self._decoder.raw_decode(self._buffer, position)
+        except json.JSONDecodeError:
+            return None, position
+
+
+class ReportStream:
+    """
+    Потоковый отчет о транзакциях.
+
+    Владеет открытым ответом сервиса транзакций и закрывает его
+    после выдачи отчета клиенту. Транзакции проверяются и выдаются
+    пачками по chunk_size строк, поэтому расход памяти не зависит
+    от размера отчета.
+    """
+
+    def __init__(
+        self,
+        resp: httpx.Response,
+        exit_stack: AsyncExitStack,
+        report_format: ReportFormat,
+        report_stream: ReportStreamSettings,
+    ) -> None:
+        """
+        Метод инициализации.
+
+        :param resp: Ответ сервиса транзакций с непрочитанным телом.
+        :type resp: httpx.Response
+        :param exit_stack: Контекст, закрывающий ответ сервиса.
+        :type exit_stack: AsyncExitStack
+        :param report_format: Формат выдачи отчета.
+        :type report_format: ReportFormat
+        :param report_stream: Конфигурация потоковой выдачи отчетов.
+        :type report_stream: ReportStreamSettings
+        """
+        self.report_format = report_format
+        self.settings = report_stream
+        self._resp = resp
+        self._exit_stack = exit_stack
+
+    @property
+    def media_type(self) -> str:
+        """
+        Тип содержимого ответа.
+
+        :return: MIME тип формата отчета.
+        :rtype: str
+        """
+        return media_types[self.report_format]
+
+    async def chunks(self) -> AsyncIterator[list[Transaction]]:
+        """
+        Выдает транзакции отчета пачками.
+
+        :yield: Проверенные транзакции.
+        :ytype: list[Transaction]
+        """
+        parser = JsonArrayParser('transactions', self.settings.max_row_size)
+        chunk_size = self.settings.chunk_size
+        rows: list[Any] = []
+        async for text in self._resp.aiter_text():
+            rows.extend(parser.feed(text))
+            while len(rows) >= chunk_size:
+                yield transactions_adapter.validate_python(rows[:chunk_size])
+                rows = rows[chunk_size:]
+        parser.close()
+        if rows:
+            yield transactions_adapter.validate_python(rows)
+
+    async def encode(self) -> AsyncIterator[bytes]:
+        """
+        Выдает тело ответа клиенту в формате отчета.
+
+        :yield: Часть тела ответа.
+        :ytype: bytes
+        """
+        try:  # noqa: WPS501 upstream response is closed on any error
+            if self.report_format is ReportFormat.ndjson:
+                async for ndjson_chunk in self.chunks():
+                    yield _encode_ndjson(ndjson_chunk)
+            else:
+                async for json_chunk in _encode_json_array(self.chunks()):
+                    yield json_chunk
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Закрывает ответ сервиса транзакций."""
+        await self._exit_stack.aclose()
+
+
+def _encode_ndjson(transactions: list[Transaction]) -> bytes:
+    return ''.join(
+        f'{transaction.model_dump_json()}\n' for transaction in transactions
+    ).encode()
+
+
+async def _encode_json_array(
+    chunks: AsyncIterator[list[Transaction]],
+) -> AsyncIterator[bytes]:
+    prefix = b'['
+    async for chunk in chunks:
+        yield prefix + b','.join(
+            transaction.model_dump_json().encode() for transaction in chunk
+        )
+        prefix = b','
+    yield b']' if prefix == b',' else b'[]'
@@ -0,0 +1,209 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Self
+
+from config.config import ConfigError, LocalJwtSettings
+
+logger = logging.getLogger(__name__)
+
+hash_algorithms = {  # noqa: WPS407 read-only mapping
+    'HS256': hashlib.sha256,
+    'HS384': hashlib.sha384,
+    'HS512': hashlib.sha512,
+}
+
+bearer_prefix = 'bearer '
+token_parts_count = 3
+
+
+class TokenDecision(Enum):
+    """Результат локальной проверки токена."""
+
+    valid = 'valid'
+    invalid = 'invalid'
+    undecided = 'undecided'
+
+
+class MalformedTokenError(Exception):
+    """Токен имеет формат, который нельзя проверить локально."""
+
+
+@dataclass
+class DecodedToken:
+    """Разобранный, но не проверенный JWT."""
+
+    header: dict[str, Any]
+    payload: dict[str, Any]
+    signing_input: bytes
+    signature: bytes
+
+
+class LocalTokenVerifier:
+    """
+    Проверяет подпись и срок действия JWT без обращения к сервису auth.
+
+    Поддерживаются только HMAC алгоритмы с общим секретом. Токены,
+    которые нельзя однозначно проверить локально, получают решение
+    undecided и проверяются сервисом auth.
+    """
+
+    def __init__(self, secret: str, algorithm: str, leeway: float = 0) -> None:
+        """
+        Метод инициализации.
+
+        :param secret: Общий секрет подписи токенов.
+        :type secret: str
+        :param algorithm: Алгоритм подписи токенов.
+        :type algorithm: str
+        :param leeway: Допустимое расхождение часов в секундах.
+        :type leeway: float
+        :raises ConfigError: Если алгоритм не поддерживается.
+        """
+        if algorithm not in hash_algorithms:
+            raise ConfigError(f'unsupported token algorithm: {algorithm}')
+        self.algorithm = algorithm
+        self.leeway = leeway
+        self._secret = secret.encode()
+
+    @classmethod
+    def from_file(cls, file_path: str, leeway: float = 0) -> Self:
+        """
+        Создает объект класса из файла секретов.
+
+        Файл секретов содержит строки вида KEY=value,
+        в том же формате, что используют сервисы auth и transactions.
+
+        :param file_path: Путь к файлу секретов.
+        :type file_path: str
+        :param leeway: Допустимое расхождение часов в секундах.
+        :type leeway: float
+        :return: Объект для локальной проверки токенов.
+        :rtype: LocalTokenVerifier
+        :raises ConfigError: Если файл не найден или не содержит секрет.
+        """
+        secrets_file = Path(file_path)
+        if not secrets_file.is_file():
+            logger.critical(f'secrets file not found: {file_path}')
+            raise ConfigError(f'secrets file not found: {file_path}')
+        secrets = {}
+        for line in secrets_file.read_text().splitlines():
+            key, _, secret_value = line.partition('=')
+            secrets[key.strip()] = secret_value.strip()
+        if not secrets.get('SECRET_KEY'):
+            raise ConfigError(f'SECRET_KEY not found in {file_path}')
+        return cls(
+            secret=secrets['SECRET_KEY'],
+            algorithm=secrets.get('TOKEN_ALGORITHM') or 'HS256',
+            leeway=leeway,
+        )
+
+    @classmethod
+    def from_settings(cls, jwt_settings: LocalJwtSettings) -> Self | None:
+        """
+        Создает объект класса по конфигурации.
+
+        Путь к файлу секретов берется из конфигурации или из переменной
+        окружения SECRETS_PATH.
+
+        :param jwt_settings: Конфигурация локальной проверки токенов.
+        :type jwt_settings: LocalJwtSettings
+        :return: Объект проверки токенов или None, если режим выключен.
+        :rtype: LocalTokenVerifier | None
+        :raises ConfigError: Если путь к файлу секретов не задан.
+        """
+        if not jwt_settings.enabled:
+            return None
+        secrets_path = jwt_settings.secrets_path or os.getenv('SECRETS_PATH')
+        if secrets_path is None:
+            logger.critical('env-var not found: SECRETS_PATH')
+            raise ConfigError('env-var not found: SECRETS_PATH')
+        logger.info('local token verification enabled')
+        return cls.from_file(secrets_path, jwt_settings.leeway)
+
+    def verify(self, token: str) -> TokenDecision:
+        """
+        Проверяет токен пользователя.
+
+        :param token: Заголовок с токеном пользователя.
+        :type token: str
+        :return: Результат проверки.
+        :rtype: TokenDecision
+        """
+        try:
+            decoded = decode_token(token)
+        except MalformedTokenError as error:
+            logger.debug(f'token can not be verified locally: {error}')
+            return TokenDecision.undecided
+        if decoded.header.get('alg') != self.algorithm:
+            return TokenDecision.undecided
+        expected_signature = hmac.digest(
+            self._secret,
+            decoded.signing_input,
+            hash_algorithms[self.algorithm],
+        )
+        if not hmac.compare_digest(decoded.signature, expected_signature):
+            return TokenDecision.invalid
+        return self._check_claims(decoded.payload)
+
+    def _check_claims(self, payload: dict[str, Any]) -> TokenDecision:
+        expires_at = payload.get('exp')
+        if not isinstance(expires_at, int | float):
+            return TokenDecision.undecided
+        now = time.time()
+        if expires_at + self.leeway <= now:
+            return TokenDecision.invalid
+        not_before = payload.get('nbf', now)
+        if not isinstance(not_before, int | float):
+            return TokenDecision.undecided
+        if not_before > now + self.leeway:
+            return TokenDecision.invalid
+        return TokenDecision.valid
+
+
+def decode_token(token: str) -> DecodedToken:
+    """
+    Разбирает JWT без проверки подписи.
+
+    :param token: Заголовок с токеном пользователя.
+    :type token: str
+    :return: Разобранный токен.
+    :rtype: DecodedToken
+    :raises MalformedTokenError: Если токен имеет неверный формат.
+    """
+    if token[:len(bearer_prefix)].lower() == bearer_prefix:
+        token = token[len(bearer_prefix):]
+    parts = token.strip().split('.')
+    if len(parts) != token_parts_count:
+        raise MalformedTokenError('token must have three parts')
+    return DecodedToken(
+        header=_decode_json(parts[0]),
+        payload=_decode_json(parts[1]),
+        signing_input='.'.join(parts[:2]).encode(),
+        signature=_decode(parts[2]),
+    )
+
+
+def _decode(segment: str) -> bytes:
+    padding = '=' * (-len(segment) % 4)
+    try:
+        return base64.urlsafe_b64decode(segment + padding)
+    except ValueError as error:
+        raise MalformedTokenError('invalid base64 segment') from error
+
+
+def _decode_json(segment: str) -> dict[str, Any]:
+    try:
+        decoded = json.loads(_decode(segment))
+    except ValueError as error:
+        raise MalformedTokenError('invalid json segment') from error
+    if not isinstance(decoded, dict):
+        raise MalformedTokenError('token segment must be an object')
+    return decoded
@@ -0,0 +1,273 @@
+import hashlib
+import logging
+from contextlib import AsyncExitStack
+from functools import partial
+from typing import Annotated
+
+from fastapi import Header
+
+from app.api.models import (
+    Report,
+    ReportFormat,
+    ReportRequest,
+    Transaction,
+    validation_rules,
+)
+from app.external import payloads, sharding
+from app.external.balancer import Upstream
+from app.external.batching import MicroBatcher
+from app.external.cache import ReportCache
+from app.external.idempotency import IdempotencyStore
+from app.external.service_client import Key, ServiceClient, good_response
+from app.external.streaming import ReportStream, open_stream
+from app.metrics.tracing import ChildSpan
+from app.system import errors, serialization
+from config.config import (
+    BatchingSettings,
+    BreakerSettings,
+    IdempotencySettings,
+    ReportSettings,
+    RetrySettings,
+    get_settings,
+)
+
+logger = logging.getLogger(__name__)
+
+idempotency_header = Header(
+    alias='Idempotency-Key',
+    min_length=1,
+    max_length=validation_rules.idempotency_key_max_len,
+)
+
+
+class TransactionServiceClient(ServiceClient):  # noqa: WPS214 service API
+    """Клиент сервиса транзакций."""
+
+    service_name = 'transaction'
+
+    def __init__(  # noqa: WPS211 optional client features
+        self,
+        client: Upstream,
+        breaker: BreakerSettings | None = None,
+        retries: dict[str, RetrySettings] | None = None,
+        reports: ReportSettings | None = None,
+        batching: BatchingSettings | None = None,
+        idempotency: IdempotencySettings | None = None,
+    ) -> None:
+        """
+        Метод инициализации.
+
+        :param client: Клиент для создания запросов.
+        :type client: Upstream
+        :param breaker: Конфигурация автомата защиты сервиса.
+        :type breaker: BreakerSettings | None
+        :param retries: Конфигурация повторов по методам клиента.
+        :type retries: dict[str, RetrySettings] | None
+        :param reports: Конфигурация отчетов о транзакциях.
+        :type reports: ReportSettings | None
+        :param batching: Конфигурация пакетного создания транзакций.
+        :type batching: BatchingSettings | None
+        :param idempotency: Конфигурация повтора ответов по ключу
+            идемпотентности.
+        :type idempotency: IdempotencySettings | None
+        """
+        super().__init__(client, breaker, retries)
+        self.reports = reports or get_settings().reports
+        self.report_cache = ReportCache(self.reports.cache)
+        self.batching = batching or BatchingSettings()
+        self.batcher: MicroBatcher[Transaction, int] | None = None
+        if self.batching.enabled:
+            self.batcher = MicroBatcher(self.batching, self._create_batch)
+        self.idempotency: IdempotencyStore[dict[str, str]] = IdempotencyStore(
+            idempotency or IdempotencySettings(),
+        )
+
+    async def get_report(
+        self,
+        report_request: ReportRequest,
+    ) -> Report:
+        """
+        Запрашивает отчет о транзакциях.
+
+        Если включено разбиение отчетов, период отчета разбивается
+        на периоды, отчеты за которые запрашиваются параллельно
+        и объединяются в один отчет.
+
+        :param report_request: Данные для запроса отчета
+        :type report_request: ReportRequest
+        :return: Отчет о транзакциях
+        :rtype: Report
+        """
+        shards = sharding.split_report_request(
+            report_request, self.reports.sharding,
+        )
+        if len(shards) == 1:
+            return await self._get_report_window(report_request)
+        reports = await sharding.gather_bounded(
+            [partial(self._get_report_window, shard) for shard in shards],
+            self.reports.sharding.max_concurrency,
+        )
+        return sharding.merge_reports(report_request, reports)
+
+    async def stream_report(
+        self,
+        report_request: ReportRequest,
+        report_format: ReportFormat = ReportFormat.ndjson,
+    ) -> ReportStream:
+        """
+        Открывает потоковый отчет о транзакциях.
+
+        Тело ответа сервиса транзакций не читается целиком, а
+        разбирается по частям при выдаче отчета клиенту.
+
+        :param report_request: Данные для запроса отчета
+        :type report_request: ReportRequest
+        :param report_format: Формат выдачи отчета
+        :type report_format: ReportFormat
+        :return: Потоковый отчет о транзакциях
+        :rtype: ReportStream
+        """
+        exit_stack = AsyncExitStack()
+        with ChildSpan('stream_report') as span:
+            span.set_tag('report_data', report_request.model_dump_json)
+            resp = await self._call(
+                partial(open_stream, self.client, exit_stack),
+                '/create_report',
+                **serialization.json_request(report_request),
+            )
+            span.set_tag(Key.response_status, resp.status_code)
+            if resp.status_code not in errors.good_status_codes:
+                await exit_stack.aclose()
+            errors.handle_status_code(resp.status_code)
+        return ReportStream(
+            resp, exit_stack, report_format, self.reports.stream,
+        )
+
+    async def create_transaction(
+        self,
+        transaction: Transaction,
+        idempotency_key: Annotated[str | None, idempotency_header] = None,
+    ) -> dict[str, str]:
+        """
+        Создает транзакцию на основании данных пользователя.
+
+        Отчеты пользователя, в период которых попадает транзакция,
+        удаляются из кэша. Если включено пакетное создание, транзакция
+        отправляется сервису в пакете с транзакциями других запросов.
+
+        Транзакция с заголовком Idempotency-Key создается сервисом
+        один раз: повторные запросы пользователя с тем же ключом
+        получают результат первого запроса. Ключ передается сервису
+        транзакций, поэтому такая транзакция отправляется отдельным
+        запросом, а не в пакете.
+
+        :param transaction: Транзакция совершенная пользователем.
+        :type transaction: Transaction
+        :param idempotency_key: Ключ идемпотентности запроса.
+        :type idempotency_key: str | None
+        :return: Сообщение о успехе
+        :rtype: dict[str, str]
+        """
+        if idempotency_key is None:
+            return await self._create_transaction(transaction)
+        return await self.idempotency.run(
+            f'{transaction.username} {idempotency_key}',
+            hashlib.sha256(transaction.model_dump_json().encode()).digest(),
+            partial(self._create_transaction, transaction, idempotency_key),
+        )
+
+    async def _create_transaction(
+        self, transaction: Transaction, idempotency_key: str | None = None,
+    ) -> dict[str, str]:
+        with ChildSpan('create_transaction') as span:
+            span.set_tag('transaction_data', transaction.username)
+            if self.batcher is None or idempotency_key is not None:
+                status_code = await self._create_one(
+                    transaction, idempotency_key,
+                )
+            else:
+                status_code = await self.batcher.submit(transaction)
+            span.set_tag(Key.response_status, status_code)
+            errors.handle_status_code(status_code)
+            self.report_cache.invalidate(
+                transaction.username, transaction.timestamp,
+            )
+            logger.info(f'транзакция создана: {transaction}')
+            return good_response
+
+    async def _create_one(
+        self, transaction: Transaction, idempotency_key: str | None,
+    ) -> int:
+        headers = None
+        if idempotency_key is not None:
+            headers = {str(Key.idempotency_key): idempotency_key}
+        resp = await self._call(
+            self.client.post,
+            '/create_transaction',
+            **serialization.json_request(transaction, headers),
+        )
+        return resp.status_code
+
+    async def _create_batch(self, transactions: list[Transaction]) -> list[int]:
+        """
+        Создает пакет транзакций одним запросом.
+
+        :param transactions: Транзакции пакета.
+        :type transactions: list[Transaction]
+        :return: Коды результата по транзакциям в порядке пакета.
+        :rtype: list[int]
+        """
+        resp = await self._call(
+            self.client.post,
+            self.batching.bulk_path,
+            **serialization.json_request(
+                payloads.TransactionBatch(transactions=transactions),
+            ),
+        )
+        errors.handle_status_code(resp.status_code)
+        return serialization.validate_json(
+            payloads.TransactionBatchPayload, resp.content,
+        ).statuses
+
+    async def _get_report_window(self, report_request: ReportRequest) -> Report:
+        """
+        Запрашивает отчет о транзакциях за период.
+
+        Отчеты сохраняются в кэш. Одновременные запросы одинаковых
+        отчетов объединяются в один.
+
+        :param report_request: Данные для запроса отчета
+        :type report_request: ReportRequest
+        :return: Отчет о транзакциях
+        :rtype: Report
+        """
+        report = self.report_cache.lookup(report_request)
+        if report is not None:
+            return report
+        return await self.flights.run(
+            'get_report',
+            report_request.model_dump_json(),
+            partial(self._fetch_report, report_request),
+        )
+
+    async def _fetch_report(self, report_request: ReportRequest) -> Report:
+        cache_version = self.report_cache.version(report_request.username)
+        with ChildSpan('get_report') as span:
+            span.set_tag('report_data', report_request.model_dump_json)
+            resp = await self._call_idempotent(
+                'get_report',
+                self.client.post,
+                '/create_report',
+                **serialization.json_request(report_request),
+            )
+            span.set_tag(Key.response_status, resp.status_code)
+            errors.handle_status_code(resp.status_code)
+            payload = serialization.validate_json(
+                payloads.ReportPayload, resp.content,
+            )
+            report = Report.model_construct(
+                request=report_request, transactions=payload.transactions,
+            )
+            self.report_cache.remember(report_request, report, cache_version)
+            logger.debug(f'Отчет получен: {report}')
+            return report
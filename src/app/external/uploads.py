@@ -0,0 +1,174 @@
+import logging
+import re
+from collections.abc import AsyncIterator
+
+from fastapi import Request
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import MultipartParser, parse_options_header
+
+from app.system import errors
+from config.config import VerifyUploadSettings
+
+logger = logging.getLogger(__name__)
+
+content_disposition = b'content-disposition'
+line_break = b'\r\n'
+name_option = re.compile(rb'(;\s*name=)("[^"]*"|[^;]*)')
+
+
+class MultipartRelay:  # noqa: WPS214 multipart parser callbacks
+    """
+    Потоковая передача multipart тела запроса внешнему сервису.
+
+    Тело запроса читается по частям по мере получения и сразу
+    передается дальше, поэтому память на загрузку ограничена
+    размером части, а передача начинается до получения всего тела.
+    Части тела переименовываются по renames, заголовки и данные
+    частей передаются без изменений. Значения текстовых полей
+    сохраняются в fields.
+
+    Запрос больше max_size отклоняется до начала передачи, если
+    размер указан в Content-Length, иначе при превышении размера,
+    что прерывает запрос к внешнему сервису.
+    """
+
+    def __init__(
+        self,
+        request: Request,
+        verify_upload: VerifyUploadSettings,
+        renames: dict[str, str],
+    ) -> None:
+        """
+        Метод инициализации.
+
+        :param request: Запрос к сервису с multipart телом.
+        :type request: Request
+        :param verify_upload: Конфигурация передачи изображений.
+        :type verify_upload: VerifyUploadSettings
+        :param renames: Имена частей тела для внешнего сервиса.
+        :type renames: dict[str, str]
+        :raises UnprocessableError: Если тело запроса не multipart.
+        """
+        self.settings = verify_upload
+        self.content_type = request.headers.get('content-type', '')
+        self.fields: dict[str, str] = {}
+        self.is_complete = False
+        media_type, options = parse_options_header(self.content_type)
+        self._boundary = options.get(b'boundary')
+        if media_type != b'multipart/form-data' or not self._boundary:
+            raise errors.UnprocessableError(detail='Ожидалось multipart тело')
+        content_length = request.headers.get('content-length', '')
+        if content_length.isdigit():
+            self._check_size(int(content_length))
+        self._request = request
+        self._renames = {
+            name.encode(): new_name.encode()
+            for name, new_name in renames.items()
+        }
+        self._output: list[bytes] = []
+        self._headers: list[tuple[bytes, bytes]] = []
+        self._header = [b'', b'']
+        self._field_name: str | None = None
+        self._field_value = bytearray()
+        self._parser = MultipartParser(self._boundary, {
+            'on_part_begin': self._on_part_begin,
+            'on_header_field': self._on_header_field,
+            'on_header_value': self._on_header_value,
+            'on_header_end': self._on_header_end,
+            'on_headers_finished': self._on_headers_finished,
+            'on_part_data': self._on_part_data,
+            'on_part_end': self._on_part_end,
+            'on_end': self._on_end,
+        })
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """
+        Выдает тело запроса к внешнему сервису по частям.
+
+        :yield: Часть тела запроса.
+        :ytype: bytes
+        :raises UnprocessableError: Если тело запроса не полное.
+        """
+        received = 0
+        async for chunk in self._request.stream():
+            received += len(chunk)
+            self._check_size(received)
+            self._feed(chunk)
+            if self._output:
+                yield self._flush()
+        self._parser.finalize()
+        if not self.is_complete:
+            raise errors.UnprocessableError(detail='Тело запроса не полное')
+        yield self._flush()
+
+    def _check_size(self, size: int) -> None:
+        if size > self.settings.max_size:
+            logger.warning(f'upload rejected: {size} bytes')
+            raise errors.PayloadTooLargeError()
+
+    def _feed(self, chunk: bytes) -> None:
+        try:
+            self._parser.write(chunk)
+        except MultipartParseError as error:
+            logger.warning(f'invalid multipart body: {error}')
+            raise errors.UnprocessableError() from error
+
+    def _flush(self) -> bytes:
+        output = b''.join(self._output)
+        self._output.clear()
+        return output
+
+    def _on_part_begin(self) -> None:
+        self._headers.clear()
+        self._field_name = None
+        self._field_value.clear()
+
+    def _on_header_field(self, chunk: bytes, start: int, end: int) -> None:
+        self._header[0] += chunk[start:end]
+
+    def _on_header_value(self, chunk: bytes, start: int, end: int) -> None:
+        self._header[1] += chunk[start:end]
+
+    def _on_header_end(self) -> None:
+        field, header_value = self._header
+        if field.lower() == content_disposition:
+            header_value = self._rename(header_value)
+        self._headers.append((field, header_value))
+        self._header = [b'', b'']
+
+    def _on_headers_finished(self) -> None:
+        self._output.extend((b'--', self._boundary, line_break))
+        for field, header_value in self._headers:
+            self._output.extend((field, b': ', header_value, line_break))
+        self._output.append(line_break)
+
+    def _on_part_data(self, chunk: bytes, start: int, end: int) -> None:
+        part = chunk[start:end]
+        if self._field_name is not None:
+            self._field_value += part
+            if len(self._field_value) > self.settings.max_field_size:
+                raise errors.PayloadTooLargeError()
+        self._output.append(part)
+
+    def _on_part_end(self) -> None:
+        self._output.append(line_break)
+        if self._field_name is not None:
+            self.fields[self._field_name] = self._field_value.decode()
+
+    def _on_end(self) -> None:
+        self._output.extend((b'--', self._boundary, b'--', line_break))
+        self.is_complete = True
+
+    def _rename(self, disposition: bytes) -> bytes:
+        _, options = parse_options_header(disposition)
+        name = options.get(b'name', b'')
+        if b'filename' not in options:
+            self._field_name = name.decode()
+        new_name = self._renames.get(name)
+        if new_name is None:
+            return disposition
+        return name_option.sub(
+            lambda match: b''.join((match.group(1), b'"', new_name, b'"')),
+            disposition,
+            count=1,
+        )
@@ -0,0 +1,281 @@
+import time
+
+from app.metrics.registry import Counter, Gauge, Histogram, Registry
+from app.system.asgi import ResponseRecorder
+from config.config import get_settings
+
+settings = get_settings().metrics
+namespace = settings.namespace
+unmatched_route = 'unmatched'
+transport_error = 'error'
+
+request_labels = ('method', 'route', 'status')
+service_labels = ('service',)
+endpoint_labels = ('service', 'endpoint')
+upstream_labels = ('service', 'endpoint', 'status')
+balancer_labels = (*service_labels, 'upstream')
+cache_labels = ('cache',)
+breaker_labels = (*service_labels, 'state')
+method_labels = ('method',)
+flight_labels = (*service_labels, 'group')
+priority_labels = ('priority',)
+route_labels = ('route',)
+
+http_requests = Counter(
+    f'{namespace}_http_requests_total',
+    'Число обработанных запросов к сервису.',
+    request_labels,
+)
+http_in_flight = Gauge(
+    f'{namespace}_http_requests_in_flight',
+    'Число запросов к сервису в обработке.',
+)
+http_duration = Histogram(
+    f'{namespace}_http_request_duration_seconds',
+    'Длительность обработки запросов к сервису.',
+    request_labels,
+    settings.request_buckets,
+)
+upstream_requests = Counter(
+    f'{namespace}_upstream_requests_total',
+    'Число запросов к внешним сервисам по кодам ответа и ошибкам соединения.',
+    upstream_labels,
+)
+upstream_duration = Histogram(
+    f'{namespace}_upstream_request_duration_seconds',
+    'Длительность запросов к внешним сервисам.',
+    endpoint_labels,
+    settings.upstream_buckets,
+)
+pool_in_flight = Gauge(
+    f'{namespace}_upstream_pool_in_flight',
+    'Число выполняемых запросов в пуле соединений внешнего сервиса.',
+    service_labels,
+)
+pool_max_connections = Gauge(
+    f'{namespace}_upstream_pool_max_connections',
+    'Размер пула соединений внешнего сервиса.',
+    service_labels,
+)
+upstream_in_flight = Gauge(
+    f'{namespace}_upstream_endpoint_in_flight',
+    'Число выполняемых запросов к экземпляру внешнего сервиса.',
+    balancer_labels,
+)
+upstream_ejected = Gauge(
+    f'{namespace}_upstream_endpoint_ejected',
+    'Исключен ли экземпляр внешнего сервиса из балансировки.',
+    balancer_labels,
+)
+upstream_ejections = Counter(
+    f'{namespace}_upstream_endpoint_ejections_total',
+    'Число исключений экземпляра внешнего сервиса из балансировки.',
+    balancer_labels,
+)
+breaker_state = Gauge(
+    f'{namespace}_upstream_breaker_state',
+    'Состояние автомата защиты внешнего сервиса, 1 - текущее состояние.',
+    breaker_labels,
+)
+breaker_transitions = Counter(
+    f'{namespace}_upstream_breaker_transitions_total',
+    'Число переходов автомата защиты внешнего сервиса в состояние.',
+    breaker_labels,
+)
+upstream_retries = Counter(
+    f'{namespace}_upstream_retries_total',
+    'Число повторов запросов к внешним сервисам по методам клиентов.',
+    method_labels,
+)
+upstream_hedges = Counter(
+    f'{namespace}_upstream_hedges_total',
+    'Число дублирующих запросов к внешним сервисам по методам клиентов.',
+    method_labels,
+)
+upstream_hedge_wins = Counter(
+    f'{namespace}_upstream_hedge_wins_total',
+    'Число дублирующих запросов, ответивших первыми.',
+    method_labels,
+)
+retry_budget_exhausted = Counter(
+    f'{namespace}_upstream_retry_budget_exhausted_total',
+    'Число повторов, не выполненных из-за исчерпания бюджета повторов.',
+    method_labels,
+)
+flight_executions = Counter(
+    f'{namespace}_upstream_coalesced_executions_total',
+    'Число запросов к внешним сервисам, выполненных для группы вызовов.',
+    flight_labels,
+)
+flight_merged = Counter(
+    f'{namespace}_upstream_coalesced_calls_total',
+    'Число вызовов, объединенных с уже выполняемым запросом.',
+    flight_labels,
+)
+cache_hits = Counter(
+    f'{namespace}_cache_hits_total',
+    'Число попаданий в кэш.',
+    cache_labels,
+)
+cache_misses = Counter(
+    f'{namespace}_cache_misses_total',
+    'Число промахов кэша.',
+    cache_labels,
+)
+cache_hit_ratio = Gauge(
+    f'{namespace}_cache_hit_ratio',
+    'Доля попаданий в кэш.',
+    cache_labels,
+)
+cache_size = Gauge(
+    f'{namespace}_cache_size',
+    'Число записей в кэше.',
+    cache_labels,
+)
+admission_limit = Gauge(
+    f'{namespace}_admission_limit',
+    'Текущий предел одновременно обрабатываемых запросов.',
+)
+admission_in_flight = Gauge(
+    f'{namespace}_admission_in_flight',
+    'Число принятых в обработку запросов.',
+)
+admission_queued = Gauge(
+    f'{namespace}_admission_queued',
+    'Число запросов в очереди на обработку.',
+)
+admission_rejected = Counter(
+    f'{namespace}_admission_rejected_total',
+    'Число отклоненных из-за перегрузки запросов по классу приоритета.',
+    priority_labels,
+)
+rate_limited = Counter(
+    f'{namespace}_rate_limited_total',
+    'Число запросов, отклоненных из-за превышения частоты.',
+    route_labels,
+)
+loop_lag = Histogram(
+    f'{namespace}_event_loop_lag_seconds',
+    'Задержка запуска задач в цикле событий.',
+    buckets=settings.loop_lag_buckets,
+)
+loop_stalls = Counter(
+    f'{namespace}_event_loop_stalls_total',
+    'Число блокировок цикла событий дольше порога.',
+)
+threadpool_in_use = Gauge(
+    f'{namespace}_threadpool_in_use',
+    'Число занятых потоков пула для синхронных вызовов.',
+)
+threadpool_waiting = Gauge(
+    f'{namespace}_threadpool_waiting',
+    'Число вызовов в очереди пула потоков.',
+)
+
+registry = Registry(
+    http_requests,
+    http_in_flight,
+    http_duration,
+    upstream_requests,
+    upstream_duration,
+    pool_in_flight,
+    pool_max_connections,
+    upstream_in_flight,
+    upstream_ejected,
+    upstream_ejections,
+    breaker_state,
+    breaker_transitions,
+    upstream_retries,
+    upstream_hedges,
+    upstream_hedge_wins,
+    retry_budget_exhausted,
+    flight_executions,
+    flight_merged,
+    cache_hits,
+    cache_misses,
+    cache_hit_ratio,
+    cache_size,
+    admission_limit,
+    admission_in_flight,
+    admission_queued,
+    admission_rejected,
+    rate_limited,
+    loop_lag,
+    loop_stalls,
+    threadpool_in_use,
+    threadpool_waiting,
+)
+
+
+def observe_upstream(
+    service: str, endpoint: str, status_code: int | None, latency: float,
+) -> None:
+    """
+    Учитывает запрос к внешнему сервису.
+
+    :param service: Имя внешнего сервиса.
+    :type service: str
+    :param endpoint: Путь запроса.
+    :type endpoint: str
+    :param status_code: Код ответа или None при ошибке соединения.
+    :type status_code: int | None
+    :param latency: Длительность запроса в секундах.
+    :type latency: float
+    """
+    upstream_requests.labels(
+        service, endpoint, status_code or transport_error,
+    ).inc()
+    upstream_duration.labels(service, endpoint).observe(latency)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware, собирающее метрики запросов к сервису.
+
+    Учитывает число запросов в обработке, число и длительность
+    запросов по методу, шаблону маршрута и коду ответа. Запросы,
+    не попавшие ни в один маршрут, учитываются под одной меткой,
+    чтобы число значений меток не зависело от входящих путей.
+    """
+
+    def __init__(self, app) -> None:
+        """
+        Метод инициализации.
+
+        :param app: Следующее ASGI приложение.
+        :type app: ASGIApp
+        """
+        self.app = app
+        self._in_flight = http_in_flight.labels()
+
+    async def __call__(self, scope, receive, send) -> None:
+        """
+        Обрабатывает запрос с учетом метрик.
+
+        :param scope: Scope запроса.
+        :type scope: Scope
+        :param receive: Функция получения сообщений.
+        :type receive: Receive
+        :param send: Функция отправки сообщений.
+        :type send: Send
+        """
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        recorder = ResponseRecorder(send)
+        self._in_flight.inc()
+        started_at = time.perf_counter()
+        try:  # noqa: WPS501 request is counted on any outcome
+            await self.app(scope, receive, recorder)
+        finally:
+            self._in_flight.dec()
+            _observe_request(
+                scope, recorder.final_status, time.perf_counter() - started_at,
+            )
+
+
+def _observe_request(scope, status_code: int, latency: float) -> None:
+    route = getattr(scope.get('route'), 'path', unmatched_route)
+    method = scope['method']
+    http_requests.labels(method, route, status_code).inc()
+    http_duration.labels(method, route, status_code).observe(latency)
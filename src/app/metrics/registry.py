@@ -0,0 +1,275 @@
+import abc
+from bisect import bisect_left
+from collections.abc import Iterator, Sequence
+from typing import Any, Generic, TypeVar
+
+LabelValue = str | int
+MetricT = TypeVar('MetricT', bound='Metric[Any]')
+ChildT = TypeVar('ChildT')
+
+content_type = 'text/plain; version=0.0.4; charset=utf-8'
+label_escapes = str.maketrans({'\\': r'\\', '"': r'\"', '\n': r'\n'})
+
+
+class ScalarValue:
+    """Значение счетчика или датчика с фиксированными значениями меток."""
+
+    def __init__(self, label_text: str) -> None:
+        """
+        Метод инициализации.
+
+        :param label_text: Метки в формате Prometheus.
+        :type label_text: str
+        """
+        self.label_text = label_text
+        self.current: float = 0
+
+    def inc(self, amount: float = 1) -> None:
+        """
+        Увеличивает значение.
+
+        :param amount: Величина увеличения.
+        :type amount: float
+        """
+        self.current += amount
+
+    def dec(self, amount: float = 1) -> None:
+        """
+        Уменьшает значение.
+
+        :param amount: Величина уменьшения.
+        :type amount: float
+        """
+        self.current -= amount
+
+    def set(self, amount: float) -> None:
+        """
+        Задает значение.
+
+        :param amount: Новое значение.
+        :type amount: float
+        """
+        self.current = amount
+
+
+class HistogramValue:
+    """
+    Гистограмма с фиксированными значениями меток.
+
+    Счетчики корзин выделяются при создании, поэтому наблюдение
+    сводится к бинарному поиску корзины и двум сложениям.
+    """
+
+    def __init__(self, label_text: str, bounds: tuple[float, ...]) -> None:
+        """
+        Метод инициализации.
+
+        :param label_text: Метки в формате Prometheus.
+        :type label_text: str
+        :param bounds: Верхние границы корзин по возрастанию.
+        :type bounds: tuple[float, ...]
+        """
+        self.label_text = label_text
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # noqa: WPS435 int counters
+        self.total: float = 0
+
+    def observe(self, amount: float) -> None:
+        """
+        Учитывает наблюдение.
+
+        :param amount: Наблюдаемое значение.
+        :type amount: float
+        """
+        self.counts[bisect_left(self.bounds, amount)] += 1
+        self.total += amount
+
+
+class Metric(abc.ABC, Generic[ChildT]):
+    """
+    Метрика с метками.
+
+    Значения для каждого набора значений меток создаются при первом
+    обращении и затем переиспользуются. Текст меток формируется один
+    раз при создании значения, а не при каждой выгрузке. Наследники
+    задают создание значения и его строки выгрузки.
+    """
+
+    kind = 'untyped'
+
+    def __init__(
+        self, name: str, documentation: str, label_names: Sequence[str] = (),
+    ) -> None:
+        """
+        Метод инициализации.
+
+        :param name: Имя метрики.
+        :type name: str
+        :param documentation: Описание метрики.
+        :type documentation: str
+        :param label_names: Имена меток.
+        :type label_names: Sequence[str]
+        """
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._children: dict[tuple[LabelValue, ...], ChildT] = {}
+
+    def labels(self, *label_values: LabelValue) -> ChildT:
+        """
+        Возвращает значение метрики для значений меток.
+
+        :param label_values: Значения меток в порядке label_names.
+        :type label_values: LabelValue
+        :return: Значение метрики.
+        :rtype: ChildT
+        :raises ValueError: Если число значений не совпадает с числом меток.
+        """
+        child = self._children.get(label_values)
+        if child is not None:
+            return child
+        if len(label_values) != len(self.label_names):
+            raise ValueError(f'{self.name} expects labels {self.label_names}')
+        return self._children.setdefault(
+            label_values, self._make_child(self._format_labels(label_values)),
+        )
+
+    def collect(self) -> Iterator[str]:
+        """
+        Выдает метрику в текстовом формате Prometheus.
+
+        :yield: Строка выгрузки.
+        :ytype: str
+        """
+        yield '# HELP {0} {1}\n# TYPE {0} {2}'.format(
+            self.name, self.documentation, self.kind,
+        )
+        for child in list(self._children.values()):
+            yield from self._samples(child)
+
+    @abc.abstractmethod
+    def _make_child(self, label_text: str) -> ChildT:
+        """
+        Создает значение метрики.
+
+        :param label_text: Метки в формате Prometheus.
+        :type label_text: str
+        """
+
+    @abc.abstractmethod
+    def _samples(self, child: ChildT) -> Iterator[str]:
+        """
+        Выдает строки выгрузки значения метрики.
+
+        :param child: Значение метрики.
+        :type child: ChildT
+        """
+
+    @classmethod
+    def _sample(cls, name: str, label_text: str, amount: float) -> str:
+        if label_text:
+            return f'{name}{{{label_text}}} {amount}'
+        return f'{name} {amount}'
+
+    def _format_labels(self, label_values: tuple[LabelValue, ...]) -> str:
+        return ','.join(
+            '{0}="{1}"'.format(name, str(label_value).translate(label_escapes))
+            for name, label_value in zip(self.label_names, label_values)
+        )
+
+
+class Counter(Metric[ScalarValue]):
+    """Монотонно растущий счетчик."""
+
+    kind = 'counter'
+
+    def _make_child(self, label_text: str) -> ScalarValue:
+        return ScalarValue(label_text)
+
+    def _samples(self, child: ScalarValue) -> Iterator[str]:
+        yield self._sample(self.name, child.label_text, child.current)
+
+
+class Gauge(Counter):
+    """Датчик, значение которого может уменьшаться."""
+
+    kind = 'gauge'
+
+
+class Histogram(Metric[HistogramValue]):
+    """Гистограмма распределения значений по корзинам."""
+
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = (),
+    ) -> None:
+        """
+        Метод инициализации.
+
+        :param name: Имя метрики.
+        :type name: str
+        :param documentation: Описание метрики.
+        :type documentation: str
+        :param label_names: Имена меток.
+        :type label_names: Sequence[str]
+        :param buckets: Верхние границы корзин.
+        :type buckets: Sequence[float]
+        """
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._bounds_text = [*map(str, self.buckets), '+Inf']
+
+    def _make_child(self, label_text: str) -> HistogramValue:
+        return HistogramValue(label_text, self.buckets)
+
+    def _samples(self, child: HistogramValue) -> Iterator[str]:
+        prefix = f'{child.label_text},' if child.label_text else ''
+        cumulative = 0
+        for bound, count in zip(self._bounds_text, child.counts):
+            cumulative += count
+            bucket_labels = '{0}le="{1}"'.format(prefix, bound)
+            yield self._sample(f'{self.name}_bucket', bucket_labels, cumulative)
+        yield from (
+            self._sample(f'{self.name}_sum', child.label_text, child.total),
+            self._sample(f'{self.name}_count', child.label_text, cumulative),
+        )
+
+
+class Registry:
+    """Набор метрик сервиса."""
+
+    def __init__(self, *metrics: Metric[Any]) -> None:
+        """
+        Метод инициализации.
+
+        :param metrics: Метрики набора.
+        :type metrics: Metric
+        """
+        self.metrics = list(metrics)
+
+    def register(self, metric: MetricT) -> MetricT:
+        """
+        Добавляет метрику в набор.
+
+        :param metric: Метрика.
+        :type metric: MetricT
+        :return: Добавленная метрика.
+        :rtype: MetricT
+        """
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """
+        Выгружает метрики в текстовом формате Prometheus.
+
+        :return: Текст выгрузки.
+        :rtype: str
+        """
+        lines = [line for metric in self.metrics for line in metric.collect()]
+        return '{0}\n'.format('\n'.join(lines))
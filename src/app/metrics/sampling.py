@@ -0,0 +1,115 @@
+import random
+import time
+from enum import StrEnum
+
+from config.config import TracingSettings
+
+
+class SamplerType(StrEnum):
+    """Тип выборки запросов для трейсинга."""
+
+    const = 'const'
+    probabilistic = 'probabilistic'
+    rate_limiting = 'ratelimiting'
+
+
+class ConstSampler:
+    """Выборка всех запросов или ни одного."""
+
+    def __init__(self, decision: bool) -> None:
+        """
+        Метод инициализации.
+
+        :param decision: Попадают ли запросы в выборку.
+        :type decision: bool
+        """
+        self.decision = decision
+
+    def is_sampled(self) -> bool:
+        """
+        Решает, попадает ли запрос в выборку.
+
+        :return: Попадает ли запрос в выборку.
+        :rtype: bool
+        """
+        return self.decision
+
+
+class ProbabilisticSampler(ConstSampler):
+    """Выборка запросов с заданной вероятностью."""
+
+    def __init__(self, rate: float) -> None:
+        """
+        Метод инициализации.
+
+        :param rate: Доля запросов в выборке от 0 до 1.
+        :type rate: float
+        """
+        super().__init__(decision=rate > 0)
+        self.rate = rate
+
+    def is_sampled(self) -> bool:
+        """
+        Решает, попадает ли запрос в выборку.
+
+        :return: Попадает ли запрос в выборку.
+        :rtype: bool
+        """
+        return random.random() < self.rate  # noqa: S311 sampling only
+
+
+class RateLimitingSampler(ConstSampler):
+    """
+    Выборка не более заданного числа запросов в секунду.
+
+    Ограничение реализовано корзиной маркеров емкостью в одну
+    секунду выборки, поэтому всплески нагрузки не увеличивают
+    число трейсов сверх max_traces_per_second.
+    """
+
+    def __init__(self, max_traces_per_second: float) -> None:
+        """
+        Метод инициализации.
+
+        :param max_traces_per_second: Число трейсов в секунду.
+        :type max_traces_per_second: float
+        """
+        super().__init__(decision=max_traces_per_second > 0)
+        self.max_traces_per_second = max_traces_per_second
+        self._tokens = max(max_traces_per_second, 1)
+        self._updated_at = time.monotonic()
+
+    def is_sampled(self) -> bool:
+        """
+        Решает, попадает ли запрос в выборку.
+
+        :return: Попадает ли запрос в выборку.
+        :rtype: bool
+        """
+        now = time.monotonic()
+        rate = self.max_traces_per_second
+        self._tokens = min(
+            max(rate, 1), self._tokens + (now - self._updated_at) * rate,
+        )
+        self._updated_at = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+def make_sampler(tracing: TracingSettings) -> ConstSampler:
+    """
+    Создает выборку запросов по конфигурации трейсинга.
+
+    :param tracing: Конфигурация трейсинга.
+    :type tracing: TracingSettings
+    :return: Выборка запросов.
+    :rtype: ConstSampler
+    """
+    sampler_type = SamplerType(tracing.sampler_type)
+    if sampler_type is SamplerType.probabilistic:
+        return ProbabilisticSampler(tracing.sampler_param)
+    if sampler_type is SamplerType.rate_limiting:
+        return RateLimitingSampler(tracing.sampler_param)
+    return ConstSampler(decision=bool(tracing.sampler_param))
@@ -1,30 +1,50 @@
-from typing import Any
+import time
+from typing import Any, Self
 
-from fastapi import Request
+from fastapi import Request, status
 from jaeger_client.config import Config
+from jaeger_client.constants import SAMPLED_FLAG
 from jaeger_client.tracer import Tracer
 from opentracing import (
     InvalidCarrierException,
+    Scope,
+    SpanContext,
     SpanContextCorruptedException,
     global_tracer,
     propagation,
     tags,
 )
+from opentracing.scope_managers.contextvars import ContextVarsScopeManager
 
-from config.config import get_settings
+from app.metrics.sampling import SamplerType, make_sampler
+from app.system.asgi import ResponseRecorder
+from config.config import TracingSettings, get_settings
+
+not_business_routes = (
+    '/healthz/up',
+    '/healthz/ready',
+    '/metrics',
+    '/debug',
+)
+error_status = status.HTTP_500_INTERNAL_SERVER_ERROR
 
 
 def get_tracer() -> Tracer | None:
-    """Создает трейсер."""
+    """
+    Создает трейсер.
+
+    Трейсер отправляет все созданные спаны: решение о выборке
+    принимает TracingMiddleware до создания спана запроса.
+
+    :return: Трейсер или None, если трейсинг выключен.
+    :rtype: Tracer | None
+    """
     settings = get_settings().tracing
     if not settings.enabled:
         return None
     config = Config(
         config={
-            'sampler': {
-                'type': settings.sampler_type,
-                'param': settings.sampler_param,
-            },
+            'sampler': {'type': SamplerType.const, 'param': 1},
             'local_agent': {
                 'reporting_host': settings.agent_host,
                 'reporting_port': settings.agent_port,
@@ -33,6 +53,7 @@ def get_tracer() -> Tracer | None:
         },
         service_name=settings.service_name,
         validate=settings.validate,
+        scope_manager=ContextVarsScopeManager(),
     )
     return config.initialize_tracer()
 
@@ -46,44 +67,193 @@ def is_business_route(path: str) -> bool:
     :return: относится ли путь к бизнес логике приложения.
     :rtype: bool
     """
-    not_business_routes = [
-        '/healthz/up',
-        '/healthz/ready',
-        '/metrics',
-    ]
-    return not any((path.startswith(route) for route in not_business_routes))
+    return not path.startswith(not_business_routes)
+
+
+class TracingMiddleware:  # noqa: WPS214 head and tail sampling steps
+    """
+    ASGI middleware, создающее спан для запроса к сервису.
+
+    Решение о выборке принимается до обработки запроса: по флагу
+    родительского спана, а без него по выборке из конфигурации.
+    Для запросов вне выборки спан не создается. Если такой запрос
+    завершился ошибкой 5xx или длился дольше slow_request_threshold,
+    после его обработки отправляется спан с тегом sampling.reason.
+    Служебные маршруты передаются дальше без трейсинга. Спан
+    закрывается после отправки всего ответа, в том числе потокового.
+    """
+
+    def __init__(self, app, tracing: TracingSettings) -> None:
+        """
+        Метод инициализации.
+
+        :param app: Следующее ASGI приложение.
+        :type app: ASGIApp
+        :param tracing: Конфигурация трейсинга.
+        :type tracing: TracingSettings
+        """
+        self.app = app
+        self.settings = tracing
+        self.sampler = make_sampler(tracing)
+
+    async def __call__(self, scope, receive, send) -> None:
+        """
+        Обрабатывает запрос в спане.
+
+        :param scope: Scope запроса.
+        :type scope: Scope
+        :param receive: Функция получения сообщений.
+        :type receive: Receive
+        :param send: Функция отправки сообщений.
+        :type send: Send
+        """
+        if scope['type'] != 'http' or not is_business_route(scope['path']):
+            await self.app(scope, receive, send)
+            return
+        request = Request(scope)
+        span_ctx = _extract(request)
+        if self._is_sampled(span_ctx):
+            await self._trace(request, span_ctx, receive, send)
+        else:
+            await self._observe(request, span_ctx, receive, send)
+
+    def _is_sampled(self, span_ctx: SpanContext | None) -> bool:
+        if span_ctx is None:
+            return self.sampler.is_sampled()
+        flags = getattr(span_ctx, 'flags', SAMPLED_FLAG)
+        return bool(flags & SAMPLED_FLAG)
+
+    async def _trace(
+        self, request: Request, span_ctx: SpanContext | None, receive, send,
+    ) -> None:
+        recorder = ResponseRecorder(send)
+        with global_tracer().start_active_span(
+            _operation_name(request),
+            child_of=span_ctx,
+            tags=_request_tags(request),
+        ) as span_scope:
+            await self.app(request.scope, receive, recorder)
+            span_scope.span.set_tag(
+                tags.HTTP_STATUS_CODE, recorder.final_status,
+            )
+
+    async def _observe(
+        self, request: Request, span_ctx: SpanContext | None, receive, send,
+    ) -> None:
+        recorder = ResponseRecorder(send)
+        started_at = time.time()
+        try:
+            await self.app(request.scope, receive, recorder)
+        except Exception:
+            self._report(request, span_ctx, started_at, recorder.final_status)
+            raise
+        if self._is_notable(recorder.final_status, started_at):
+            self._report(request, span_ctx, started_at, recorder.final_status)
 
+    def _is_notable(self, status_code: int, started_at: float) -> bool:
+        if self.settings.sample_errors and status_code >= error_status:
+            return True
+        threshold = self.settings.slow_request_threshold
+        return bool(threshold) and time.time() - started_at >= threshold
 
-async def tracing_middleware(request: Request, call_next) -> Any:
+    def _report(
+        self,
+        request: Request,
+        span_ctx: SpanContext | None,
+        started_at: float,
+        status_code: int,
+    ) -> None:
+        span = global_tracer().start_span(
+            _operation_name(request),
+            child_of=span_ctx,
+            tags={tags.SAMPLING_PRIORITY: 1},
+            start_time=started_at,
+            ignore_active_span=True,
+        )
+        is_error = status_code >= error_status
+        for tag_key, tag_value in _request_tags(request).items():
+            span.set_tag(tag_key, tag_value)
+        span.set_tag(tags.HTTP_STATUS_CODE, status_code)
+        span.set_tag('sampling.reason', 'error' if is_error else 'slow')
+        if is_error:
+            span.set_tag(tags.ERROR, value=True)
+        span.finish()
+
+
+class ChildSpan:
     """
-    Создает спан для сервиса.
-
-    :param request: Объект запроса к сервису.
-    :type request: Request
-    :param call_next: Следующая за middleware функция обработчик.
-    :type call_next: Callable
-    :return: Ответ от следующей за middleware функцией обработчиком.
-    :rtype: Response
+    Дочерний спан операции внутри запроса к сервису.
+
+    Спан создается, только если у запроса есть активный спан, то есть
+    запрос попал в выборку. Значение тега может быть функцией, тогда
+    она вызывается только для созданного спана, поэтому сериализация
+    данных для тегов не выполняется для запросов вне выборки.
     """
-    path = request.url.path
-    if not is_business_route(path):
-        return await call_next(request)
+
+    def __init__(self, operation_name: str) -> None:
+        """
+        Метод инициализации.
+
+        :param operation_name: Имя операции.
+        :type operation_name: str
+        """
+        self.operation_name = operation_name
+        self._scope: Scope | None = None
+
+    def __enter__(self) -> Self:
+        """
+        Открывает спан, если запрос попал в выборку.
+
+        :return: Дочерний спан.
+        :rtype: ChildSpan
+        """
+        tracer = global_tracer()
+        if tracer.active_span is not None:
+            self._scope = tracer.start_active_span(self.operation_name)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Закрывает спан.
+
+        :param exc_info: Исключение, завершившее операцию.
+        :type exc_info: tuple
+        """
+        if self._scope is not None:
+            self._scope.__exit__(*exc_info)
+
+    def set_tag(self, key: str, tag_value: Any) -> None:
+        """
+        Задает тег спана.
+
+        :param key: Имя тега.
+        :type key: str
+        :param tag_value: Значение тега или функция, возвращающая его.
+        :type tag_value: Any
+        """
+        if self._scope is None:
+            return
+        if callable(tag_value):
+            tag_value = tag_value()
+        self._scope.span.set_tag(key, tag_value)
+
+
+def _extract(request: Request) -> SpanContext | None:
     try:
-        span_ctx = global_tracer().extract(
+        return global_tracer().extract(
             propagation.Format.HTTP_HEADERS, request.headers,
         )
     except (InvalidCarrierException, SpanContextCorruptedException):
-        span_ctx = None
-    span_tags = {
+        return None
+
+
+def _operation_name(request: Request) -> str:
+    return 'api_gateway_{0}_{1}'.format(request.method, request.url.path)
+
+
+def _request_tags(request: Request) -> dict[str, Any]:
+    return {
         tags.SPAN_KIND: tags.SPAN_KIND_RPC_SERVER,
         tags.HTTP_METHOD: request.method,
         tags.HTTP_URL: str(request.url),
     }
-    with global_tracer().start_active_span(
-        f'api_gateway_{request.method}_{path}',
-        child_of=span_ctx,
-        tags=span_tags,
-    ) as scope:
-        response = await call_next(request)
-        scope.span.set_tag(tags.HTTP_STATUS_CODE, response.status_code)
-        return response
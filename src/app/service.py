@@ -2,12 +2,20 @@ import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
-from starlette.middleware.base import BaseHTTPMiddleware
 
 # without import from handlers routing doesn't work
+from app.api.debug.handlers import debug  # type: ignore
 from app.api.handlers import routes  # type: ignore
 from app.api.healthz.handlers import healthz  # type: ignore
-from app.metrics.tracing import get_tracer, tracing_middleware
+from app.api.metrics.handlers import metrics  # type: ignore
+from app.external.clients import close_clients, start_clients
+from app.external.readiness import readiness_checker
+from app.metrics.instrumentation import MetricsMiddleware
+from app.metrics.tracing import TracingMiddleware, get_tracer
+from app.system.admission import AdmissionMiddleware, admission_limiter
+from app.system.deadline import DeadlineMiddleware
+from app.system.loop_monitor import loop_monitor
+from config.config import get_settings
 
 
 @asynccontextmanager
@@ -19,15 +27,30 @@ async def lifespan(app: FastAPI):
     :yield: Scope запроса
     """
     tracer = get_tracer()
+    await start_clients()
+    loop_monitor.start()
+    readiness_checker.start()
     yield {'tracer': tracer}
+    await readiness_checker.stop()
+    await loop_monitor.stop()
+    await close_clients()
 
 app = FastAPI(lifespan=lifespan)
 
-app.add_middleware(BaseHTTPMiddleware, dispatch=tracing_middleware)
+if get_settings().tracing.enabled:
+    app.add_middleware(TracingMiddleware, tracing=get_settings().tracing)
+app.add_middleware(AdmissionMiddleware, limiter=admission_limiter)
+app.add_middleware(DeadlineMiddleware, deadlines=get_settings().deadlines)
+if get_settings().metrics.enabled:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(router=metrics)
 
 app.include_router(router=routes.auth)
 app.include_router(router=routes.transaction)
 app.include_router(router=healthz)
+loop_settings = get_settings().loop_monitor
+if loop_settings.enabled and loop_settings.debug_endpoint:
+    app.include_router(router=debug)
 
 
 if __name__ == '__main__':
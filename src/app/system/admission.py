@@ -0,0 +1,266 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+
+from fastapi.responses import JSONResponse
+
+from app.system import deadline, errors
+from app.system.asgi import ResponseRecorder
+from config.config import AdmissionSettings, get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AdmissionStats:
+    """Статистика ограничения одновременных запросов."""
+
+    limit: float
+    in_flight: int
+    queued: int
+    admitted: int
+    rejected: dict[int, int] = field(default_factory=dict)
+
+
+@dataclass(order=True)
+class Waiter:
+    """Запрос в очереди на обработку."""
+
+    priority: int
+    order: int
+    admission: asyncio.Future[None] = field(compare=False)
+
+
+class AdaptiveLimiter:  # noqa: WPS214 queue and limit adaptation steps
+    """
+    Адаптивное ограничение числа одновременно обрабатываемых запросов.
+
+    Предел подбирается по принципу AIMD: каждый запрос, начавший
+    ответ быстрее целевой задержки своего класса приоритета при
+    полной загрузке, увеличивает предел на increase_step / limit, то
+    есть примерно на increase_step за каждые limit запросов, а
+    медленный ответ или превышение срока обработки запроса уменьшает
+    предел в decrease_ratio раз, но не чаще одного раза за
+    decrease_interval секунд. Целевая задержка класса берется из
+    target_latencies, по умолчанию - target_latency. Запросы классов
+    с номером больше max_adaptive_priority, например долгие отчеты,
+    не меняют предел. Коды ответов не учитываются: ответы 503 и 504
+    внешних сервисов не означают перегрузку самого сервиса.
+
+    Запросы сверх предела ждут в очереди не дольше max_wait секунд,
+    освободившееся место получает запрос с наименьшим номером класса
+    приоритета, в классе - пришедший раньше. При полной очереди
+    новый запрос вытесняет из очереди последний запрос менее
+    приоритетного класса или отклоняется сам.
+    """
+
+    def __init__(self, admission: AdmissionSettings) -> None:
+        """
+        Метод инициализации.
+
+        :param admission: Конфигурация ограничения запросов.
+        :type admission: AdmissionSettings
+        """
+        self.settings = admission
+        self.limit = admission.initial_limit
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected: dict[int, int] = {}
+        self._queue: list[Waiter] = []
+        self._order = itertools.count()
+        self._decreased_at = -math.inf
+
+    async def acquire(self, priority: int) -> None:
+        """
+        Занимает место для обработки запроса.
+
+        :param priority: Класс приоритета запроса, 0 - наивысший.
+        :type priority: int
+        :raises OverloadedError: Если ожидание места дольше max_wait.
+        :raises asyncio.CancelledError: При отмене ожидания.
+        """
+        if self.in_flight < self.limit and not self._queue:
+            self._admit()
+            return
+        if len(self._queue) >= self.settings.max_queue:
+            self._evict(priority)
+        loop = asyncio.get_running_loop()
+        waiter = Waiter(priority, next(self._order), loop.create_future())
+        heapq.heappush(self._queue, waiter)
+        try:
+            async with asyncio.timeout(self.settings.max_wait):
+                await waiter.admission
+        except TimeoutError as error:
+            self._abandon(waiter)
+            self._count_rejected(priority)
+            raise errors.OverloadedError(self.settings.retry_after) from error
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+
+    def release(
+        self, priority: int, latency: float, is_overloaded: bool,
+    ) -> None:
+        """
+        Освобождает место и подстраивает предел по результату запроса.
+
+        :param priority: Класс приоритета запроса.
+        :type priority: int
+        :param latency: Время до начала ответа в секундах.
+        :type latency: float
+        :param is_overloaded: Превышен ли срок обработки запроса.
+        :type is_overloaded: bool
+        """
+        if priority <= self.settings.max_adaptive_priority:
+            self._adapt(priority, latency, is_overloaded)
+        self.in_flight -= 1
+        self._wake()
+
+    def stats(self) -> AdmissionStats:
+        """
+        Возвращает статистику ограничения запросов.
+
+        :return: Статистика ограничения запросов.
+        :rtype: AdmissionStats
+        """
+        return AdmissionStats(
+            limit=self.limit,
+            in_flight=self.in_flight,
+            queued=len(self._queue),
+            admitted=self.admitted,
+            rejected=dict(self.rejected),
+        )
+
+    def _adapt(
+        self, priority: int, latency: float, is_overloaded: bool,
+    ) -> None:
+        target_latency = self.settings.target_latencies.get(
+            priority, self.settings.target_latency,
+        )
+        if is_overloaded or latency > target_latency:
+            self._decrease()
+        elif self.in_flight >= self.limit or self._queue:
+            self.limit = min(
+                self.limit + self.settings.increase_step / self.limit,
+                self.settings.max_limit,
+            )
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        if now - self._decreased_at < self.settings.decrease_interval:
+            return
+        self._decreased_at = now
+        self.limit = max(
+            self.limit * self.settings.decrease_ratio,
+            self.settings.min_limit,
+        )
+
+    def _admit(self) -> None:
+        self.in_flight += 1
+        self.admitted += 1
+
+    def _wake(self) -> None:
+        while self._queue and self.in_flight < self.limit:
+            waiter = heapq.heappop(self._queue)
+            if waiter.admission.done():
+                continue
+            self._admit()
+            waiter.admission.set_result(None)
+
+    def _evict(self, priority: int) -> None:
+        last = max(self._queue, default=None)
+        if last is None or last.priority <= priority:
+            self._count_rejected(priority)
+            raise errors.OverloadedError(self.settings.retry_after)
+        self._queue.remove(last)
+        heapq.heapify(self._queue)
+        self._count_rejected(last.priority)
+        if not last.admission.done():
+            last.admission.set_exception(
+                errors.OverloadedError(self.settings.retry_after),
+            )
+
+    def _abandon(self, waiter: Waiter) -> None:
+        if waiter in self._queue:
+            self._queue.remove(waiter)
+            heapq.heapify(self._queue)
+        elif waiter.admission.done() and not waiter.admission.cancelled():
+            if waiter.admission.exception() is None:
+                self.in_flight -= 1
+                self._wake()
+
+    def _count_rejected(self, priority: int) -> None:
+        self.rejected[priority] = self.rejected.get(priority, 0) + 1
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware, ограничивающее число одновременных запросов.
+
+    Класс приоритета запроса берется по пути из routes конфигурации.
+    Запросы, не получившие места, отклоняются ответом 503 с
+    заголовком Retry-After до обработки, чтобы перегрузка не
+    увеличивала задержку принятых запросов. Middleware работает
+    внутри DeadlineMiddleware, поэтому ожидание в очереди входит в
+    срок обработки запроса, а срок, истекший до начала ответа,
+    уменьшает предел.
+    """
+
+    def __init__(self, app, limiter: AdaptiveLimiter) -> None:
+        """
+        Метод инициализации.
+
+        :param app: Следующее ASGI приложение.
+        :type app: ASGIApp
+        :param limiter: Ограничение одновременных запросов.
+        :type limiter: AdaptiveLimiter
+        """
+        self.app = app
+        self.limiter = limiter
+        self.settings = limiter.settings
+
+    async def __call__(self, scope, receive, send) -> None:
+        """
+        Обрабатывает запрос, если для него есть место.
+
+        :param scope: Scope запроса.
+        :type scope: Scope
+        :param receive: Функция получения сообщений.
+        :type receive: Receive
+        :param send: Функция отправки сообщений.
+        :type send: Send
+        """
+        if scope['type'] != 'http' or not self.settings.enabled:
+            await self.app(scope, receive, send)
+            return
+        priority = self.settings.routes.get(
+            scope['path'], self.settings.default_priority,
+        )
+        try:
+            await self.limiter.acquire(priority)
+        except errors.OverloadedError as error:
+            logger.warning(f'request shed: {scope["path"]}')
+            response = JSONResponse(
+                {'detail': error.detail},
+                status_code=error.status_code,
+                headers=error.headers,
+            )
+            await response(scope, receive, send)
+            return
+        recorder = ResponseRecorder(send)
+        started_at = time.monotonic()
+        try:  # noqa: WPS501 place is released on any outcome
+            await self.app(scope, receive, recorder)
+        finally:
+            self.limiter.release(
+                priority,
+                (recorder.started_at or time.monotonic()) - started_at,
+                recorder.started_at is None and deadline.is_expired(),
+            )
+
+
+admission_limiter = AdaptiveLimiter(get_settings().admission)
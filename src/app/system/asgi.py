@@ -0,0 +1,51 @@
+import time
+from typing import Any
+
+from fastapi import status
+
+
+class ResponseRecorder:
+    """Запоминает код и время начала ответа, передавая сообщения дальше."""
+
+    def __init__(self, send) -> None:
+        """
+        Метод инициализации.
+
+        :param send: Функция отправки сообщений.
+        :type send: Send
+        """
+        self.status_code: int | None = None
+        self.started_at: float | None = None
+        self._send = send
+
+    async def __call__(self, message: dict[str, Any]) -> None:
+        """
+        Передает сообщение ответа.
+
+        :param message: Сообщение ASGI.
+        :type message: dict[str, Any]
+        """
+        if message['type'] == 'http.response.start':
+            self.status_code = message['status']
+            self.started_at = time.monotonic()
+        await self._send(message)
+
+    @property
+    def started(self) -> bool:
+        """
+        Начата ли отправка ответа клиенту.
+
+        :return: Отправлено ли начало ответа.
+        :rtype: bool
+        """
+        return self.status_code is not None
+
+    @property
+    def final_status(self) -> int:
+        """
+        Код ответа клиенту для учета запроса.
+
+        :return: Код ответа или 500, если ответ не был начат.
+        :rtype: int
+        """
+        return self.status_code or status.HTTP_500_INTERNAL_SERVER_ERROR
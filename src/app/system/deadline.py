@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+
+from app.system import errors
+from app.system.asgi import ResponseRecorder
+from config.config import DeadlineSettings
+
+logger = logging.getLogger(__name__)
+
+deadline_header = 'X-Request-Timeout-Ms'
+milliseconds_in_second = 1000
+
+current_deadline: ContextVar[float | None] = ContextVar(
+    'current_deadline', default=None,
+)
+
+
+def remaining() -> float | None:
+    """
+    Возвращает оставшееся время на обработку текущего запроса.
+
+    :return: Оставшееся время в секундах или None, если срок не задан.
+    :rtype: float | None
+    """
+    deadline = current_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check() -> float | None:
+    """
+    Проверяет, что время на обработку текущего запроса не истекло.
+
+    :return: Оставшееся время в секундах или None, если срок не задан.
+    :rtype: float | None
+    :raises GatewayTimeoutError: Если время на обработку истекло.
+    """
+    time_left = remaining()
+    if time_left is not None and time_left <= 0:
+        raise errors.GatewayTimeoutError()
+    return time_left
+
+
+def is_expired() -> bool:
+    """
+    Проверяет, истекло ли время на обработку текущего запроса.
+
+    :return: Истекло ли время.
+    :rtype: bool
+    """
+    time_left = remaining()
+    return time_left is not None and time_left <= 0
+
+
+class StartRecorder(ResponseRecorder):
+    """Снимает ограничение по времени с начала отправки ответа."""
+
+    def __init__(self, send, timeout: asyncio.Timeout) -> None:
+        """
+        Метод инициализации.
+
+        :param send: Функция отправки сообщений.
+        :type send: Send
+        :param timeout: Ограничение времени обработки запроса.
+        :type timeout: asyncio.Timeout
+        """
+        super().__init__(send)
+        self.timeout = timeout
+
+    async def __call__(self, message: dict[str, Any]) -> None:
+        """
+        Передает сообщение ответа.
+
+        :param message: Сообщение ASGI.
+        :type message: dict[str, Any]
+        """
+        if message['type'] == 'http.response.start':
+            self.timeout.reschedule(None)
+        await super().__call__(message)
+
+
+class DeadlineMiddleware:
+    """
+    ASGI middleware, задающее срок обработки запроса.
+
+    Срок берется из бюджета маршрута в конфигурации и сокращается
+    до значения заголовка X-Request-Timeout-Ms входящего запроса.
+    Срок сохраняется в scope запроса и в контекстной переменной,
+    из которой его читают клиенты внешних сервисов. Если срок истек
+    до начала ответа, клиент получает ответ 504. После начала ответа
+    срок больше не ограничивает обработку, чтобы не обрывать
+    потоковые ответы.
+    """
+
+    def __init__(self, app, deadlines: DeadlineSettings) -> None:
+        """
+        Метод инициализации.
+
+        :param app: Следующее ASGI приложение.
+        :type app: ASGIApp
+        :param deadlines: Конфигурация сроков обработки запросов.
+        :type deadlines: DeadlineSettings
+        """
+        self.app = app
+        self.settings = deadlines
+
+    async def __call__(self, scope, receive, send) -> None:
+        """
+        Обрабатывает запрос с ограничением по времени.
+
+        :param scope: Scope запроса.
+        :type scope: Scope
+        :param receive: Функция получения сообщений.
+        :type receive: Receive
+        :param send: Функция отправки сообщений.
+        :type send: Send
+        :raises TimeoutError: Если таймаут не связан со сроком запроса.
+        """
+        if scope['type'] != 'http' or not self.settings.enabled:
+            await self.app(scope, receive, send)
+            return
+        budget = self._budget(scope)
+        deadline = time.monotonic() + budget
+        scope.setdefault('state', {})['deadline'] = deadline
+        timeout = asyncio.timeout(budget)
+        token = current_deadline.set(deadline)
+        try:
+            async with timeout:
+                await self.app(scope, receive, StartRecorder(send, timeout))
+        except TimeoutError:
+            if not timeout.expired():
+                raise
+            logger.warning(f'request deadline exceeded: {scope["path"]}')
+            response = JSONResponse(
+                {'detail': errors.GatewayTimeoutError().detail},
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            )
+            await response(scope, receive, send)
+        finally:
+            current_deadline.reset(token)
+
+    def _budget(self, scope) -> float:
+        budget = self.settings.routes.get(
+            scope['path'], self.settings.default_budget,
+        )
+        header_name = deadline_header.lower().encode()
+        for name, header_value in scope['headers']:
+            if name == header_name:
+                return min(budget, _parse_timeout(header_value) or budget)
+        return budget
+
+
+def _parse_timeout(header_value: bytes) -> float | None:
+    try:
+        timeout = int(header_value) / milliseconds_in_second
+    except ValueError:
+        return None
+    return timeout if timeout > 0 else None
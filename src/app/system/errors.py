@@ -25,6 +25,86 @@ class ServerError(HTTPException):
         self.detail = detail
 
 
+class CircuitOpenError(ServerError):
+    """Ошибка при открытом автомате защиты внешнего сервиса 503."""
+
+    def __init__(
+        self,
+        status_code: int = status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail: str = 'Внешний сервис временно недоступен',
+    ):
+        """
+        Метод инициализации CircuitOpenError.
+
+        :param status_code: Код ответа
+        :type status_code: int
+        :param detail: Сообщение
+        :type detail: str
+        """
+        self.status_code = status_code
+        self.detail = detail
+
+
+class UnknownOutcomeError(ServerError):
+    """Ошибка после отправки запроса внешнему сервису 503."""
+
+    def __init__(
+        self,
+        status_code: int = status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail: str = 'Результат запроса к внешнему сервису неизвестен',
+    ):
+        """
+        Метод инициализации UnknownOutcomeError.
+
+        :param status_code: Код ответа
+        :type status_code: int
+        :param detail: Сообщение
+        :type detail: str
+        """
+        self.status_code = status_code
+        self.detail = detail
+
+
+class GatewayTimeoutError(HTTPException):
+    """Ошибка при истечении времени обработки запроса 504."""
+
+    def __init__(
+        self,
+        status_code: int = status.HTTP_504_GATEWAY_TIMEOUT,
+        detail: str = 'Время обработки запроса истекло',
+    ):
+        """
+        Метод инициализации GatewayTimeoutError.
+
+        :param status_code: Код ответа
+        :type status_code: int
+        :param detail: Сообщение
+        :type detail: str
+        """
+        self.status_code = status_code
+        self.detail = detail
+
+
+class UpstreamTimeoutError(GatewayTimeoutError):
+    """Ошибка при истечении времени ожидания ответа внешнего сервиса 504."""
+
+    def __init__(
+        self,
+        status_code: int = status.HTTP_504_GATEWAY_TIMEOUT,
+        detail: str = 'Время ожидания ответа внешнего сервиса истекло',
+    ):
+        """
+        Метод инициализации UpstreamTimeoutError.
+
+        :param status_code: Код ответа
+        :type status_code: int
+        :param detail: Сообщение
+        :type detail: str
+        """
+        self.status_code = status_code
+        self.detail = detail
+
+
 class UnauthorizedError(HTTPException):
     """Ошибка при ответе сервера 401."""
 
@@ -85,12 +165,76 @@ class UnprocessableError(HTTPException):
         self.detail = detail
 
 
+class PayloadTooLargeError(HTTPException):
+    """Ошибка при превышении допустимого размера запроса 413."""
+
+    def __init__(
+        self,
+        status_code: int = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail: str = 'Размер запроса превышает допустимый',
+    ):
+        """
+        Метод инициализации PayloadTooLargeError.
+
+        :param status_code: Код ответа
+        :type status_code: int
+        :param detail: Сообщение
+        :type detail: str
+        """
+        self.status_code = status_code
+        self.detail = detail
+
+
+class OverloadedError(HTTPException):
+    """Ошибка при отказе в обработке запроса из-за перегрузки 503."""
+
+    def __init__(
+        self,
+        retry_after: int = 1,
+        detail: str = 'Сервис перегружен, повторите запрос позже',
+    ):
+        """
+        Метод инициализации OverloadedError.
+
+        :param retry_after: Через сколько секунд повторить запрос
+        :type retry_after: int
+        :param detail: Сообщение
+        :type detail: str
+        """
+        self.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        self.detail = detail
+        self.headers = {'Retry-After': str(retry_after)}
+
+
+class TooManyRequestsError(HTTPException):
+    """Ошибка при превышении частоты запросов пользователя 429."""
+
+    def __init__(
+        self,
+        retry_after: int = 1,
+        detail: str = 'Слишком много запросов, повторите запрос позже',
+    ):
+        """
+        Метод инициализации TooManyRequestsError.
+
+        :param retry_after: Через сколько секунд повторить запрос
+        :type retry_after: int
+        :param detail: Сообщение
+        :type detail: str
+        """
+        self.status_code = status.HTTP_429_TOO_MANY_REQUESTS
+        self.detail = detail
+        self.headers = {'Retry-After': str(retry_after)}
+
+
 http_errors = {
     status.HTTP_422_UNPROCESSABLE_ENTITY: UnprocessableError,
     status.HTTP_404_NOT_FOUND: NotFoundError,
     status.HTTP_503_SERVICE_UNAVAILABLE: ServerError,
     status.HTTP_500_INTERNAL_SERVER_ERROR: ServerError,
+    status.HTTP_504_GATEWAY_TIMEOUT: GatewayTimeoutError,
     status.HTTP_401_UNAUTHORIZED: UnauthorizedError,
+    status.HTTP_413_REQUEST_ENTITY_TOO_LARGE: PayloadTooLargeError,
 }
 
 good_status_codes = [
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field, replace
+
+from anyio.to_thread import current_default_thread_limiter
+
+from app.metrics import instrumentation
+from config.config import LoopMonitorSettings, get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BlockedCall:
+    """Снимок стека цикла событий во время блокировки."""
+
+    detected_at: float
+    blocked_for: float
+    stack: list[str]
+
+
+@dataclass
+class LoopStats:
+    """Статистика работы цикла событий."""
+
+    is_running: bool = False
+    last_lag: float = 0
+    max_lag: float = 0
+    stalls: int = 0
+    threadpool_in_use: int = 0
+    threadpool_limit: int = 0
+    threadpool_waiting: int = 0
+    blocked_calls: list[BlockedCall] = field(default_factory=list)
+
+
+class LoopMonitor:  # noqa: WPS214 loop probe and watchdog steps
+    """
+    Монитор задержек цикла событий.
+
+    Задача в цикле событий каждые interval секунд измеряет, насколько
+    позже ожидаемого она была запущена, и состояние пула потоков
+    для синхронных вызовов. Отдельный поток следит за временем
+    последнего запуска задачи: если цикл не отвечает дольше
+    block_threshold секунд, поток снимает стек цикла событий, чтобы
+    найти блокирующий вызов. Пока блокировка продолжается, снимок
+    обновляется, поэтому в нем остается вызов, блокировавший цикл
+    последним.
+    """
+
+    def __init__(self, loop_monitor: LoopMonitorSettings) -> None:
+        """
+        Метод инициализации.
+
+        :param loop_monitor: Конфигурация мониторинга цикла событий.
+        :type loop_monitor: LoopMonitorSettings
+        """
+        self.settings = loop_monitor
+        self.counters = LoopStats()
+        self.blocked_calls: deque[BlockedCall] = deque(
+            maxlen=loop_monitor.max_samples,
+        )
+        self._heartbeat = time.monotonic()
+        self._is_stall_sampled = False
+        self._loop_thread_id: int | None = None
+        self._stopped = threading.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._watchdog: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Запускает мониторинг в текущем цикле событий."""
+        if not self.settings.enabled or self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._run())
+        self._watchdog = threading.Thread(
+            target=self._watch, name='loop-watchdog', daemon=True,
+        )
+        self._watchdog.start()
+        self.counters.is_running = True
+
+    async def stop(self) -> None:
+        """Останавливает мониторинг."""
+        if self._task is None:
+            return
+        self._stopped.set()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        if self._watchdog is not None:
+            self._watchdog.join()
+        self._task = None
+        self.counters.is_running = False
+
+    def stats(self) -> LoopStats:
+        """
+        Возвращает статистику цикла событий.
+
+        :return: Статистика цикла событий.
+        :rtype: LoopStats
+        """
+        return replace(self.counters, blocked_calls=list(self.blocked_calls))
+
+    async def _run(self) -> None:
+        interval = self.settings.interval
+        while True:  # noqa: WPS457 runs until the task is cancelled
+            expected_at = time.monotonic() + interval
+            await asyncio.sleep(interval)
+            self._heartbeat = time.monotonic()
+            self._record_lag(max(self._heartbeat - expected_at, 0))
+            self._record_threadpool()
+
+    def _record_lag(self, lag: float) -> None:
+        self.counters.last_lag = lag
+        self.counters.max_lag = max(self.counters.max_lag, lag)
+        instrumentation.loop_lag.labels().observe(lag)
+        is_stall_sampled = self._is_stall_sampled
+        self._is_stall_sampled = False
+        if lag < self.settings.block_threshold:
+            return
+        self.counters.stalls += 1
+        instrumentation.loop_stalls.labels().inc()
+        logger.warning(f'event loop blocked for {lag:.3f}s')
+        if is_stall_sampled and self.blocked_calls:
+            self.blocked_calls[-1].blocked_for = lag
+
+    def _record_threadpool(self) -> None:
+        limiter = current_default_thread_limiter()
+        limiter_stats = limiter.statistics()
+        self.counters.threadpool_in_use = limiter_stats.borrowed_tokens
+        self.counters.threadpool_limit = int(limiter_stats.total_tokens)
+        self.counters.threadpool_waiting = limiter_stats.tasks_waiting
+        instrumentation.threadpool_in_use.labels().set(
+            limiter_stats.borrowed_tokens,
+        )
+        instrumentation.threadpool_waiting.labels().set(
+            limiter_stats.tasks_waiting,
+        )
+
+    def _watch(self) -> None:
+        timeout = self.settings.interval + self.settings.block_threshold
+        while not self._stopped.wait(self.settings.interval):
+            blocked_for = time.monotonic() - self._heartbeat
+            if blocked_for >= timeout:
+                self._sample_stack(blocked_for - self.settings.interval)
+
+    def _sample_stack(self, blocked_for: float) -> None:
+        frames = sys._current_frames()  # noqa: WPS437 stack sampling
+        frame = frames.get(self._loop_thread_id or 0)
+        if frame is None:
+            return
+        stack = traceback.format_stack(
+            frame, limit=self.settings.max_stack_depth,
+        )
+        if self._is_stall_sampled and self.blocked_calls:
+            self.blocked_calls[-1].blocked_for = blocked_for
+            self.blocked_calls[-1].stack = stack
+            return
+        self._is_stall_sampled = True
+        self.blocked_calls.append(BlockedCall(
+            detected_at=time.time(), blocked_for=blocked_for, stack=stack,
+        ))
+
+
+loop_monitor = LoopMonitor(get_settings().loop_monitor)
@@ -0,0 +1,192 @@
+import logging
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Protocol, Self
+
+from app.metrics import instrumentation
+from app.system import errors
+from config.config import BucketSettings, RateLimitSettings, get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Bucket:
+    """Корзина токенов одного ключа."""
+
+    tokens: float
+    updated_at: float
+    full_at: float
+
+
+class BucketStore(Protocol):
+    """Хранилище корзин токенов."""
+
+    async def take(self, key: str, bucket: BucketSettings) -> float:
+        """
+        Забирает токен из корзины ключа.
+
+        Возвращает 0, если токен получен, иначе время до появления
+        токена в секундах.
+
+        :param key: Ключ корзины.
+        :type key: str
+        :param bucket: Скорость пополнения и размер корзины.
+        :type bucket: BucketSettings
+        """
+
+    def clear(self) -> None:
+        """Удаляет все корзины."""
+
+
+class LocalBucketStore:
+    """
+    Хранилище корзин токенов в памяти процесса.
+
+    Заменяет общее хранилище, когда его нет: каждый из workers
+    процессов сервиса получает свою долю скорости и размера корзины,
+    поэтому при равномерном распределении запросов между процессами
+    общий предел сохраняется.
+
+    Корзины хранятся в порядке последнего обращения. Корзина, которая
+    успела наполниться, ничем не отличается от отсутствующей и
+    удаляется при следующем обращении к хранилищу, а при превышении
+    max_buckets удаляются давно не использованные корзины, поэтому
+    память ограничена, а каждое обращение выполняется за O(1).
+    """
+
+    def __init__(self, max_buckets: int, workers: int = 1) -> None:
+        """
+        Метод инициализации.
+
+        :param max_buckets: Максимальное число корзин.
+        :type max_buckets: int
+        :param workers: Число процессов сервиса.
+        :type workers: int
+        """
+        self.max_buckets = max_buckets
+        self.share = 1 / workers
+        self._buckets: OrderedDict[str, Bucket] = OrderedDict()
+
+    @classmethod
+    def from_settings(cls, rate_limits: RateLimitSettings) -> Self:
+        """
+        Создает хранилище по конфигурации.
+
+        :param rate_limits: Конфигурация ограничения частоты запросов.
+        :type rate_limits: RateLimitSettings
+        :return: Хранилище корзин токенов.
+        :rtype: LocalBucketStore
+        """
+        return cls(rate_limits.max_buckets, rate_limits.workers)
+
+    def __len__(self) -> int:
+        """
+        Возвращает число корзин.
+
+        :return: Число корзин.
+        :rtype: int
+        """
+        return len(self._buckets)
+
+    async def take(self, key: str, bucket: BucketSettings) -> float:
+        """
+        Забирает токен из корзины ключа.
+
+        :param key: Ключ корзины.
+        :type key: str
+        :param bucket: Скорость пополнения и размер корзины.
+        :type bucket: BucketSettings
+        :return: 0, если токен получен, иначе время до появления
+            токена в секундах.
+        :rtype: float
+        """
+        now = time.monotonic()
+        rate = bucket.rate * self.share
+        burst = max(bucket.burst * self.share, 1)
+        self._evict(now)
+        tokens = self._refill(key, now, rate, burst)
+        wait = 0 if tokens >= 1 else (1 - tokens) / rate
+        if not wait:
+            tokens -= 1
+        self._buckets[key] = Bucket(
+            tokens=tokens,
+            updated_at=now,
+            full_at=now + (burst - tokens) / rate,
+        )
+        return wait
+
+    def clear(self) -> None:
+        """Удаляет все корзины."""
+        self._buckets.clear()
+
+    def _refill(self, key: str, now: float, rate: float, burst: float) -> float:
+        state = self._buckets.pop(key, None)
+        if state is None:
+            return burst
+        return min(state.tokens + (now - state.updated_at) * rate, burst)
+
+    def _evict(self, now: float) -> None:
+        while self._buckets:
+            oldest = next(iter(self._buckets.values()))
+            if oldest.full_at > now and len(self._buckets) < self.max_buckets:
+                return
+            self._buckets.popitem(last=False)
+
+
+bucket_stores: dict[str, Callable[[RateLimitSettings], BucketStore]] = {
+    'local': LocalBucketStore.from_settings,
+}
+
+
+class RateLimiter:
+    """
+    Ограничение частоты запросов по ключам пользователей.
+
+    Для маршрута из routes конфигурации у каждого ключа, например
+    имени пользователя или хэша токена, своя корзина токенов.
+    Запрос забирает токен из корзины, а при пустой корзине
+    отклоняется ответом 429 с временем до появления токена в
+    заголовке Retry-After. Маршруты без настроек не ограничиваются.
+    """
+
+    def __init__(
+        self,
+        rate_limits: RateLimitSettings,
+        store: BucketStore | None = None,
+    ) -> None:
+        """
+        Метод инициализации.
+
+        :param rate_limits: Конфигурация ограничения частоты запросов.
+        :type rate_limits: RateLimitSettings
+        :param store: Хранилище корзин, по умолчанию по backend.
+        :type store: BucketStore | None
+        """
+        self.settings = rate_limits
+        self.store = store or bucket_stores[rate_limits.backend](rate_limits)
+
+    async def check(self, route: str, key: str) -> None:
+        """
+        Учитывает запрос к маршруту по ключу.
+
+        :param route: Шаблон пути маршрута.
+        :type route: str
+        :param key: Ключ пользователя.
+        :type key: str
+        :raises TooManyRequestsError: Если частота запросов превышена.
+        """
+        bucket = self.settings.routes.get(route)
+        if not self.settings.enabled or bucket is None:
+            return
+        wait = await self.store.take(f'{route} {key}', bucket)
+        if wait:
+            logger.warning(f'rate limit exceeded: {route}')
+            instrumentation.rate_limited.labels(route).inc()
+            raise errors.TooManyRequestsError(retry_after=math.ceil(wait))
+
+
+rate_limiter = RateLimiter(get_settings().rate_limits)
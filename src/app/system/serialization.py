@@ -0,0 +1,102 @@
+from typing import Any, TypeVar
+
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+ModelT = TypeVar('ModelT')
+
+json_media_type = 'application/json'
+json_headers = {'Content-Type': json_media_type}
+
+adapters: dict[Any, TypeAdapter[Any]] = {}
+
+
+def get_adapter(annotation: type[ModelT]) -> TypeAdapter[ModelT]:
+    """
+    Возвращает общий TypeAdapter для типа.
+
+    Схема проверки и сериализации строится один раз на тип.
+
+    :param annotation: Тип данных.
+    :type annotation: type[ModelT]
+    :return: TypeAdapter типа.
+    :rtype: TypeAdapter[ModelT]
+    """
+    adapter = adapters.get(annotation)
+    if adapter is None:
+        adapter = TypeAdapter(annotation)
+        adapters[annotation] = adapter
+    return adapter
+
+
+def dump_json(model: Any) -> bytes:
+    """
+    Сериализует объект сразу в байты JSON.
+
+    Модели сериализуются pydantic без промежуточного словаря.
+
+    :param model: Модель или данные для сериализации.
+    :type model: Any
+    :return: JSON документ.
+    :rtype: bytes
+    """
+    return get_adapter(type(model)).dump_json(model)
+
+
+def validate_json(annotation: type[ModelT], json_data: bytes) -> ModelT:
+    """
+    Проверяет JSON документ и создает из него объект типа.
+
+    :param annotation: Тип результата.
+    :type annotation: type[ModelT]
+    :param json_data: JSON документ.
+    :type json_data: bytes
+    :return: Проверенный объект.
+    :rtype: ModelT
+    """
+    return get_adapter(annotation).validate_json(json_data)
+
+
+def json_request(
+    body: Any, headers: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    """
+    Создает параметры запроса к внешнему сервису с телом JSON.
+
+    Тело сериализуется один раз в байты, вместо передачи словаря
+    из model_dump в httpx для повторного кодирования.
+
+    :param body: Модель или данные тела запроса.
+    :type body: Any
+    :param headers: Дополнительные заголовки запроса.
+    :type headers: dict[str, str] | None
+    :return: Параметры content и headers запроса httpx.
+    :rtype: dict[str, Any]
+    """
+    return {
+        'content': dump_json(body),
+        'headers': {**json_headers, **(headers or {})},
+    }
+
+
+class ModelResponse(Response):
+    """
+    Ответ с телом JSON, сериализованным pydantic сразу в байты.
+
+    Хэндлер, вернувший ModelResponse, минует повторную проверку
+    модели ответа, jsonable_encoder и json.dumps FastAPI. Модель
+    ответа для документации указывается в response_model маршрута.
+    """
+
+    media_type = json_media_type
+
+    def render(self, content: Any) -> bytes:  # noqa: WPS110 starlette API
+        """
+        Сериализует тело ответа.
+
+        :param content: Модель или данные ответа.
+        :type content: Any
+        :return: Тело ответа.
+        :rtype: bytes
+        """
+        return dump_json(content)
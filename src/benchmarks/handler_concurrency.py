@@ -0,0 +1,150 @@
+"""
+Нагрузочный тест хэндлеров сервиса в цикле событий.
+
+Запускает в отдельных процессах заглушки сервиса auth и сервиса
+транзакций из benchmarks.service_load, а сам сервис app.service:app
+вместе с его lifespan в текущем процессе, с конфигурацией, в которой
+адреса внешних сервисов заменены адресами заглушек. Запросы
+передаются сервису через ASGI транспорт httpx в том же цикле
+событий, поэтому опрос пула потоков AnyIO видит каждый переход в
+пул потоков на пути запроса. Для каждого маршрута и уровня
+одновременных запросов выводятся запросы в секунду, p50, p99 и p999
+задержки, коды ответов и наибольшие занятость и очередь пула
+потоков. Уровни одновременных запросов больше размера пула потоков
+(40 по умолчанию) показывают, что пул не ограничивает обработку
+запросов. Перед каждым измерением выполняется прогревочный прогон.
+
+Запуск из каталога src::
+
+    python -m benchmarks.handler_concurrency
+"""
+import asyncio
+import importlib
+import json
+import os
+import sys
+import tempfile
+from typing import Any
+
+import httpx
+from anyio.to_thread import current_default_thread_limiter
+
+from benchmarks.service_load import generator, processes, stubs
+from benchmarks.service_load.scenarios import Scenario, scenarios
+
+requests_count = 4000
+warmup_count = 400
+concurrency_levels = (10, 100, 400)
+measured_routes = ('/auth/login', '/transaction/transaction')
+upstream_latency = 0.002
+probe_interval = 0.001
+base_config = processes.src_dir / 'config' / 'config-local.yml'
+stub = stubs.StubSettings(
+    latency=upstream_latency, jitter=0, error_rate=0, report_rows=1, seed=1,
+)
+
+
+class ThreadpoolProbe:
+    """Наибольшие занятость и очередь пула потоков во время теста."""
+
+    def __init__(self) -> None:
+        """Метод инициализации."""
+        self.peak_in_use = 0
+        self.peak_waiting = 0
+        self._task: asyncio.Task[None] | None = None
+
+    async def __aenter__(self) -> 'ThreadpoolProbe':
+        """
+        Запускает опрос пула потоков.
+
+        :return: Опрос пула потоков.
+        :rtype: ThreadpoolProbe
+        """
+        self._task = asyncio.create_task(self._probe())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """
+        Останавливает опрос пула потоков.
+
+        :param exc_info: Исключение, завершившее тест.
+        :type exc_info: tuple
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _probe(self) -> None:
+        limiter = current_default_thread_limiter()
+        while True:  # noqa: WPS457 runs until the task is cancelled
+            limiter_stats = limiter.statistics()
+            self.peak_in_use = max(
+                self.peak_in_use, limiter_stats.borrowed_tokens,
+            )
+            self.peak_waiting = max(
+                self.peak_waiting, limiter_stats.tasks_waiting,
+            )
+            await asyncio.sleep(probe_interval)
+
+
+async def measure(
+    client: httpx.AsyncClient, scenario: Scenario, concurrency: int,
+) -> dict[str, Any]:
+    """
+    Нагружает маршрут сервиса после прогревочного прогона.
+
+    :param client: HTTP клиент сервиса.
+    :type client: httpx.AsyncClient
+    :param scenario: Запросы к маршруту.
+    :type scenario: Scenario
+    :param concurrency: Число одновременных запросов.
+    :type concurrency: int
+    :return: Результаты нагрузочного теста.
+    :rtype: dict[str, Any]
+    """
+    await generator.run_scenario(client, scenario, warmup_count, concurrency)
+    probe = ThreadpoolProbe()
+    async with probe:
+        load_results = await generator.run_scenario(
+            client, scenario, requests_count, concurrency,
+        )
+    return {
+        'concurrency': concurrency,
+        **load_results,
+        'threadpool_peak_in_use': probe.peak_in_use,
+        'threadpool_peak_waiting': probe.peak_waiting,
+    }
+
+
+async def run_gateway() -> None:
+    """Запускает сервис и выводит результаты в формате JSON."""
+    service = importlib.import_module('app.service')
+    transport = httpx.ASGITransport(app=service.app)
+    async with service.app.router.lifespan_context(service.app):
+        async with httpx.AsyncClient(
+            transport=transport, base_url='http://gateway',
+        ) as client:
+            for scenario in scenarios:
+                if scenario.route not in measured_routes:
+                    continue
+                for concurrency in concurrency_levels:
+                    json.dump(
+                        await measure(client, scenario, concurrency),
+                        sys.stdout,
+                    )
+                    sys.stdout.write('\n')
+
+
+def main() -> None:
+    """Запускает заглушки внешних сервисов и нагрузочный тест сервиса."""
+    with processes.running_stubs(stub) as stub_ports:
+        with tempfile.TemporaryDirectory() as config_dir:
+            config_path = processes.write_config(
+                base_config, config_dir, stub_ports,
+            )
+            os.environ['CONFIG_PATH'] = str(config_path)
+            asyncio.run(run_gateway())
+
+
+if __name__ == '__main__':
+    main()
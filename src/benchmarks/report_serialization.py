@@ -0,0 +1,126 @@
+"""
+Бенчмарк сериализации больших отчетов.
+
+Сравнивает для отчетов разного размера:
+
+- выдачу ответа FastAPI по response_model, то есть повторную
+  проверку модели, сериализацию в словарь и json.dumps, с выдачей
+  ModelResponse, сериализующего отчет pydantic сразу в байты;
+- разбор ответа сервиса транзакций через json.loads и проверку
+  словаря с разбором байтов ответа через validate_json.
+
+Запуск из каталога src::
+
+    python -m benchmarks.report_serialization
+"""
+import json
+import sys
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from fastapi.utils import create_response_field
+
+from app.api.models import Report, transactions_adapter
+from app.external.payloads import ReportPayload
+from app.system import serialization
+from benchmarks.report_validation import bulk, make_rows
+
+rows_counts = (10000, 100000)
+repeats = 5
+milliseconds_in_second = 1000
+
+response_field = create_response_field(
+    name='Response_create_report', type_=Report, mode='serialization',
+)
+
+
+def fastapi_encode(report: Report) -> bytes:
+    """
+    Сериализует отчет так же, как FastAPI по response_model.
+
+    :param report: Отчет о транзакциях.
+    :type report: Report
+    :return: Тело ответа.
+    :rtype: bytes
+    """
+    report_copy, _ = response_field.validate(report, {}, loc=('response',))
+    return JSONResponse(response_field.serialize(report_copy)).body
+
+
+def model_encode(report: Report) -> bytes:
+    """
+    Сериализует отчет через ModelResponse.
+
+    :param report: Отчет о транзакциях.
+    :type report: Report
+    :return: Тело ответа.
+    :rtype: bytes
+    """
+    return serialization.ModelResponse(report).body
+
+
+def json_decode(body: bytes) -> list[Any]:
+    """
+    Разбирает ответ сервиса транзакций через словарь.
+
+    :param body: Тело ответа сервиса транзакций.
+    :type body: bytes
+    :return: Транзакции отчета.
+    :rtype: list[Transaction]
+    """
+    payload = json.loads(body)
+    return transactions_adapter.validate_python(payload['transactions'])
+
+
+def bytes_decode(body: bytes) -> list[Any]:
+    """
+    Разбирает ответ сервиса транзакций из байтов без словаря.
+
+    :param body: Тело ответа сервиса транзакций.
+    :type body: bytes
+    :return: Транзакции отчета.
+    :rtype: list[Transaction]
+    """
+    return serialization.validate_json(ReportPayload, body).transactions
+
+
+def measure(func: Callable[[Any], Any], argument: Any) -> float:
+    """
+    Измеряет лучшее время выполнения функции в миллисекундах.
+
+    :param func: Измеряемая функция.
+    :type func: Callable
+    :param argument: Аргумент функции.
+    :type argument: Any
+    :return: Лучшее время из repeats запусков в миллисекундах.
+    :rtype: float
+    """
+    best = min(timeit.repeat(
+        lambda: func(argument), number=1, repeat=repeats,
+    ))
+    return round(best * milliseconds_in_second, 1)
+
+
+def main() -> None:
+    """Запускает бенчмарк и выводит результаты в формате JSON."""
+    for rows_count in rows_counts:
+        rows = make_rows(rows_count)
+        report = bulk(rows)
+        body = json.dumps({'transactions': rows}).encode()
+        json.dump(
+            {
+                'rows': rows_count,
+                'encode_fastapi_ms': measure(fastapi_encode, report),
+                'encode_model_response_ms': measure(model_encode, report),
+                'decode_json_loads_ms': measure(json_decode, body),
+                'decode_validate_json_ms': measure(bytes_decode, body),
+            },
+            sys.stdout,
+        )
+        sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Микробенчмарк проверки транзакций отчета.
+
+Сравнивает построчное создание моделей Transaction с последующей
+повторной проверкой Report и проверку всего списка транзакций
+через общий TypeAdapter без повторной проверки Report.
+
+Запуск из каталога src::
+
+    python -m benchmarks.report_validation
+"""
+import json
+import sys
+import timeit
+from collections.abc import Callable
+
+from app.api.models import (
+    Report,
+    ReportRequest,
+    Transaction,
+    transactions_adapter,
+)
+
+Row = dict[str, str | int]
+
+rows_counts = (10000, 100000)
+repeats = 5
+milliseconds_in_second = 1000
+
+report_request = ReportRequest(
+    username='max',
+    start_date='2024-01-01T00:00:00',
+    end_date='2024-12-31T00:00:00',
+)
+
+
+def make_rows(rows_count: int) -> list[Row]:
+    """
+    Создает строки ответа сервиса транзакций.
+
+    :param rows_count: Число строк.
+    :type rows_count: int
+    :return: Строки ответа.
+    :rtype: list[Row]
+    """
+    return [
+        {
+            'username': 'max',
+            'amount': index + 1,
+            'transaction_type': index % 2,
+            'timestamp': '2024-01-15T00:00:00',
+        }
+        for index in range(rows_count)
+    ]
+
+
+def per_row(rows: list[Row]) -> Report:
+    """
+    Проверяет транзакции по одной и повторно при создании отчета.
+
+    :param rows: Строки ответа сервиса транзакций.
+    :type rows: list[Row]
+    :return: Отчет о транзакциях.
+    :rtype: Report
+    """
+    transactions = [
+        Transaction(**row) for row in rows  # type: ignore[arg-type]
+    ]
+    return Report(request=report_request, transactions=transactions)
+
+
+def bulk(rows: list[Row]) -> Report:
+    """
+    Проверяет транзакции одним проходом без повторной проверки отчета.
+
+    :param rows: Строки ответа сервиса транзакций.
+    :type rows: list[Row]
+    :return: Отчет о транзакциях.
+    :rtype: Report
+    """
+    return Report.model_construct(
+        request=report_request,
+        transactions=transactions_adapter.validate_python(rows),
+    )
+
+
+def measure(
+    func: Callable[[list[Row]], Report],
+    rows: list[Row],
+) -> float:
+    """
+    Измеряет лучшее время выполнения функции.
+
+    :param func: Функция проверки транзакций.
+    :type func: Callable
+    :param rows: Строки ответа сервиса транзакций.
+    :type rows: list[Row]
+    :return: Лучшее время из repeats запусков в секундах.
+    :rtype: float
+    """
+    return min(timeit.repeat(lambda: func(rows), number=1, repeat=repeats))
+
+
+def main() -> None:
+    """Запускает бенчмарк и выводит результаты в формате JSON."""
+    for rows_count in rows_counts:
+        rows = make_rows(rows_count)
+        per_row_time = measure(per_row, rows)
+        bulk_time = measure(bulk, rows)
+        measurement = {
+            'rows': rows_count,
+            'per_row_ms': round(per_row_time * milliseconds_in_second, 1),
+            'bulk_ms': round(bulk_time * milliseconds_in_second, 1),
+            'speedup': round(per_row_time / bulk_time, 2),
+        }
+        json.dump(measurement, sys.stdout)
+        sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
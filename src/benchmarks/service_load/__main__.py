@@ -0,0 +1,139 @@
+"""
+Нагрузочный тест сервиса с заглушками внешних сервисов.
+
+Запускает в отдельных процессах заглушки сервиса auth и сервиса
+транзакций и сам сервис через uvicorn с конфигурацией, в которой
+адреса внешних сервисов заменены адресами заглушек, а ограничение
+частоты запросов пользователей выключено. Затем по очереди нагружает
+маршруты сервиса и для каждого выводит строку JSON с параметрами
+прогона, запросами в секунду, p50, p99 и p999 задержки и кодами
+ответов. Перед измерением каждого маршрута выполняется прогревочный
+прогон. Результаты прогонов с одинаковыми параметрами можно
+сравнивать между собой для поиска регрессий.
+
+Запуск из каталога src::
+
+    python -m benchmarks.service_load --output results.jsonl
+"""
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from benchmarks.service_load import generator, processes, stubs
+from benchmarks.service_load.scenarios import scenarios
+
+
+@dataclass(frozen=True)
+class LoadSettings:
+    """Параметры прогона."""
+
+    requests: int = 2000
+    warmup: int = 200
+    concurrency: int = 50
+    latency: float = 0.005
+    jitter: float = 0.005
+    error_rate: float = 0
+    report_rows: int = 1000
+    seed: int = 1
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Разбирает параметры прогона.
+
+    :return: Параметры прогона.
+    :rtype: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description='Нагрузочный тест сервиса')
+    for option in fields(LoadSettings):
+        parser.add_argument(
+            '--{0}'.format(option.name.replace('_', '-')),
+            type=option.type,
+            default=option.default,
+        )
+    parser.add_argument(
+        '--routes',
+        nargs='*',
+        default=[scenario.route for scenario in scenarios],
+    )
+    parser.add_argument('--config', default='config/config-local.yml')
+    parser.add_argument('--output', type=Path)
+    return parser.parse_args()
+
+
+async def run_load(
+    load: LoadSettings, routes: list[str], base_url: str,
+) -> list[dict[str, Any]]:
+    """
+    Нагружает выбранные маршруты сервиса.
+
+    :param load: Параметры прогона.
+    :type load: LoadSettings
+    :param routes: Нагружаемые маршруты.
+    :type routes: list[str]
+    :param base_url: Адрес сервиса.
+    :type base_url: str
+    :return: Результаты по маршрутам.
+    :rtype: list[dict[str, Any]]
+    """
+    limits = httpx.Limits(max_connections=load.concurrency)
+    load_results = []
+    async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+        for scenario in scenarios:
+            if scenario.route not in routes:
+                continue
+            await generator.run_scenario(
+                client, scenario, load.warmup, load.concurrency,
+            )
+            load_results.append(await generator.run_scenario(
+                client, scenario, load.requests, load.concurrency,
+            ))
+    return load_results
+
+
+def benchmark(load: LoadSettings, args: argparse.Namespace) -> list[str]:
+    """
+    Запускает заглушки и сервис и нагружает маршруты.
+
+    :param load: Параметры прогона.
+    :type load: LoadSettings
+    :param args: Параметры командной строки.
+    :type args: argparse.Namespace
+    :return: Строки JSON с результатами по маршрутам.
+    :rtype: list[str]
+    """
+    stub = stubs.StubSettings(
+        load.latency, load.jitter, load.error_rate, load.report_rows, load.seed,
+    )
+    base_config = processes.src_dir / args.config
+    with processes.running_stubs(stub) as stub_ports:
+        with processes.running_service(base_config, stub_ports) as base_url:
+            load_results = asyncio.run(run_load(load, args.routes, base_url))
+    return [
+        json.dumps({**asdict(load), **route_results})
+        for route_results in load_results
+    ]
+
+
+def main() -> None:
+    """Выводит результаты нагрузочного теста в формате JSON."""
+    args = parse_args()
+    load = LoadSettings(**{
+        option.name: getattr(args, option.name)
+        for option in fields(LoadSettings)
+    })
+    lines = benchmark(load, args)
+    output = ''.join(f'{line}\n' for line in lines)
+    sys.stdout.write(output)
+    if args.output is not None:
+        args.output.write_text(output)
+
+
+if __name__ == '__main__':
+    main()
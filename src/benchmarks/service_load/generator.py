@@ -0,0 +1,143 @@
+"""
+Генератор нагрузки на маршруты сервиса.
+
+Каждый маршрут нагружается отдельно замкнутым циклом: concurrency
+одновременных клиентов отправляют запросы по одному, следующий
+запрос отправляется после получения ответа на предыдущий. Запросы
+идут через настоящие сокеты, тело ответа читается целиком.
+"""
+import asyncio
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from benchmarks.service_load.scenarios import Scenario, auth_headers
+
+milliseconds_in_second = 1000
+percentiles = {'p50_ms': 0.5, 'p99_ms': 0.99, 'p999_ms': 0.999}
+transport_error = 'transport_error'
+successful_prefix = '2'
+
+
+@dataclass
+class LoadRecord:
+    """Задержки и коды ответов запросов к маршруту."""
+
+    latencies: list[float]
+    statuses: Counter[str]
+    sent: int = 0
+
+
+async def send_requests(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    count: int,
+    record: LoadRecord,
+) -> None:
+    """
+    Последовательно отправляет запросы, пока не отправлено count.
+
+    Ошибки соединения учитываются как ответы transport_error.
+
+    :param client: HTTP клиент сервиса.
+    :type client: httpx.AsyncClient
+    :param scenario: Запросы к маршруту.
+    :type scenario: Scenario
+    :param count: Общее число запросов к маршруту.
+    :type count: int
+    :param record: Задержки и коды ответов.
+    :type record: LoadRecord
+    """
+    while record.sent < count:
+        index = record.sent
+        record.sent += 1
+        body = scenario.make_body(index) if scenario.make_body else None
+        started_at = time.perf_counter()
+        try:
+            response = await client.request(
+                scenario.method,
+                scenario.route,
+                json=body,
+                headers=auth_headers,
+            )
+        except httpx.TransportError:
+            outcome = transport_error
+        else:
+            outcome = str(response.status_code)
+        record.latencies.append(time.perf_counter() - started_at)
+        record.statuses[outcome] += 1
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    count: int,
+    concurrency: int,
+) -> dict[str, Any]:
+    """
+    Нагружает маршрут и возвращает результаты.
+
+    :param client: HTTP клиент сервиса.
+    :type client: httpx.AsyncClient
+    :param scenario: Запросы к маршруту.
+    :type scenario: Scenario
+    :param count: Число запросов.
+    :type count: int
+    :param concurrency: Число одновременных запросов.
+    :type concurrency: int
+    :return: Пропускная способность, задержки и коды ответов.
+    :rtype: dict[str, Any]
+    """
+    record = LoadRecord(latencies=[], statuses=Counter())
+    started_at = time.perf_counter()
+    await asyncio.gather(*(
+        send_requests(client, scenario, count, record)
+        for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started_at
+    return {
+        'route': scenario.route,
+        'requests': len(record.latencies),
+        'rps': round(len(record.latencies) / elapsed, 1),
+        **summarize(record.latencies),
+        'errors': sum(
+            responses_count
+            for outcome, responses_count in record.statuses.items()
+            if not outcome.startswith(successful_prefix)
+        ),
+        'statuses': dict(sorted(record.statuses.items())),
+    }
+
+
+def summarize(latencies: list[float]) -> dict[str, float]:
+    """
+    Вычисляет процентили задержек в миллисекундах.
+
+    :param latencies: Задержки в секундах.
+    :type latencies: list[float]
+    :return: Процентили задержек по именам.
+    :rtype: dict[str, float]
+    """
+    ordered = sorted(latencies)
+    return {
+        name: round(percentile(ordered, rank) * milliseconds_in_second, 3)
+        for name, rank in percentiles.items()
+    }
+
+
+def percentile(ordered: list[float], rank: float) -> float:
+    """
+    Возвращает процентиль упорядоченных значений.
+
+    :param ordered: Значения по возрастанию.
+    :type ordered: list[float]
+    :param rank: Доля значений, не превышающих процентиль.
+    :type rank: float
+    :return: Значение процентиля.
+    :rtype: float
+    """
+    position = int(len(ordered) * rank)
+    return ordered[min(position, len(ordered) - 1)]
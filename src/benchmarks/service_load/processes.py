@@ -0,0 +1,157 @@
+"""Запуск заглушек и сервиса в отдельных процессах."""
+import multiprocessing
+import os
+import socket
+import subprocess  # noqa: S404 service is started by the benchmark
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+from pathlib import Path
+
+import httpx
+import yaml
+
+from benchmarks.service_load import stubs
+
+host = '127.0.0.1'
+src_dir = Path(__file__).resolve().parents[2]
+start_timeout = 30
+poll_interval = 0.1
+
+
+def free_port() -> int:
+    """
+    Возвращает свободный порт.
+
+    :return: Номер порта.
+    :rtype: int
+    """
+    with socket.socket() as probe:
+        probe.bind((host, 0))
+        _, port = probe.getsockname()
+    return int(port)
+
+
+def write_config(
+    base_path: Path, config_dir: str, stub_ports: dict[str, int],
+) -> Path:
+    """
+    Создает конфигурацию сервиса с адресами заглушек.
+
+    :param base_path: Путь к исходной конфигурации.
+    :type base_path: Path
+    :param config_dir: Каталог для конфигурации.
+    :type config_dir: str
+    :param stub_ports: Порты заглушек по разделам конфигурации.
+    :type stub_ports: dict[str, int]
+    :return: Путь к конфигурации.
+    :rtype: Path
+    """
+    config = yaml.safe_load(base_path.read_text())
+    for section, port in stub_ports.items():
+        config[section].update(host=host, port=str(port), endpoints=[])
+    config.setdefault('rate_limits', {})['enabled'] = False
+    config['tracing']['agent_host'] = host
+    config_path = Path(config_dir) / 'config.yml'
+    config_path.write_text(yaml.safe_dump(config))
+    return config_path
+
+
+@contextmanager
+def running_stubs(stub: stubs.StubSettings) -> Iterator[dict[str, int]]:
+    """
+    Запускает заглушки внешних сервисов на время прогона.
+
+    :param stub: Поведение заглушек.
+    :type stub: StubSettings
+    :yield: Порты заглушек по разделам конфигурации.
+    :ytype: dict[str, int]
+    """
+    stub_ports = {'authentication': free_port(), 'transactions': free_port()}
+    stub_processes = [
+        multiprocessing.Process(
+            target=stubs.serve, args=(stub, host, port), daemon=True,
+        )
+        for port in stub_ports.values()
+    ]
+    for stub_process in stub_processes:
+        stub_process.start()
+    try:  # noqa: WPS501 stubs are stopped on any outcome
+        yield stub_ports
+    finally:
+        for started in stub_processes:
+            started.terminate()
+
+
+@contextmanager
+def running_service(
+    base_config: Path, stub_ports: dict[str, int],
+) -> Iterator[str]:
+    """
+    Запускает сервис с адресами заглушек на время прогона.
+
+    :param base_config: Путь к исходной конфигурации сервиса.
+    :type base_config: Path
+    :param stub_ports: Порты заглушек по разделам конфигурации.
+    :type stub_ports: dict[str, int]
+    :yield: Адрес сервиса.
+    :ytype: str
+    """
+    port = free_port()
+    with tempfile.TemporaryDirectory() as config_dir:
+        config_path = write_config(base_config, config_dir, stub_ports)
+        service = start_service(config_path, port)
+        try:  # noqa: WPS501 service is stopped on any outcome
+            yield wait_ready(f'http://{host}:{port}')
+        finally:
+            service.terminate()
+            service.wait()
+
+
+def start_service(config_path: Path, port: int) -> subprocess.Popen[bytes]:
+    """
+    Запускает сервис через uvicorn.
+
+    :param config_path: Путь к конфигурации сервиса.
+    :type config_path: Path
+    :param port: Порт сервиса.
+    :type port: int
+    :return: Процесс сервиса.
+    :rtype: subprocess.Popen
+    """
+    return subprocess.Popen(  # noqa: S603 fixed command
+        [
+            sys.executable,
+            '-m',
+            'uvicorn',
+            'app.service:app',
+            f'--host={host}',
+            f'--port={port}',
+            '--log-level=warning',
+            '--no-access-log',
+        ],
+        cwd=src_dir,
+        env={**os.environ, 'CONFIG_PATH': str(config_path)},
+    )
+
+
+def wait_ready(base_url: str) -> str:
+    """
+    Ожидает, пока сервис начнет отвечать на проверку состояния.
+
+    :param base_url: Адрес сервиса.
+    :type base_url: str
+    :return: Адрес сервиса.
+    :rtype: str
+    :raises TimeoutError: Если сервис не ответил за start_timeout.
+    """
+    url = f'{base_url}/healthz/up'
+    deadline = time.monotonic() + start_timeout
+    while time.monotonic() < deadline:
+        with suppress(httpx.TransportError):
+            if httpx.get(url).status_code == httpx.codes.OK:
+                return base_url
+        time.sleep(poll_interval)
+    raise TimeoutError(f'{url} did not respond in {start_timeout}s')
@@ -0,0 +1,82 @@
+"""
+Запросы нагрузочного теста к маршрутам сервиса.
+
+У каждого запроса свое имя пользователя, поэтому отчеты не
+берутся из кэша сервиса, а токен у всех запросов один и проверяется
+сервисом auth только при промахе кэша токенов.
+"""
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+auth_headers = {'Authorization': 'Bearer stub.encoded.token'}
+post = 'POST'
+
+RequestBody = dict[str, Any]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Запросы к маршруту сервиса."""
+
+    route: str
+    method: str
+    make_body: Callable[[int], RequestBody] | None = None
+
+
+def credentials(index: int) -> RequestBody:
+    """
+    Создает данные входа пользователя.
+
+    :param index: Номер запроса.
+    :type index: int
+    :return: Тело запроса.
+    :rtype: RequestBody
+    """
+    return {
+        'username': f'user{index}',
+        'password': 'password123',  # noqa: S105 stub credentials
+    }
+
+
+def transaction(index: int) -> RequestBody:
+    """
+    Создает транзакцию пользователя.
+
+    :param index: Номер запроса.
+    :type index: int
+    :return: Тело запроса.
+    :rtype: RequestBody
+    """
+    return {
+        'username': f'user{index}',
+        'amount': index + 1,
+        'transaction_type': index % 2,
+        'timestamp': '2024-01-15T00:00:00',
+    }
+
+
+def report_request(index: int) -> RequestBody:
+    """
+    Создает запрос отчета пользователя.
+
+    :param index: Номер запроса.
+    :type index: int
+    :return: Тело запроса.
+    :rtype: RequestBody
+    """
+    return {
+        'username': f'user{index}',
+        'start_date': '2024-01-01T00:00:00',
+        'end_date': '2024-01-30T00:00:00',
+    }
+
+
+scenarios = (
+    Scenario('/auth/login', post, credentials),
+    Scenario('/auth/register', post, credentials),
+    Scenario('/transaction/transaction', post, transaction),
+    Scenario('/transaction/report', post, report_request),
+    Scenario('/transaction/report/stream', post, report_request),
+    Scenario('/healthz/ready', 'GET'),
+)
@@ -0,0 +1,165 @@
+"""
+Заглушки сервиса auth и сервиса транзакций.
+
+Заглушка отвечает на любой запрос, кроме проверок состояния, через
+latency секунд и случайную добавку до jitter секунд, с долей
+error_rate ответов 503. Сервис транзакций отдает отчеты из
+report_rows транзакций. Случайные величины берутся из генератора с
+заданным seed, поэтому прогоны воспроизводимы.
+"""
+import asyncio
+import json
+import random
+from dataclasses import dataclass
+
+import uvicorn
+from fastapi import status
+
+healthz_prefix = '/healthz'
+bulk_path = '/create_transactions'
+stub_token = json.dumps(
+    {'encoded_token': 'stub.encoded.token'},  # noqa: S105 stub token
+).encode()
+empty_body = json.dumps({}).encode()
+json_headers = [(b'content-type', b'application/json')]
+
+
+@dataclass(frozen=True)
+class StubSettings:
+    """Поведение заглушки внешнего сервиса."""
+
+    latency: float
+    jitter: float
+    error_rate: float
+    report_rows: int
+    seed: int
+
+
+def make_responses(stub: StubSettings) -> dict[str, bytes]:
+    """
+    Создает тела успешных ответов заглушки по путям запросов.
+
+    :param stub: Поведение заглушки.
+    :type stub: StubSettings
+    :return: Тела ответов по путям.
+    :rtype: dict[str, bytes]
+    """
+    transactions = [
+        {
+            'username': 'stub',
+            'amount': index + 1,
+            'transaction_type': index % 2,
+            'timestamp': '2024-01-15T00:00:00',
+        }
+        for index in range(stub.report_rows)
+    ]
+    return {
+        '/login': stub_token,
+        '/register': stub_token,
+        '/verify': json.dumps({'message': 'ok'}).encode(),
+        '/create_report': json.dumps({'transactions': transactions}).encode(),
+    }
+
+
+class StubService:
+    """ASGI приложение заглушки внешнего сервиса."""
+
+    def __init__(self, stub: StubSettings) -> None:
+        """
+        Метод инициализации.
+
+        :param stub: Поведение заглушки.
+        :type stub: StubSettings
+        """
+        self.settings = stub
+        self.responses = make_responses(stub)
+        self._random = random.Random(stub.seed)  # noqa: S311 not security
+
+    async def __call__(self, scope, receive, send) -> None:
+        """
+        Отвечает на запрос.
+
+        :param scope: Scope запроса.
+        :type scope: Scope
+        :param receive: Функция получения сообщений.
+        :type receive: Receive
+        :param send: Функция отправки сообщений.
+        :type send: Send
+        """
+        request_body = await read_body(receive)
+        status_code, response_body = await self.respond(
+            scope['path'], request_body,
+        )
+        await send({
+            'type': 'http.response.start',
+            'status': status_code,
+            'headers': json_headers,
+        })
+        await send({'type': 'http.response.body', 'body': response_body})
+
+    async def respond(self, path: str, body: bytes) -> tuple[int, bytes]:
+        """
+        Создает ответ на запрос после задержки.
+
+        :param path: Путь запроса.
+        :type path: str
+        :param body: Тело запроса.
+        :type body: bytes
+        :return: Код и тело ответа.
+        :rtype: tuple[int, bytes]
+        """
+        if path.startswith(healthz_prefix):
+            return status.HTTP_200_OK, empty_body
+        await asyncio.sleep(
+            self.settings.latency + self._random.uniform(
+                0, self.settings.jitter,
+            ),
+        )
+        if self._random.random() < self.settings.error_rate:
+            return status.HTTP_503_SERVICE_UNAVAILABLE, empty_body
+        if path == bulk_path:
+            batch_size = len(json.loads(body)['transactions'])
+            statuses = [status.HTTP_201_CREATED for _ in range(batch_size)]
+            return status.HTTP_200_OK, json.dumps(
+                {'statuses': statuses},
+            ).encode()
+        return status.HTTP_200_OK, self.responses.get(path, empty_body)
+
+
+async def read_body(receive) -> bytes:
+    """
+    Читает тело запроса целиком.
+
+    :param receive: Функция получения сообщений.
+    :type receive: Receive
+    :return: Тело запроса.
+    :rtype: bytes
+    """
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get('body', b''))
+        more_body = message.get('more_body', False)
+    return b''.join(chunks)
+
+
+def serve(stub: StubSettings, host: str, port: int) -> None:
+    """
+    Запускает заглушку внешнего сервиса.
+
+    :param stub: Поведение заглушки.
+    :type stub: StubSettings
+    :param host: Адрес заглушки.
+    :type host: str
+    :param port: Порт заглушки.
+    :type port: int
+    """
+    uvicorn.run(
+        StubService(stub),
+        host=host,
+        port=port,
+        lifespan='off',
+        log_level='warning',
+        access_log=False,
+    )
@@ -0,0 +1,200 @@
+"""
+Бенчмарк накладных расходов middleware трейсинга.
+
+Сравнивает время обработки запроса приложением без middleware,
+с прежним middleware на BaseHTTPMiddleware и с ASGI middleware
+TracingMiddleware для бизнес маршрута и служебного маршрута,
+в том числе для запросов вне выборки.
+Используется трейсер opentracing по умолчанию, поэтому измеряются
+накладные расходы самого middleware, а не отправки спанов.
+
+Запуск из каталога src::
+
+    python -m benchmarks.tracing_middleware
+"""
+import asyncio
+import json
+import math
+import sys
+import time
+from typing import Any
+
+from fastapi import FastAPI, Request
+from opentracing import global_tracer, tags
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.metrics.tracing import TracingMiddleware
+from config.config import TracingSettings
+
+requests_count = 2000
+repeats = 5
+microseconds_in_second = 1000000
+paths = ('/items', '/healthz/up')
+request_message = {'type': 'http.request', 'body': b'', 'more_body': False}
+disconnect_message = {'type': 'http.disconnect'}
+
+inner_app = FastAPI()
+
+
+@inner_app.get('/items')
+async def get_items() -> dict[str, str]:
+    """Бизнес маршрут."""
+    return {'message': 'ok'}
+
+
+@inner_app.get('/healthz/up')
+async def up_check() -> dict[str, str]:
+    """Служебный маршрут."""
+    return {'message': 'up'}
+
+
+async def legacy_tracing(request: Request, call_next) -> Any:
+    """
+    Прежний middleware трейсинга для сравнения.
+
+    :param request: Объект запроса к сервису.
+    :type request: Request
+    :param call_next: Следующая за middleware функция обработчик.
+    :type call_next: Callable
+    :return: Ответ обработчика.
+    :rtype: Response
+    """
+    path = request.url.path
+    not_business_routes = ['/healthz/up', '/healthz/ready', '/metrics']
+    if any((path.startswith(route) for route in not_business_routes)):
+        return await call_next(request)
+    span_tags = {
+        tags.SPAN_KIND: tags.SPAN_KIND_RPC_SERVER,
+        tags.HTTP_METHOD: request.method,
+        tags.HTTP_URL: str(request.url),
+    }
+    with global_tracer().start_active_span(
+        f'api_gateway_{request.method}_{path}', tags=span_tags,
+    ) as scope:
+        response = await call_next(request)
+        scope.span.set_tag(tags.HTTP_STATUS_CODE, response.status_code)
+        return response
+
+
+class Exchange:
+    """Обмен сообщениями ASGI одного GET запроса, как у HTTP сервера."""
+
+    def __init__(self, path: str) -> None:
+        """
+        Метод инициализации.
+
+        :param path: Путь запроса.
+        :type path: str
+        """
+        self.scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'root_path': '',
+            'query_string': b'',
+            'headers': [(b'host', b'gateway')],
+            'server': ('gateway', 80),
+            'client': ('127.0.0.1', 10000),
+        }
+        self._is_request_sent = False
+        self._is_complete = asyncio.Event()
+
+    async def receive(self) -> dict[str, Any]:
+        """
+        Возвращает тело запроса, затем ожидает конца ответа.
+
+        :return: Сообщение ASGI.
+        :rtype: dict[str, Any]
+        """
+        if not self._is_request_sent:
+            self._is_request_sent = True
+            return request_message
+        await self._is_complete.wait()
+        return disconnect_message
+
+    async def send(self, message: dict[str, Any]) -> None:
+        """
+        Принимает сообщение ответа.
+
+        :param message: Сообщение ASGI.
+        :type message: dict[str, Any]
+        """
+        if 'body' in message and not message.get('more_body', False):
+            self._is_complete.set()
+
+
+async def time_requests(app, path: str) -> float:
+    """
+    Измеряет среднее время обработки запроса приложением.
+
+    :param app: ASGI приложение.
+    :type app: ASGIApp
+    :param path: Путь запроса.
+    :type path: str
+    :return: Среднее время запроса в микросекундах.
+    :rtype: float
+    """
+    started_at = time.perf_counter()
+    for _ in range(requests_count):
+        exchange = Exchange(path)
+        await app(exchange.scope, exchange.receive, exchange.send)
+    elapsed = time.perf_counter() - started_at
+    return elapsed / requests_count * microseconds_in_second
+
+
+async def measure(apps: dict[str, Any], path: str) -> dict[str, float]:
+    """
+    Измеряет лучшее среднее время обработки запроса приложениями.
+
+    Приложения измеряются поочередно в каждом повторе, чтобы
+    изменения нагрузки на машину влияли на них одинаково.
+
+    :param apps: ASGI приложения по именам.
+    :type apps: dict[str, ASGIApp]
+    :param path: Путь запроса.
+    :type path: str
+    :return: Лучшее из repeats время запроса в микросекундах.
+    :rtype: dict[str, float]
+    """
+    timings = dict.fromkeys(apps, math.inf)
+    for _ in range(repeats):
+        for name, app in apps.items():
+            timing = await time_requests(app, path)
+            timings[name] = min(timings[name], timing)
+    return timings
+
+
+async def run() -> None:
+    """Запускает бенчмарк и выводит результаты в формате JSON."""
+    apps = {
+        'baseline': inner_app,
+        'before': BaseHTTPMiddleware(inner_app, dispatch=legacy_tracing),
+        'after': TracingMiddleware(inner_app, TracingSettings()),
+        'unsampled': TracingMiddleware(
+            inner_app, TracingSettings(sampler_param=0),
+        ),
+    }
+    for path in paths:
+        timings = await measure(apps, path)
+        baseline = timings['baseline']
+        json.dump(
+            {
+                'path': path,
+                'baseline_us': round(baseline, 1),
+                'overhead_before_us': round(timings['before'] - baseline, 1),
+                'overhead_after_us': round(timings['after'] - baseline, 1),
+                'overhead_unsampled_us': round(
+                    timings['unsampled'] - baseline, 1,
+                ),
+            },
+            sys.stdout,
+        )
+        sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    asyncio.run(run())
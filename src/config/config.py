@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Self
 
 import yaml
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 logger = logging.getLogger(__name__)
@@ -19,7 +20,9 @@ class TracingSettings(BaseSettings):
 
     enabled: bool = False
     sampler_type: str = 'const'
-    sampler_param: int = 1
+    sampler_param: float = 1
+    sample_errors: bool = True
+    slow_request_threshold: float = 1
     agent_host: str = 'jaeger'
     agent_port: int = 6831
     service_name: str = 'api-gateway-service'
@@ -27,15 +30,250 @@ class TracingSettings(BaseSettings):
     validate: bool = True
 
 
+class PoolSettings(BaseSettings):
+    """Конфигурация пула соединений к внешнему сервису."""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30
+    connect_timeout: float = 2
+    read_timeout: float = 10
+    write_timeout: float = 10
+    pool_timeout: float = 2
+
+
+class BalancerSettings(BaseSettings):
+    """Конфигурация балансировки запросов между экземплярами сервиса."""
+
+    strategy: str = 'p2c'
+    failure_threshold: int = 5
+    ejection_duration: float = 10
+    max_ejection_duration: float = 300
+    max_ejection_ratio: float = 0.5
+    probe_interval: float = 1
+    probe_path: str = '/healthz/up'
+
+
+class BreakerSettings(BaseSettings):
+    """Конфигурация автомата защиты внешнего сервиса."""
+
+    enabled: bool = True
+    window_size: int = 20
+    min_calls: int = 10
+    failure_rate_threshold: float = 0.5
+    slow_call_threshold: float = 5
+    slow_call_rate_threshold: float = 0.8
+    open_duration: float = 10
+    half_open_max_calls: int = 1
+
+
+class TokenCacheSettings(BaseSettings):
+    """Конфигурация кэша результатов проверки токенов."""
+
+    enabled: bool = True
+    max_size: int = 10000
+    ttl: float = 30
+    negative_ttl: float = 5
+
+
+class LocalJwtSettings(BaseSettings):
+    """Конфигурация локальной проверки токенов."""
+
+    enabled: bool = False
+    secrets_path: str | None = None
+    leeway: float = 0
+
+
+class VerifyUploadSettings(BaseSettings):
+    """Конфигурация передачи изображений на верификацию."""
+
+    streaming: bool = True
+    max_size: int = 10485760
+    max_field_size: int = 1024
+
+
+class DeadlineSettings(BaseSettings):
+    """Конфигурация сроков обработки запросов."""
+
+    enabled: bool = True
+    default_budget: float = 10
+    routes: dict[str, float] = {}
+
+
+class AdmissionSettings(BaseSettings):
+    """Конфигурация ограничения одновременных запросов к сервису."""
+
+    enabled: bool = True
+    initial_limit: float = 50
+    min_limit: float = 5
+    max_limit: float = 500
+    target_latency: float = 1
+    target_latencies: dict[int, float] = {}
+    max_adaptive_priority: int = 2
+    increase_step: float = 1
+    decrease_ratio: float = 0.9
+    decrease_interval: float = 1
+    max_queue: int = 100
+    max_wait: float = 0.5
+    retry_after: int = 1
+    default_priority: int = 2
+    routes: dict[str, int] = {}
+
+
+class BucketSettings(BaseSettings):
+    """Конфигурация корзины токенов для ограничения частоты запросов."""
+
+    rate: float = Field(default=1, gt=0)
+    burst: float = Field(default=5, gt=0)
+
+
+class RateLimitSettings(BaseSettings):
+    """Конфигурация ограничения частоты запросов пользователей."""
+
+    enabled: bool = True
+    backend: str = 'local'
+    workers: int = 1
+    max_buckets: int = 100000
+    routes: dict[str, BucketSettings] = {}
+
+
+class MetricsSettings(BaseSettings):
+    """Конфигурация метрик Prometheus."""
+
+    enabled: bool = True
+    namespace: str = 'api_gateway'
+    request_buckets: list[float] = [
+        0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+    ]
+    upstream_buckets: list[float] = [
+        0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+    ]
+    loop_lag_buckets: list[float] = [
+        0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1,
+    ]
+
+
+class LoopMonitorSettings(BaseSettings):
+    """Конфигурация мониторинга цикла событий."""
+
+    enabled: bool = True
+    interval: float = 0.05
+    block_threshold: float = 0.1
+    max_samples: int = 10
+    max_stack_depth: int = 30
+    debug_endpoint: bool = False
+
+
+class ReadinessSettings(BaseSettings):
+    """Конфигурация фоновой проверки готовности внешних сервисов."""
+
+    enabled: bool = True
+    interval: float = 5
+    timeout: float = 2
+    max_age: float = 15
+
+
+class RetrySettings(BaseSettings):
+    """Конфигурация повторов и дублирования запросов к внешнему сервису."""
+
+    enabled: bool = True
+    max_attempts: int = 3
+    base_backoff: float = 0.05
+    max_backoff: float = 1
+    retry_statuses: list[int] = [502, 503, 504]
+    budget_ratio: float = 0.2
+    budget_max_tokens: float = 10
+    hedging: bool = False
+    hedge_percentile: float = 0.95
+    hedge_min_delay: float = 0.01
+    hedge_min_samples: int = 20
+    latency_window: int = 100
+
+
+class ReportCacheSettings(BaseSettings):
+    """Конфигурация кэша отчетов о транзакциях."""
+
+    enabled: bool = True
+    max_size: int = 1000
+    max_rows: int = 10000
+    historical_ttl: float = 3600
+    live_ttl: float = 10
+    live_margin: float = 60
+
+
+class ReportShardingSettings(BaseSettings):
+    """Конфигурация разбиения отчетов на периоды."""
+
+    enabled: bool = False
+    shard_days: float = Field(default=31, gt=0)  # noqa: WPS432 days in month
+    max_concurrency: int = Field(default=4, gt=0)
+    max_shards: int = Field(default=64, gt=0)  # noqa: WPS432 not magic
+
+
+class ReportStreamSettings(BaseSettings):
+    """Конфигурация потоковой выдачи отчетов."""
+
+    chunk_size: int = 1000
+    max_row_size: int = 65536
+
+
+class BatchingSettings(BaseSettings):
+    """Конфигурация объединения запросов создания транзакций в пакеты."""
+
+    enabled: bool = False
+    max_size: int = 50
+    max_delay: float = 0.005
+    bulk_path: str = '/create_transactions'
+
+
+class IdempotencySettings(BaseSettings):
+    """Конфигурация повтора ответов на запросы с Idempotency-Key."""
+
+    enabled: bool = True
+    max_size: int = 10000
+    ttl: float = 86400
+    unknown_ttl: float = 60
+
+
+class ReportSettings(BaseSettings):
+    """Конфигурация отчетов о транзакциях."""
+
+    stream: ReportStreamSettings = ReportStreamSettings()
+    cache: ReportCacheSettings = ReportCacheSettings()
+    sharding: ReportShardingSettings = ReportShardingSettings()
+
+
 class Settings(BaseSettings):
     """Конфигурация приложения."""
 
     localhost: str
     auth_host: str
     auth_port: str
+    auth_endpoints: list[str] = []
+    auth_pool: PoolSettings = PoolSettings()
+    auth_balancer: BalancerSettings = BalancerSettings()
+    auth_breaker: BreakerSettings = BreakerSettings()
+    auth_retries: dict[str, RetrySettings] = {}
+    token_cache: TokenCacheSettings = TokenCacheSettings()
+    local_jwt: LocalJwtSettings = LocalJwtSettings()
+    verify_upload: VerifyUploadSettings = VerifyUploadSettings()
     transactions_host: str
     transactions_port: str
+    transactions_endpoints: list[str] = []
+    transactions_pool: PoolSettings = PoolSettings()
+    transactions_balancer: BalancerSettings = BalancerSettings()
+    transactions_breaker: BreakerSettings = BreakerSettings()
+    transactions_retries: dict[str, RetrySettings] = {}
+    transactions_batching: BatchingSettings = BatchingSettings()
+    transactions_idempotency: IdempotencySettings = IdempotencySettings()
+    reports: ReportSettings = ReportSettings()
     tracing: TracingSettings
+    deadlines: DeadlineSettings = DeadlineSettings()
+    admission: AdmissionSettings = AdmissionSettings()
+    rate_limits: RateLimitSettings = RateLimitSettings()
+    metrics: MetricsSettings = MetricsSettings()
+    loop_monitor: LoopMonitorSettings = LoopMonitorSettings()
+    readiness: ReadinessSettings = ReadinessSettings()
 
     @classmethod
     def from_yaml(cls, file_path: str) -> Self:
@@ -69,13 +307,37 @@ class Settings(BaseSettings):
 
     @classmethod
     def _create_instance(cls, settings) -> Self:
+        auth = settings.get('authentication')
+        transactions = settings.get('transactions')
         conf = {
             'localhost': settings.get('localhost'),
-            'auth_host': settings.get('authentication').get('host'),
-            'auth_port': settings.get('authentication').get('port'),
-            'transactions_host': settings.get('transactions').get('host'),
-            'transactions_port': settings.get('transactions').get('port'),
+            'auth_host': auth.get('host'),
+            'auth_port': auth.get('port'),
+            'auth_endpoints': auth.get('endpoints') or [],
+            'auth_pool': auth.get('pool', {}),
+            'auth_balancer': auth.get('balancer', {}),
+            'auth_breaker': auth.get('breaker', {}),
+            'auth_retries': auth.get('retries', {}),
+            'token_cache': auth.get('token_cache', {}),
+            'local_jwt': auth.get('local_jwt', {}),
+            'verify_upload': auth.get('verify_upload', {}),
+            'transactions_host': transactions.get('host'),
+            'transactions_port': transactions.get('port'),
+            'transactions_endpoints': transactions.get('endpoints') or [],
+            'transactions_pool': transactions.get('pool', {}),
+            'transactions_balancer': transactions.get('balancer', {}),
+            'transactions_breaker': transactions.get('breaker', {}),
+            'transactions_retries': transactions.get('retries', {}),
+            'transactions_batching': transactions.get('batching', {}),
+            'transactions_idempotency': transactions.get('idempotency', {}),
+            'reports': transactions.get('reports', {}),
             'tracing': settings.get('tracing'),
+            'deadlines': settings.get('deadlines', {}),
+            'admission': settings.get('admission', {}),
+            'rate_limits': settings.get('rate_limits', {}),
+            'metrics': settings.get('metrics', {}),
+            'loop_monitor': settings.get('loop_monitor', {}),
+            'readiness': settings.get('readiness', {}),
         }
         return cls(**conf)
 
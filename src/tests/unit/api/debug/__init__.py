@@ -0,0 +1 @@
+"""Тесты пакета app.api.debug."""
@@ -0,0 +1,19 @@
+import pytest
+from fastapi import status
+
+
+class TestLoopStats:
+    """Тестирует хэндлер debug/loop."""
+
+    url = 'debug/loop'
+
+    @pytest.mark.asyncio
+    @pytest.mark.anyio
+    async def test_response(self, test_client):
+        """Тестирует выдачу статистики цикла событий."""
+        response = await test_client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        loop_stats = response.json()
+        assert 'max_lag' in loop_stats
+        assert 'blocked_calls' in loop_stats
@@ -1,6 +1,17 @@
+import asyncio
+
 import pytest
 from fastapi import status
 
+from app.external.readiness import readiness_checker
+
+
+def is_checked() -> bool:
+    """Проверяет, что фоновая проверка признала зависимости готовыми."""
+    return all(
+        dependency.is_ready for dependency in readiness_checker.statuses()
+    )
+
 
 class TestIsUp:
     """Тестирует хэндлер healthz/up."""
@@ -54,6 +65,25 @@ class TestIsReady:
 
         assert response.status_code == expected_response_status_code
 
+    @pytest.mark.asyncio
+    @pytest.mark.anyio
+    async def test_breakers_state(
+        self,
+        test_client,
+        auth_client_healthz_mocker,
+        transaction_client_healthz_mocker,
+    ):
+        """Тестирует состояние автоматов защиты в ответе."""
+        auth_client_healthz_mocker(status_code=status.HTTP_200_OK)
+        transaction_client_healthz_mocker(status_code=status.HTTP_200_OK)
+
+        response = await test_client.get(self.url)
+
+        assert response.json()['breakers'] == {
+            'authentication': 'closed',
+            'transaction': 'closed',
+        }
+
     @pytest.mark.asyncio
     @pytest.mark.anyio
     @pytest.mark.parametrize(
@@ -86,3 +116,29 @@ class TestIsReady:
         response = await test_client.get(self.url)
 
         assert response.status_code == expected_response_status_code
+
+    @pytest.mark.asyncio
+    @pytest.mark.anyio
+    async def test_cached_state(
+        self,
+        test_client,
+        auth_client_healthz_mocker,
+        transaction_client_healthz_mocker,
+    ):
+        """Тестирует ответ по результатам фоновой проверки."""
+        auth_client_healthz_mocker(status_code=status.HTTP_200_OK)
+        transaction_client_healthz_mocker(status_code=status.HTTP_200_OK)
+        readiness_checker.start()
+        while not is_checked():
+            await asyncio.sleep(0)
+        auth_client_healthz_mocker(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+
+        response = await test_client.get(self.url)
+        await readiness_checker.stop()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.json()['dependencies']) == {
+            'authentication', 'transaction',
+        }
@@ -0,0 +1,121 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import status
+
+from app.external.breaker import BreakerState
+from app.external.clients import clients
+from app.metrics import instrumentation
+
+
+def sample_value(rendered: str, sample: str) -> float:
+    """Возвращает значение строки выгрузки метрик."""
+    for line in rendered.splitlines():
+        if line.startswith(f'{sample} '):
+            return float(line.rsplit(' ', 1)[1])
+    return 0
+
+
+class TestMetrics:
+    """Тестирует хэндлер metrics."""
+
+    url = 'metrics'
+
+    @pytest.mark.asyncio
+    @pytest.mark.anyio
+    async def test_response(self, test_client):
+        """Тестирует выгрузку метрик сервиса и клиентов."""
+        response = await test_client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['content-type'].startswith('text/plain')
+        assert all(
+            f'{instrumentation.namespace}_{metric}' in response.text
+            for metric in (
+                'upstream_pool_max_connections',
+                'upstream_endpoint_ejected',
+                'admission_limit',
+                'upstream_breaker_transitions_total{service="transaction"',
+                'upstream_retries_total{method="transaction.get_report"}',
+                'upstream_retry_budget_exhausted_total{method=',
+                'cache_hit_ratio{cache="token"}',
+            )
+        )
+        breaker_states = [
+            sample_value(
+                response.text,
+                '{0}_upstream_breaker_state{{{1}}}'.format(
+                    instrumentation.namespace,
+                    f'service="transaction",state="{state}"',
+                ),
+            )
+            for state in BreakerState
+        ]
+        assert sorted(breaker_states) == [0, 0, 1]
+
+    @pytest.mark.asyncio
+    @pytest.mark.anyio
+    @pytest.mark.parametrize(
+        'path, route, expected_status',
+        (
+            pytest.param(
+                'healthz/up', '/healthz/up', status.HTTP_200_OK, id='route',
+            ),
+            pytest.param(
+                'unknown/path',
+                instrumentation.unmatched_route,
+                status.HTTP_404_NOT_FOUND,
+                id='unmatched route',
+            ),
+        ),
+    )
+    async def test_request_counted(
+        self, test_client, path, route, expected_status,
+    ):
+        """Тестирует учет запроса по шаблону маршрута и коду ответа."""
+        sample = '{0}_http_requests_total{{{1}}}'.format(
+            instrumentation.namespace,
+            f'method="GET",route="{route}",status="{expected_status}"',
+        )
+        before = sample_value(instrumentation.registry.render(), sample)
+
+        await test_client.get(path)
+
+        after = sample_value(instrumentation.registry.render(), sample)
+        assert after == before + 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.anyio
+    async def test_upstream_counted(
+        self,
+        test_client,
+        auth_client_healthz_mocker,
+        transaction_client_healthz_mocker,
+    ):
+        """Тестирует учет запросов к внешним сервисам."""
+        auth_client_healthz_mocker(status_code=status.HTTP_200_OK)
+        transaction_client_healthz_mocker(status_code=status.HTTP_200_OK)
+        sample = '{0}_upstream_request_duration_seconds_count{{{1}}}'.format(
+            instrumentation.namespace,
+            'service="authentication",endpoint="/healthz/ready"',
+        )
+        before = sample_value(instrumentation.registry.render(), sample)
+
+        await test_client.get('healthz/ready')
+
+        after = sample_value(instrumentation.registry.render(), sample)
+        assert after == before + 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.anyio
+    async def test_coalesced_calls(self, test_client):
+        """Тестирует выгрузку статистики объединения запросов."""
+        sample = '{0}_upstream_coalesced_executions_total{{{1}}}'.format(
+            instrumentation.namespace, 'service="transaction",group="test"',
+        )
+        flights = clients.transactions_client.flights
+        await flights.run('test', None, AsyncMock())
+
+        response = await test_client.get(self.url)
+
+        assert sample_value(response.text, sample) >= 1
@@ -1,9 +1,13 @@
 from datetime import datetime
 from enum import StrEnum
 
+import httpx
 import pytest
 from fastapi import status
 
+from app.external.clients import clients
+from app.external.pool import Client
+
 
 class Key(StrEnum):
     """Часто повторяемые ключи."""
@@ -601,3 +605,95 @@ class TestCreateTransaction:
         )
 
         assert response.status_code == expected_response_status_code
+
+    @pytest.mark.asyncio
+    @pytest.mark.anyio
+    async def test_idempotency_key(
+        self, test_client, auth_client_mocker, transaction_client_mocker,
+    ):
+        """Тестирует однократное создание транзакции по ключу."""
+        auth_client_mocker(status_code=status.HTTP_200_OK)
+        transaction_client_mocker(status_code=status.HTTP_200_OK)
+        headers = {**valid_request_headers, 'Idempotency-Key': 'key-1'}
+
+        responses = [
+            await test_client.post(
+                self.url, json=self.valid_transaction, headers=headers,
+            )
+            for _ in range(2)
+        ]
+
+        assert [response.status_code for response in responses] == [
+            status.HTTP_201_CREATED, status.HTTP_201_CREATED,
+        ]
+        upstream_post = clients.transactions_client.client.post
+        assert upstream_post.await_count == 1
+        assert upstream_post.await_args.kwargs['headers'][
+            'Idempotency-Key'
+        ] == 'key-1'
+
+
+class TestStreamReport:
+    """Тестирует хэндлер transaction/report/stream."""
+
+    url = 'transaction/report/stream'
+
+    @pytest.mark.asyncio
+    @pytest.mark.anyio
+    @pytest.mark.parametrize(
+        'report_format, media_type, lines_count',
+        (
+            pytest.param('ndjson', 'application/x-ndjson', 2, id='ndjson'),
+            pytest.param('json', 'application/json', 1, id='json'),
+        ),
+    )
+    async def test_stream_report(
+        self,
+        report_format,
+        media_type,
+        lines_count,
+        monkeypatch,
+        test_client,
+        auth_client_mocker,
+    ):
+        """Тестирует потоковую выдачу отчета."""
+        auth_client_mocker(status_code=status.HTTP_200_OK)
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(
+                status.HTTP_200_OK,
+                json=TestGetReport.stub_report_response,
+            ),
+        )
+        upstream = Client(base_url='http://test-service', transport=transport)
+        await upstream.start()
+        monkeypatch.setattr(
+            'app.api.handlers.clients.transactions_client.client', upstream,
+        )
+
+        response = await test_client.post(
+            self.url,
+            params={'report_format': report_format},
+            json=TestGetReport.valid_report_request,
+            headers=valid_request_headers,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['content-type'] == media_type
+        assert len(response.text.strip().splitlines()) == lines_count
+
+    @pytest.mark.asyncio
+    @pytest.mark.anyio
+    async def test_service_error(
+        self, test_client, auth_client_mocker, transaction_client_mocker,
+    ):
+        """Тестирует ошибку сервиса транзакций до начала ответа."""
+        auth_client_mocker(status_code=status.HTTP_200_OK)
+        transaction_client_mocker(status_code=status.HTTP_200_OK)
+
+        response = await test_client.post(
+            self.url,
+            json=TestGetReport.invalid_report_request,
+            headers=valid_request_headers,
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
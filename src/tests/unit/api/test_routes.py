@@ -0,0 +1,63 @@
+from typing import Iterator
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import status
+from fastapi.dependencies.models import Dependant
+from fastapi.dependencies.utils import is_coroutine_callable
+from fastapi.routing import APIRoute
+
+from app.service import app
+from tests.unit.api.test_handlers import stub_resp_body, valid_request_body
+
+api_routes = [route for route in app.routes if isinstance(route, APIRoute)]
+
+
+def walk_dependants(dependant: Dependant) -> Iterator[Dependant]:
+    """
+    Обходит дерево зависимостей маршрута.
+
+    :param dependant: Корень дерева зависимостей.
+    :type dependant: Dependant
+    :yield: Хэндлер и все его зависимости.
+    :ytype: Dependant
+    """
+    yield dependant
+    for sub_dependant in dependant.dependencies:
+        yield from walk_dependants(sub_dependant)
+
+
+class TestRoutes:
+    """Тестирует хэндлеры и зависимости маршрутов сервиса."""
+
+    @pytest.mark.parametrize(
+        'route',
+        [pytest.param(route, id=route.path) for route in api_routes],
+    )
+    def test_runs_on_event_loop(self, route):
+        """Тестирует, что маршрут не вызывает функций в пуле потоков."""
+        for dependant in walk_dependants(route.dependant):
+            if dependant.call is not None:
+                assert is_coroutine_callable(dependant.call), dependant.call
+
+    @pytest.mark.asyncio
+    @pytest.mark.anyio
+    async def test_no_threadpool(
+        self, monkeypatch, test_client, auth_client_mocker,
+    ):
+        """Тестирует обработку запроса без пула потоков."""
+        run_in_threadpool = AsyncMock()
+        monkeypatch.setattr(
+            'fastapi.routing.run_in_threadpool', run_in_threadpool,
+        )
+        auth_client_mocker(
+            status_code=status.HTTP_200_OK,
+            json=stub_resp_body,
+        )
+
+        response = await test_client.post(
+            'auth/register', json=valid_request_body,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        run_in_threadpool.assert_not_called()
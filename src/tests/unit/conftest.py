@@ -1,9 +1,12 @@
 from unittest.mock import AsyncMock, MagicMock
 
+import pydantic_core
 import pytest
 from httpx import AsyncClient
 
+from app.external.clients import clients
 from app.service import app
+from app.system.ratelimit import rate_limiter
 
 
 @pytest.fixture
@@ -13,7 +16,7 @@ def client():
         client = AsyncMock()
         response = MagicMock()
         response.status_code = status_code
-        response.json.return_value = json
+        response.content = pydantic_core.to_json(json)
         response.headers = headers
         client.post.return_value = response
         return client
@@ -33,7 +36,7 @@ def auth_client_mocker(monkeypatch):
         client = AsyncMock()
         mock_resp = MagicMock()
         mock_resp.status_code = status_code
-        mock_resp.json.return_value = json
+        mock_resp.content = pydantic_core.to_json(json)
         mock_resp.headers = headers
         client.post.return_value = mock_resp
         monkeypatch.setattr(
@@ -50,7 +53,7 @@ def transaction_client_mocker(monkeypatch):
         client = AsyncMock()
         mock_resp = MagicMock()
         mock_resp.status_code = status_code
-        mock_resp.json.return_value = json
+        mock_resp.content = pydantic_core.to_json(json)
         mock_resp.headers = headers
         client.post.return_value = mock_resp
         monkeypatch.setattr(
@@ -69,7 +72,7 @@ def auth_client_healthz_mocker(monkeypatch):
         mock_resp.status_code = status_code
         client.get.return_value = mock_resp
         monkeypatch.setattr(
-            'app.api.healthz.handlers.clients.auth_client.client',
+            'app.external.clients.clients.auth_client.client',
             client,
         )
     return _client
@@ -84,7 +87,21 @@ def transaction_client_healthz_mocker(monkeypatch):
         mock_resp.status_code = status_code
         client.get.return_value = mock_resp
         monkeypatch.setattr(
-            'app.api.healthz.handlers.clients.transactions_client.client',
+            'app.external.clients.clients.transactions_client.client',
             client,
         )
     return _client
+
+
+@pytest.fixture(autouse=True)
+def reset_clients_state():
+    """Сбрасывает состояние клиентов внешних сервисов между тестами."""
+    yield
+    clients.auth_client.token_cache.clear()
+    clients.transactions_client.report_cache.clear()
+    clients.transactions_client.idempotency.clear()
+    rate_limiter.store.clear()
+    for service_client in clients:
+        service_client.breaker.reset()
+        for policy in service_client.retries.values():
+            policy.reset()
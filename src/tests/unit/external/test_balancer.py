@@ -0,0 +1,189 @@
+import asyncio
+from contextlib import suppress
+
+import httpx
+import pytest
+from fastapi import status
+
+from app.external.balancer import Endpoint, UpstreamGroup
+from app.external.clients import make_upstream
+from app.external.pool import Client
+from config.config import BalancerSettings, PoolSettings
+
+test_balancer = BalancerSettings(
+    strategy='least_outstanding',
+    failure_threshold=2,
+    ejection_duration=1,
+    max_ejection_duration=3,
+    probe_interval=0,
+)
+healthy = status.HTTP_200_OK
+failing = status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+def make_endpoint(address: str, status_codes: dict[str, int]) -> Endpoint:
+    """Создает экземпляр с кодом ответа из словаря по адресу."""
+    return Endpoint(
+        address,
+        Client(
+            name=address,
+            base_url=f'http://{address}',
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(status_codes[address]),
+            ),
+        ),
+    )
+
+
+async def make_group(
+    status_codes: dict[str, int], balancer: BalancerSettings = test_balancer,
+) -> UpstreamGroup:
+    """Создает группу экземпляров с заданными кодами ответа."""
+    group = UpstreamGroup(
+        'test',
+        [make_endpoint(address, status_codes) for address in status_codes],
+        balancer,
+    )
+    for endpoint in group.endpoints:
+        await endpoint.client.start()
+    return group
+
+
+def refuse_connection(request: httpx.Request) -> httpx.Response:
+    """Транспорт, отклоняющий соединение."""
+    raise httpx.ConnectError('refused', request=request)
+
+
+class TestUpstreamGroup:
+    """Тестирует группу экземпляров внешнего сервиса."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'strategy',
+        (
+            pytest.param('least_outstanding', id='least outstanding'),
+            pytest.param('p2c', id='power of two choices'),
+        ),
+    )
+    async def test_spreads_requests(self, strategy):
+        """Тестирует распределение запросов между экземплярами."""
+        group = await make_group(
+            {'first:80': healthy, 'second:80': healthy},
+            test_balancer.model_copy(update={'strategy': strategy}),
+        )
+
+        requests = [group.get('/items') for _ in range(100)]
+        await asyncio.gather(*requests)
+
+        endpoints = group.endpoint_stats()
+        requests_totals = [stats.requests_total for stats in endpoints]
+        assert sum(requests_totals) == 100
+        assert all(requests_totals)
+        assert group.stats().requests_total == 100
+
+    @pytest.mark.asyncio
+    async def test_picks_least_outstanding(self):
+        """Тестирует выбор экземпляра с наименьшим числом запросов."""
+        group = await make_group({'busy:80': healthy, 'idle:80': healthy})
+        group.endpoints[0].client.in_flight = 3
+
+        assert group.pick().address == 'idle:80'
+
+    @pytest.mark.parametrize(
+        'endpoints, expected',
+        (
+            pytest.param([], ['auth:8000'], id='service address'),
+            pytest.param(
+                ['auth-0:8000', 'auth-1:8000'],
+                ['auth-0:8000', 'auth-1:8000'],
+                id='endpoints',
+            ),
+        ),
+    )
+    def test_make_upstream(self, endpoints, expected):
+        """Тестирует создание группы по адресам экземпляров."""
+        group = make_upstream(
+            'auth', 'auth:8000', endpoints, PoolSettings(), BalancerSettings(),
+        )
+
+        addresses = [endpoint.address for endpoint in group.endpoints]
+        assert addresses == expected
+
+
+class TestUpstreamHealth:
+    """Тестирует исключение и проверку экземпляров внешнего сервиса."""
+
+    @pytest.mark.asyncio
+    async def test_ejects_failing_endpoint(self):
+        """Тестирует исключение экземпляра после ошибок подряд."""
+        group = await make_group({'failing:80': failing, 'healthy:80': healthy})
+
+        for _ in range(10):
+            await group.get('/items')
+
+        failing_stats, healthy_stats = group.endpoint_stats()
+        assert failing_stats.is_ejected
+        assert failing_stats.ejections_total == 1
+        assert failing_stats.requests_total == test_balancer.failure_threshold
+        assert not healthy_stats.is_ejected
+
+    @pytest.mark.asyncio
+    async def test_ejection_ratio(self):
+        """Тестирует ограничение доли исключенных экземпляров."""
+        group = await make_group({'first:80': failing, 'second:80': failing})
+
+        for _ in range(10):
+            await group.get('/items')
+
+        ejected = [stats.is_ejected for stats in group.endpoint_stats()]
+        assert ejected.count(True) == 1
+
+    @pytest.mark.asyncio
+    async def test_transport_error(self):
+        """Тестирует учет ошибок соединения как отказов экземпляра."""
+        group = await make_group({'first:80': healthy, 'second:80': healthy})
+        group.endpoints[0].client = Client(
+            transport=httpx.MockTransport(refuse_connection),
+        )
+        await group.endpoints[0].client.start()
+
+        for _ in range(4):
+            with suppress(httpx.ConnectError):
+                async with group.stream('GET', '/items') as resp:
+                    assert resp.status_code == healthy
+
+        assert group.endpoints[0].is_ejected
+
+    @pytest.mark.asyncio
+    async def test_probe(self):
+        """Тестирует возврат экземпляра в балансировку после проверки."""
+        status_codes = {'first:80': failing, 'second:80': healthy}
+        group = await make_group(status_codes)
+        endpoint = group.endpoints[0]
+        endpoint.eject(test_balancer)
+        first_until = endpoint.ejected_until
+
+        await group.probe(endpoint)
+        assert endpoint.is_ejected
+        assert first_until < endpoint.ejected_until
+
+        status_codes['first:80'] = healthy
+        await group.probe(endpoint)
+        assert not endpoint.is_ejected
+        assert endpoint.consecutive_failures == 0
+
+    @pytest.mark.asyncio
+    async def test_background_probe(self):
+        """Тестирует фоновую проверку исключенных экземпляров."""
+        group = await make_group({'first:80': healthy, 'second:80': healthy})
+        endpoint = group.endpoints[0]
+        endpoint.eject(test_balancer)
+        endpoint.ejected_until = 0
+
+        await group.start()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        await group.close()
+
+        assert not endpoint.is_ejected
+        assert not group.stats().is_open
@@ -0,0 +1,149 @@
+import asyncio
+import json
+from datetime import datetime
+
+import httpx
+import pytest
+from fastapi import status
+
+from app.api.models import Transaction, TransactionType
+from app.external.batching import MicroBatcher
+from app.external.pool import Client
+from app.external.service_client import good_response
+from app.external.transactions import TransactionServiceClient
+from app.system import errors
+from config.config import BatchingSettings
+
+flush_delay = 0.01
+test_batching = BatchingSettings(
+    enabled=True, max_size=3, max_delay=flush_delay,
+)
+
+
+def make_batcher(batches: list[list[int]]) -> MicroBatcher[int, int]:
+    """Создает объединение, удваивающее числа пакета."""
+    async def send(requests: list[int]) -> list[int]:  # noqa: WPS430 for tests
+        batches.append(requests)
+        return [request * 2 for request in requests]
+
+    return MicroBatcher(test_batching, send)
+
+
+def make_transaction(amount: int) -> Transaction:
+    """Создает транзакцию с заданной суммой."""
+    return Transaction(
+        username='george',
+        amount=amount,
+        transaction_type=TransactionType.deposit,
+        timestamp=datetime(year=2024, month=1, day=15),  # noqa: WPS432 date
+    )
+
+
+class TestMicroBatcher:
+    """Тестирует объединение одиночных запросов в пакеты."""
+
+    @pytest.mark.asyncio
+    async def test_max_size(self):
+        """Тестирует отправку пакета при наборе max_size запросов."""
+        batches: list[list[int]] = []
+        batcher = make_batcher(batches)
+
+        responses = await asyncio.gather(*(
+            batcher.submit(request) for request in range(1, 5)
+        ))
+        await batcher.close()
+
+        assert responses == [2, 4, 6, 8]
+        assert batches == [[1, 2, 3], [4]]
+        assert batcher.stats().max_batch_size == test_batching.max_size
+
+    @pytest.mark.asyncio
+    async def test_max_delay(self):
+        """Тестирует отправку неполного пакета по истечении max_delay."""
+        batches: list[list[int]] = []
+        batcher = make_batcher(batches)
+
+        response = await batcher.submit(1)
+
+        assert response == 2
+        assert batcher.stats().batches == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'responses, expected_error',
+        (
+            pytest.param(
+                errors.NotFoundError(), errors.NotFoundError, id='send error',
+            ),
+            pytest.param([1], errors.ServerError, id='incomplete response'),
+        ),
+    )
+    async def test_error(self, responses, expected_error):
+        """Тестирует передачу ошибки пакета каждому запросу."""
+        async def send(requests: list[int]) -> list[int]:  # noqa: WPS430, E501 for tests
+            if isinstance(responses, Exception):
+                raise responses
+            return responses
+
+        batcher: MicroBatcher[int, int] = MicroBatcher(test_batching, send)
+
+        outcomes = await asyncio.gather(
+            batcher.submit(1), batcher.submit(2), return_exceptions=True,
+        )
+
+        assert all(
+            isinstance(outcome, expected_error) for outcome in outcomes
+        )
+
+    @pytest.mark.asyncio
+    async def test_cancelled_request(self):
+        """Тестирует отмену ожидания одного запроса пакета."""
+        batches: list[list[int]] = []
+        batcher = make_batcher(batches)
+        cancelled = asyncio.create_task(batcher.submit(1))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        response = await batcher.submit(2)
+
+        assert response == 4
+        assert batches == [[1, 2]]
+
+
+class TestTransactionBatching:
+    """Тестирует пакетное создание транзакций."""
+
+    @pytest.mark.asyncio
+    async def test_create_transaction(self):
+        """Тестирует создание транзакций одним запросом к сервису."""
+        bodies: list[dict] = []
+
+        def respond(request: httpx.Request) -> httpx.Response:  # noqa: WPS430, E501 for tests
+            bodies.append(json.loads(request.content))
+            return httpx.Response(
+                status.HTTP_200_OK,
+                json={'statuses': [
+                    status.HTTP_201_CREATED,
+                    status.HTTP_422_UNPROCESSABLE_ENTITY,
+                ]},
+            )
+
+        service_client = TransactionServiceClient(
+            Client(
+                base_url='http://transactions',
+                transport=httpx.MockTransport(respond),
+            ),
+            batching=test_batching,
+        )
+        await service_client.client.start()
+
+        created, rejected = await asyncio.gather(
+            service_client.create_transaction(make_transaction(1)),
+            service_client.create_transaction(make_transaction(2)),
+            return_exceptions=True,
+        )
+
+        assert created == good_response
+        assert isinstance(rejected, errors.UnprocessableError)
+        assert len(bodies) == 1
+        assert len(bodies[0]['transactions']) == 2
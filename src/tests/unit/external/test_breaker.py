@@ -0,0 +1,223 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from fastapi import HTTPException, status
+
+from app.external.breaker import BreakerState, CircuitBreaker
+from app.external.pool import PoolClosedError
+from app.external.stats import breaker_stats
+from app.external.transactions import TransactionServiceClient
+from app.system.errors import CircuitOpenError, ServerError, UnknownOutcomeError
+from config.config import BreakerSettings
+
+test_settings = BreakerSettings(
+    window_size=4,
+    min_calls=2,
+    failure_rate_threshold=0.5,
+    slow_call_threshold=1,
+    slow_call_rate_threshold=1,
+    open_duration=60,
+    half_open_max_calls=1,
+)
+half_open_settings = test_settings.model_copy(update={'open_duration': 0})
+tolerant_settings = test_settings.model_copy(
+    update={'failure_rate_threshold': 0.75},
+)
+fast = 0.01
+slow = 2
+failure = True
+success = False
+
+
+def open_breaker(breaker: CircuitBreaker) -> None:
+    """Открывает автомат защиты."""
+    for _ in range(test_settings.min_calls):
+        breaker.before_call()
+        breaker.record(is_failure=True, latency=fast)
+
+
+class TestCircuitBreaker:
+    """Тестирует автомат защиты внешнего сервиса."""
+
+    @pytest.mark.parametrize(
+        'is_failure, latency, expected_state',
+        (
+            pytest.param(success, fast, BreakerState.closed, id='success'),
+            pytest.param(failure, fast, BreakerState.open, id='failures'),
+            pytest.param(success, slow, BreakerState.open, id='slow calls'),
+        ),
+    )
+    def test_state_after_calls(self, is_failure, latency, expected_state):
+        """Тестирует состояние автомата после вызовов."""
+        breaker = CircuitBreaker('test', test_settings)
+
+        for _ in range(test_settings.min_calls):
+            breaker.before_call()
+            breaker.record(is_failure=is_failure, latency=latency)
+
+        assert breaker.state is expected_state
+
+    def test_window_eviction(self):
+        """Тестирует учет ошибок, вытесненных из окна вызовов."""
+        breaker = CircuitBreaker('test', tolerant_settings)
+        outcomes = (
+            failure, success, success, success, success, failure, failure,
+        )
+
+        for is_failure in outcomes:
+            breaker.record(is_failure=is_failure, latency=fast)
+
+        stats = breaker.stats()
+        assert (stats.window_calls, stats.window_failures) == (4, 2)
+        assert stats.state is BreakerState.closed
+
+    def test_open_rejects_calls(self):
+        """Тестирует отказ в вызове при открытом автомате."""
+        breaker = CircuitBreaker('test', test_settings)
+        open_breaker(breaker)
+
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        stats = breaker.stats()
+        assert (stats.opened_total, stats.rejected_total) == (1, 1)
+
+    @pytest.mark.parametrize(
+        'is_failure, expected_transitions',
+        (
+            pytest.param(
+                success,
+                {
+                    BreakerState.open: 1,
+                    BreakerState.half_open: 1,
+                    BreakerState.closed: 1,
+                },
+                id='trial success',
+            ),
+            pytest.param(
+                failure,
+                {BreakerState.open: 2, BreakerState.half_open: 2},
+                id='trial failure',
+            ),
+        ),
+    )
+    def test_half_open(self, is_failure, expected_transitions):
+        """Тестирует пробные вызовы после открытия автомата."""
+        breaker = CircuitBreaker('test', half_open_settings)
+        open_breaker(breaker)
+        assert breaker.state is BreakerState.half_open
+
+        breaker.before_call()
+        breaker.record(is_failure=is_failure, latency=fast)
+
+        stats = breaker.stats()
+        assert stats.transitions == expected_transitions
+        assert stats.opened_total == expected_transitions[BreakerState.open]
+
+    def test_half_open_limits_trial_calls(self):
+        """Тестирует ограничение числа пробных вызовов."""
+        breaker = CircuitBreaker('test', half_open_settings)
+        open_breaker(breaker)
+        breaker.before_call()
+
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        breaker.release()
+        breaker.before_call()
+
+    def test_disabled(self):
+        """Тестирует выключенный автомат."""
+        breaker = CircuitBreaker(
+            'test', test_settings.model_copy(update={'enabled': False}),
+        )
+
+        open_breaker(breaker)
+
+        assert breaker.state is BreakerState.closed
+
+
+class TestServiceClientBreaker:
+    """Тестирует автомат защиты в клиенте внешнего сервиса."""
+
+    @pytest.mark.asyncio
+    async def test_fast_fail_when_open(self):
+        """Тестирует отказ без запроса к сервису при открытом автомате."""
+        client = AsyncMock()
+        client.get.return_value = MagicMock(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+        service_client = TransactionServiceClient(client, test_settings)
+
+        for _ in range(test_settings.min_calls + 1):
+            with pytest.raises(HTTPException):
+                await service_client.is_ready()
+
+        assert client.get.await_count == test_settings.min_calls
+        assert service_client.breaker.state is BreakerState.open
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'error, expected_error',
+        (
+            pytest.param(
+                httpx.ConnectError('refused'), ServerError, id='not sent',
+            ),
+            pytest.param(
+                httpx.ReadTimeout('read'), UnknownOutcomeError, id='sent',
+            ),
+            pytest.param(
+                httpx.DecodingError('gzip'), UnknownOutcomeError, id='decoding',
+            ),
+            pytest.param(
+                httpx.InvalidURL('url'), ServerError, id='invalid url',
+            ),
+            pytest.param(
+                PoolClosedError('closed'), ServerError, id='closed pool',
+            ),
+        ),
+    )
+    async def test_request_error(self, error, expected_error):
+        """Тестирует ошибку выполнения запроса к сервису."""
+        client = AsyncMock()
+        client.get.side_effect = error
+        service_client = TransactionServiceClient(client, test_settings)
+
+        with pytest.raises(expected_error, match=expected_error().detail):
+            await service_client.is_ready()
+
+        assert service_client.breaker.stats().window_failures == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_trial_recorded(self):
+        """Тестирует учет пробного вызова, завершенного ошибкой запроса."""
+        client = AsyncMock()
+        client.get.side_effect = httpx.DecodingError('gzip')
+        service_client = TransactionServiceClient(client, half_open_settings)
+        open_breaker(service_client.breaker)
+
+        with pytest.raises(ServerError):
+            await service_client.is_ready()
+
+        assert service_client.breaker.stats().opened_total == 2
+        service_client.breaker.before_call()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_trial_released(self):
+        """Тестирует освобождение отмененного пробного вызова."""
+        client = AsyncMock()
+        client.get.side_effect = asyncio.CancelledError()
+        service_client = TransactionServiceClient(client, half_open_settings)
+        open_breaker(service_client.breaker)
+
+        with pytest.raises(asyncio.CancelledError):
+            await service_client.is_ready()
+
+        service_client.breaker.before_call()
+
+
+def test_clients_breaker_stats():
+    """Тестирует статистику автоматов защиты клиентов."""
+    assert all(
+        stats.state is BreakerState.closed for stats in breaker_stats()
+    )
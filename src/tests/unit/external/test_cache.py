@@ -0,0 +1,278 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pydantic_core
+import pytest
+from fastapi import status
+
+from app.api.models import Report, ReportRequest, Transaction
+from app.external.cache import ReportCache, TTLCache, hash_token, report_key
+from app.external.stats import cache_stats
+from app.external.transactions import TransactionServiceClient
+from config.config import ReportCacheSettings, ReportSettings
+
+test_key = 'key'
+test_value = 'value'
+historical_ttl = 3600
+live_ttl = 10
+report_settings = ReportCacheSettings(
+    max_size=10, max_rows=2, historical_ttl=historical_ttl, live_ttl=live_ttl,
+)
+removed = True
+kept = False
+username = 'max'
+history_start = datetime(year=2024, month=1, day=1)  # noqa: WPS432 test value
+history_end = datetime(year=2024, month=1, day=30)  # noqa: WPS432 test value
+history_request = ReportRequest(
+    username=username, start_date=history_start, end_date=history_end,
+)
+transaction = Transaction(
+    username=username,
+    amount=1,
+    transaction_type=0,
+    timestamp=datetime(year=2024, month=1, day=15),  # noqa: WPS432 test value
+)
+
+
+def make_report(report_request: ReportRequest, rows_count: int = 1) -> Report:
+    """Создает отчет о транзакциях."""
+    return Report.model_construct(
+        request=report_request,
+        transactions=[transaction] * rows_count,  # noqa: WPS435 same rows
+    )
+
+
+class TestTTLCache:
+    """Тестирует кэш с временем жизни записей."""
+
+    def test_hit_and_miss(self):
+        """Тестирует попадание и промах кэша."""
+        cache: TTLCache[str] = TTLCache(max_size=2, ttl=60)
+
+        assert cache.get(test_key) is None
+        cache.set(test_key, test_value)
+        assert cache.get(test_key) == test_value
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+        assert stats.hit_ratio == pytest.approx(0.5)
+
+    def test_expired_entry(self):
+        """Тестирует устаревание записи."""
+        cache: TTLCache[str] = TTLCache(max_size=2, ttl=60)
+
+        cache.set(test_key, test_value, ttl=0)
+
+        assert cache.get(test_key) is None
+        assert cache.stats().expirations == 1
+        assert not cache
+
+    def test_lru_eviction(self):
+        """Тестирует вытеснение давно не использованной записи."""
+        cache: TTLCache[int] = TTLCache(max_size=2, ttl=60)
+        cache.set('first', 1)
+        cache.set('second', 2)
+        cache.get('first')
+
+        cache.set('third', 3)
+
+        assert cache.get('second') is None
+        assert cache.get('first') == 1
+        assert cache.stats().evictions == 1
+
+    def test_disabled_cache(self):
+        """Тестирует кэш нулевого размера."""
+        cache: TTLCache[str] = TTLCache(max_size=0, ttl=60)
+
+        cache.set(test_key, test_value)
+
+        assert cache.get(test_key) is None
+        assert cache.stats().hit_ratio == 0
+
+    def test_pop_and_clear(self):
+        """Тестирует удаление записей и сброс статистики."""
+        cache: TTLCache[str] = TTLCache(max_size=2, ttl=60)
+        cache.set(test_key, test_value)
+        cache.get(test_key)
+
+        cache.pop(test_key)
+        assert cache.get(test_key) is None
+        cache.clear()
+
+        assert cache.stats().hits == 0
+
+
+class TestReportCache:
+    """Тестирует кэш отчетов о транзакциях."""
+
+    @pytest.mark.parametrize(
+        'end_date, expected_ttl',
+        (
+            pytest.param(
+                history_end, historical_ttl, id='historical window',
+            ),
+            pytest.param(
+                datetime.now() + timedelta(days=1), live_ttl, id='live window',
+            ),
+            pytest.param(
+                datetime.now(UTC) - timedelta(seconds=1),
+                live_ttl,
+                id='aware window reaching now',
+            ),
+        ),
+    )
+    def test_ttl(self, end_date, expected_ttl):
+        """Тестирует время жизни отчета в зависимости от периода."""
+        cache = ReportCache(report_settings)
+
+        assert cache._ttl(end_date) == expected_ttl
+
+    def test_remember_and_lookup(self):
+        """Тестирует сохранение и получение отчета."""
+        cache = ReportCache(report_settings)
+        report = make_report(history_request)
+
+        cache.remember(history_request, report, version=0)
+
+        assert cache.lookup(history_request) is report
+
+    def test_large_report_not_cached(self):
+        """Тестирует пропуск слишком больших отчетов."""
+        cache = ReportCache(report_settings)
+
+        cache.remember(
+            history_request,
+            make_report(history_request, rows_count=3),
+            cache.version(username),
+        )
+
+        assert cache.lookup(history_request) is None
+
+    @pytest.mark.parametrize(
+        'writer, is_skipped',
+        (
+            pytest.param(username, removed, id='same user'),
+            pytest.param('other', kept, id='other user'),
+        ),
+    )
+    def test_outdated_report(self, writer, is_skipped):
+        """Тестирует пропуск отчета, запрошенного до новой транзакции."""
+        cache = ReportCache(report_settings)
+        version = cache.version(username)
+
+        cache.invalidate(writer, transaction.timestamp)
+        cache.remember(history_request, make_report(history_request), version)
+
+        is_cached = cache.lookup(history_request) is not None
+        assert is_cached is not is_skipped
+
+    @pytest.mark.parametrize(
+        'invalidated_username, timestamp, is_removed',
+        (
+            pytest.param(
+                username, transaction.timestamp, removed, id='inside window',
+            ),
+            pytest.param(
+                username,
+                history_end + timedelta(days=1),
+                kept,
+                id='outside window',
+            ),
+            pytest.param(
+                'other', transaction.timestamp, kept, id='other user',
+            ),
+            pytest.param(
+                username,
+                datetime.now(UTC),
+                removed,
+                id='incomparable timestamps',
+            ),
+        ),
+    )
+    def test_invalidate(self, invalidated_username, timestamp, is_removed):
+        """Тестирует удаление отчетов, затронутых новой транзакцией."""
+        cache = ReportCache(report_settings)
+        cache.remember(
+            history_request,
+            make_report(history_request),
+            cache.version(username),
+        )
+
+        cache.invalidate(invalidated_username, timestamp)
+
+        is_cached = cache.lookup(history_request) is not None
+        assert is_cached is not is_removed
+        assert bool(cache._user_keys) is not is_removed
+        assert cache.stats().invalidations == 1
+
+    def test_user_index(self):
+        """Тестирует удаление ключей из индекса вместе с отчетами."""
+        cache = ReportCache(report_settings.model_copy(update={'max_size': 1}))
+        other_request = history_request.model_copy(update={'username': 'other'})
+
+        for report_request in (history_request, other_request):
+            cache.remember(
+                report_request,
+                make_report(report_request),
+                cache.version(report_request.username),
+            )
+
+        assert cache._user_keys == {'other': {report_key(other_request)}}
+        cache.clear()
+        assert not cache._user_keys
+
+    def test_disabled(self):
+        """Тестирует отключенный кэш отчетов."""
+        cache = ReportCache(ReportCacheSettings(enabled=False))
+
+        cache.remember(
+            history_request,
+            make_report(history_request),
+            cache.version(username),
+        )
+
+        assert cache.lookup(history_request) is None
+        assert not cache._user_keys
+
+
+class TestTransactionClientReportCache:
+    """Тестирует кэширование отчетов клиентом сервиса транзакций."""
+
+    @pytest.mark.asyncio
+    async def test_report_cached_and_invalidated(self):
+        """Тестирует кэширование отчета и его сброс новой транзакцией."""
+        client = AsyncMock()
+        response = MagicMock()
+        response.status_code = status.HTTP_200_OK
+        response.content = pydantic_core.to_json({
+            'transactions': [transaction.model_dump()],
+        })
+        client.post.return_value = response
+        service_client = TransactionServiceClient(
+            client, reports=ReportSettings(cache=report_settings),
+        )
+
+        first_report = await service_client.get_report(history_request)
+        second_report = await service_client.get_report(history_request)
+        await service_client.create_transaction(transaction)
+        await service_client.get_report(history_request)
+
+        assert first_report is second_report
+        assert client.post.await_count == 3
+
+
+def test_hash_token():
+    """Тестирует хэширование токена."""
+    token = 'Bearer token'  # noqa: S105 test data
+
+    assert hash_token(token) == hash_token(token)
+    assert hash_token(token) != hash_token('Bearer other')
+    assert token.encode() not in hash_token(token)
+
+
+def test_clients_cache_stats():
+    """Тестирует статистику кэшей клиентов внешних сервисов."""
+    stats = cache_stats()
+
+    assert stats['token'].max_size > 0
+    assert stats['report'].max_size > 0
@@ -1,8 +1,11 @@
+import asyncio
 from datetime import datetime
 from enum import StrEnum
+from unittest.mock import MagicMock
 
 import pytest
 from fastapi import HTTPException, status
+from pydantic import ValidationError
 
 from app.api.models import (
     Report,
@@ -12,11 +15,11 @@ from app.api.models import (
     TransactionType,
     UserCredentials,
 )
-from app.external.clients import (
-    AuthServiceClient,
-    TransactionServiceClient,
-    good_response,
-)
+from app.external.auth import AuthServiceClient
+from app.external.service_client import good_response
+from app.external.tokens import TokenDecision
+from app.external.transactions import TransactionServiceClient
+from config.config import TokenCacheSettings
 
 
 class Keys(StrEnum):
@@ -214,6 +217,89 @@ class TestCheckToken:
 
         await auth_client.check_token(headers[Keys.authorization])
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'status_code, expected_calls',
+        (
+            pytest.param(
+                status.HTTP_200_OK, 1, id='valid token is cached',
+            ),
+            pytest.param(
+                status.HTTP_401_UNAUTHORIZED, 1, id='invalid token is cached',
+            ),
+            pytest.param(
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                2,
+                id='server error is not cached',
+            ),
+        ),
+    )
+    async def test_cached_result(self, status_code, expected_calls, client):
+        """Тестирует кэширование результата проверки токена."""
+        client = client(status_code=status_code)
+        auth_client = AuthServiceClient(client)
+
+        for _ in range(2):
+            try:
+                await auth_client.check_token(test_headers[Keys.authorization])
+            except HTTPException as error:
+                assert error.status_code == status_code
+
+        assert client.post.await_count == expected_calls
+
+    @pytest.mark.asyncio
+    async def test_concurrent_checks_merged(self, client):
+        """Тестирует объединение одновременных проверок одного токена."""
+        client = client(status_code=status.HTTP_200_OK)
+        auth_client = AuthServiceClient(
+            client, TokenCacheSettings(enabled=False),
+        )
+
+        await asyncio.gather(*(
+            auth_client.check_token(test_headers[Keys.authorization])
+            for _ in range(3)
+        ))
+
+        assert client.post.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_disabled(self, client):
+        """Тестирует проверку токена с выключенным кэшем."""
+        client = client(status_code=status.HTTP_200_OK)
+        auth_client = AuthServiceClient(
+            client, TokenCacheSettings(enabled=False),
+        )
+
+        await auth_client.check_token(test_headers[Keys.authorization])
+        await auth_client.check_token(test_headers[Keys.authorization])
+
+        assert client.post.await_count == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'decision, expected_calls',
+        (
+            pytest.param(TokenDecision.valid, 0, id='valid locally'),
+            pytest.param(
+                TokenDecision.invalid,
+                0,
+                id='invalid locally',
+                marks=pytest.mark.xfail(raises=HTTPException),
+            ),
+            pytest.param(TokenDecision.undecided, 1, id='undecided locally'),
+        ),
+    )
+    async def test_local_verification(self, decision, expected_calls, client):
+        """Тестирует локальную проверку токена."""
+        client = client(status_code=status.HTTP_200_OK)
+        token_verifier = MagicMock()
+        token_verifier.verify.return_value = decision
+        auth_client = AuthServiceClient(client, token_verifier=token_verifier)
+
+        await auth_client.check_token(test_headers[Keys.authorization])
+
+        assert client.post.await_count == expected_calls
+
 
 class TestGetReport:
     """Тестирует метод get_report."""
@@ -246,6 +332,10 @@ class TestGetReport:
         'end_date': end_date,
         'transactions': None,
     }
+    invalid_transaction_row = {
+        **expected_response,
+        'transactions': [test_transaction, {'username': username}],
+    }
 
     @pytest.mark.asyncio
     @pytest.mark.parametrize(
@@ -268,6 +358,15 @@ class TestGetReport:
                 id='response 200 invalid transactions',
                 marks=pytest.mark.xfail(raises=ValueError),
             ),
+            pytest.param(
+                test_request,
+                {
+                    Keys.json: invalid_transaction_row,
+                    Keys.status_code: status.HTTP_200_OK,
+                },
+                id='response 200 invalid transaction row',
+                marks=pytest.mark.xfail(raises=ValidationError),
+            ),
             pytest.param(
                 test_request,
                 {
@@ -292,6 +391,10 @@ class TestGetReport:
         assert len(report.transactions) == len(
             expected[Keys.json]['transactions'],
         )
+        assert all(
+            isinstance(transaction, Transaction)
+            for transaction in report.transactions
+        )
 
 
 class TestCreateTransaction:
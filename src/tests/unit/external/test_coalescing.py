@@ -0,0 +1,112 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import status
+
+from app.external.coalescing import SingleFlight
+from app.external.stats import flight_stats
+from app.external.transactions import TransactionServiceClient
+
+callers_count = 5
+delay = 0.01
+
+
+class TestSingleFlight:
+    """Тестирует объединение одинаковых запросов."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_merged(self):
+        """Тестирует объединение одновременных вызовов с одним ключом."""
+        flights = SingleFlight()
+        executions = []
+
+        async def fetch():  # noqa: WPS430 test function
+            executions.append(1)
+            await asyncio.sleep(delay)
+            return 'result'
+
+        responses = await asyncio.gather(*(
+            flights.run('fetch', 'key', fetch) for _ in range(callers_count)
+        ))
+
+        assert responses == ['result' for _ in range(callers_count)]
+        assert len(executions) == 1
+        stats = flights.stats()['fetch']
+        assert (stats.calls, stats.executions) == (callers_count, 1)
+        assert stats.merge_ratio > 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_not_merged(self):
+        """Тестирует вызовы с разными ключами."""
+        flights = SingleFlight()
+
+        async def fetch():  # noqa: WPS430 test function
+            await asyncio.sleep(0)
+            return 'result'
+
+        await asyncio.gather(
+            flights.run('fetch', 'first', fetch),
+            flights.run('fetch', 'second', fetch),
+        )
+
+        assert flights.stats()['fetch'].merged == 0
+        assert flights.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_error_shared(self):
+        """Тестирует передачу ошибки всем ожидающим."""
+        flights = SingleFlight()
+
+        async def fail():  # noqa: WPS430 test function
+            await asyncio.sleep(delay)
+            raise ValueError('upstream error')
+
+        responses = await asyncio.gather(
+            flights.run('fail', 'key', fail),
+            flights.run('fail', 'key', fail),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(error, ValueError) for error in responses)
+        assert flights.stats()['fail'].executions == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller(self):
+        """Тестирует отмену одного из ожидающих."""
+        flights = SingleFlight()
+
+        async def fetch():  # noqa: WPS430 test function
+            await asyncio.sleep(delay)
+            return 'result'
+
+        first = asyncio.create_task(flights.run('fetch', 'key', fetch))
+        second = asyncio.create_task(flights.run('fetch', 'key', fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == 'result'
+        assert first.cancelled()
+
+    def test_empty_stats(self):
+        """Тестирует статистику без вызовов."""
+        assert not SingleFlight().stats()
+
+
+@pytest.mark.asyncio
+async def test_ready_probes_merged():
+    """Тестирует объединение одновременных проверок готовности."""
+    client = AsyncMock()
+    client.get.return_value = MagicMock(status_code=status.HTTP_200_OK)
+    service_client = TransactionServiceClient(client)
+
+    await asyncio.gather(*(
+        service_client.is_ready() for _ in range(callers_count)
+    ))
+
+    assert client.get.await_count == 1
+
+
+def test_clients_flight_stats():
+    """Тестирует статистику объединения запросов клиентов."""
+    assert set(flight_stats()) == {'authentication', 'transaction'}
@@ -0,0 +1,202 @@
+import asyncio
+from collections.abc import Awaitable
+
+import pytest
+from fastapi import HTTPException
+
+from app.external.idempotency import IdempotencyStore
+from app.system import errors
+from config.config import IdempotencySettings
+
+test_key = 'george key-1'
+fingerprint = b'transaction'
+
+
+class Upstream:
+    """Внешний сервис, считающий запросы."""
+
+    def __init__(self, error: Exception | None = None) -> None:
+        """Метод инициализации."""
+        self.calls = 0
+        self.error = error
+        self.release = asyncio.Event()
+
+    async def create(self) -> dict[str, str]:
+        """Создает транзакцию после разрешения ответа."""
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return {'message': str(self.calls)}
+
+
+def submit(
+    store: IdempotencyStore[dict[str, str]], upstream: Upstream,
+) -> Awaitable[dict[str, str]]:
+    """Выполняет запрос с тестовым ключом."""
+    return store.run(test_key, fingerprint, upstream.create)
+
+
+async def failure(
+    store: IdempotencyStore[dict[str, str]], upstream: Upstream,
+) -> HTTPException:
+    """Возвращает ошибку запроса с тестовым ключом."""
+    try:
+        await submit(store, upstream)
+    except HTTPException as error:
+        return error
+    raise AssertionError('request did not fail')
+
+
+def make_store(**overrides) -> IdempotencyStore[dict[str, str]]:
+    """Создает хранилище результатов."""
+    return IdempotencyStore(IdempotencySettings(**overrides))
+
+
+class TestIdempotencyStore:
+    """Тестирует хранилище результатов запросов с ключом идемпотентности."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates(self):
+        """Тестирует ожидание одновременными запросами первого запроса."""
+        store = make_store()
+        upstream = Upstream()
+        pending = [
+            asyncio.ensure_future(submit(store, upstream)) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        upstream.release.set()
+
+        responses = await asyncio.gather(*pending)
+
+        assert responses == [{'message': '1'}] * 3  # noqa: WPS435 expected
+        assert upstream.calls == 1
+        assert not store.in_flight()
+
+    @pytest.mark.asyncio
+    async def test_replay(self):
+        """Тестирует повтор сохраненного ответа."""
+        store = make_store()
+        upstream = Upstream()
+        upstream.release.set()
+
+        first, second = [await submit(store, upstream) for _ in range(2)]
+
+        assert first == second
+        assert upstream.calls == 1
+        assert store.stats().hits == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'error, expected_calls',
+        (
+            pytest.param(errors.NotFoundError(), 1, id='client error replayed'),
+            pytest.param(errors.ServerError(), 2, id='server error retried'),
+            pytest.param(errors.UnknownOutcomeError(), 1, id='unknown outcome'),
+            pytest.param(errors.UpstreamTimeoutError(), 1, id='sent timeout'),
+            pytest.param(errors.GatewayTimeoutError(), 2, id='unsent timeout'),
+        ),
+    )
+    async def test_error(self, error, expected_calls):
+        """Тестирует сохранение ошибок клиента и повтор ошибок сервиса."""
+        store = make_store()
+        upstream = Upstream(error)
+        upstream.release.set()
+
+        failures = [await failure(store, upstream) for _ in range(2)]
+
+        assert [failed.status_code for failed in failures] == [
+            error.status_code, error.status_code,
+        ]
+        assert upstream.calls == expected_calls
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'error, expected_detail',
+        (
+            pytest.param(
+                errors.TooManyRequestsError(retry_after=5),
+                errors.TooManyRequestsError().detail,
+                id='client error',
+            ),
+            pytest.param(
+                errors.UpstreamTimeoutError(),
+                errors.UnknownOutcomeError().detail,
+                id='unknown outcome',
+            ),
+        ),
+    )
+    async def test_replayed_error(self, error, expected_detail):
+        """Тестирует создание новой ошибки при повторе ответа."""
+        store = make_store()
+        upstream = Upstream(error)
+        upstream.release.set()
+        _, replayed = [await failure(store, upstream) for _ in range(2)]
+
+        assert replayed is not error
+        assert replayed.detail == expected_detail
+        assert replayed.headers == getattr(error, 'headers', None)
+
+    @pytest.mark.asyncio
+    async def test_other_request(self):
+        """Тестирует отказ в запросе с тем же ключом и другим телом."""
+        store = make_store()
+        upstream = Upstream()
+        first = asyncio.ensure_future(submit(store, upstream))
+        await asyncio.sleep(0)
+
+        with pytest.raises(errors.UnprocessableError):
+            await store.run(test_key, b'other', upstream.create)
+        upstream.release.set()
+        await first
+        with pytest.raises(errors.UnprocessableError):
+            await store.run(test_key, b'other', upstream.create)
+
+        assert upstream.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter(self):
+        """Тестирует завершение запроса после отмены его ожидания."""
+        store = make_store()
+        upstream = Upstream()
+        first = asyncio.ensure_future(submit(store, upstream))
+        await asyncio.sleep(0)
+        first.cancel()
+        upstream.release.set()
+
+        response = await submit(store, upstream)
+
+        assert response == {'message': '1'}
+        assert upstream.calls == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'overrides',
+        (
+            pytest.param({'enabled': False}, id='disabled'),
+            pytest.param({'ttl': 0}, id='expired'),
+        ),
+    )
+    async def test_not_stored(self, overrides):
+        """Тестирует повторное выполнение без сохраненного результата."""
+        store = make_store(**overrides)
+        upstream = Upstream()
+        upstream.release.set()
+
+        for _ in range(2):
+            await submit(store, upstream)
+
+        assert upstream.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_unknown_outcome_expired():
+    """Тестирует повтор запроса после хранения неизвестного результата."""
+    store = make_store(unknown_ttl=0)
+    upstream = Upstream(errors.UnknownOutcomeError())
+    upstream.release.set()
+
+    for _ in range(2):
+        await failure(store, upstream)
+
+    assert upstream.calls == 2
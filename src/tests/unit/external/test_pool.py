@@ -0,0 +1,110 @@
+import httpx
+import pytest
+from fastapi import status
+
+from app.external.clients import close_clients, start_clients
+from app.external.pool import Client, PoolClosedError
+from app.external.stats import pool_stats
+from config.config import PoolSettings
+
+base_url = 'http://test-service'
+test_pool = PoolSettings(max_connections=4)
+
+
+def make_transport(status_code: int) -> httpx.MockTransport:
+    """Создает транспорт возвращающий заданный код ответа."""
+    return httpx.MockTransport(
+        lambda request: httpx.Response(status_code),
+    )
+
+
+class TestClient:
+    """Тестирует клиент с пулом соединений."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'method',
+        (
+            pytest.param('get', id='GET'),
+            pytest.param('post', id='POST'),
+        ),
+    )
+    async def test_request(self, method):
+        """Тестирует запрос через пул соединений."""
+        client = Client(
+            name='test',
+            base_url=base_url,
+            pool=test_pool,
+            transport=make_transport(status.HTTP_200_OK),
+        )
+        await client.start()
+
+        response = await getattr(client, method)('/healthz/ready')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.request.url == f'{base_url}/healthz/ready'
+        stats = client.stats()
+        assert (stats.requests_total, stats.in_flight) == (1, 0)
+        assert stats.max_in_flight == 1
+        assert stats.is_open
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_in_flight_released_on_error(self):
+        """Тестирует освобождение счетчика запросов при ошибке."""
+        def raise_error(request):  # noqa: WPS430 test transport
+            raise httpx.ConnectError('connection refused')
+
+        client = Client(transport=httpx.MockTransport(raise_error))
+        await client.start()
+
+        with pytest.raises(httpx.ConnectError):
+            await client.get('/healthz/ready')
+
+        assert client.stats().in_flight == 0
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_start_and_close(self):
+        """Тестирует создание и закрытие пула соединений."""
+        client = Client(pool=test_pool)
+
+        assert not client.stats().is_open
+        await client.start()
+        assert client.stats().is_open
+        await client.close()
+        assert not client.stats().is_open
+
+    @pytest.mark.asyncio
+    async def test_closed(self):
+        """Тестирует отказ в запросе до создания и после закрытия пула."""
+        client = Client(transport=make_transport(status.HTTP_200_OK))
+        with pytest.raises(PoolClosedError):
+            await client.get('/healthz/ready')
+
+        await client.start()
+        await client.close()
+
+        with pytest.raises(PoolClosedError):
+            await client.post('/healthz/ready')
+        assert client.stats().requests_total == 0
+
+    def test_occupancy(self):
+        """Тестирует расчет занятости пула."""
+        client = Client(pool=test_pool)
+        client.in_flight = 2
+
+        assert client.stats().occupancy == pytest.approx(0.5)
+
+
+class TestClientsLifecycle:
+    """Тестирует жизненный цикл пулов клиентов внешних сервисов."""
+
+    @pytest.mark.asyncio
+    async def test_start_and_close_clients(self):
+        """Тестирует создание и закрытие пулов всех клиентов."""
+        await start_clients()
+        assert all(stats.is_open for stats in pool_stats())
+
+        await close_clients()
+        assert not any(stats.is_open for stats in pool_stats())
@@ -0,0 +1,139 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from fastapi import status
+
+from app.external.auth import AuthServiceClient
+from app.external.pool import Client
+from app.external.readiness import ReadinessChecker, stale_error
+from app.external.transactions import TransactionServiceClient
+from config.config import ReadinessSettings
+
+test_readiness = ReadinessSettings(interval=100, timeout=0.5)
+upstream_latency = 0.05
+
+
+async def make_checker(
+    status_codes: dict[str, int], calls: list[str],
+) -> ReadinessChecker:
+    """Создает проверку сервисов с кодами ответа по хосту."""
+    async def respond(request: httpx.Request) -> httpx.Response:  # noqa: WPS430, E501 for tests
+        calls.append(request.url.host)
+        await asyncio.sleep(upstream_latency)
+        return httpx.Response(status_codes[request.url.host])
+
+    transport = httpx.MockTransport(respond)
+    checker = ReadinessChecker(
+        test_readiness,
+        [
+            AuthServiceClient(
+                Client(base_url='http://auth', transport=transport),
+            ),
+            TransactionServiceClient(
+                Client(base_url='http://transactions', transport=transport),
+            ),
+        ],
+    )
+    for service_client in checker.service_clients:
+        await service_client.client.start()
+    return checker
+
+
+class TestReadinessChecker:
+    """Тестирует фоновую проверку готовности внешних сервисов."""
+
+    @pytest.mark.asyncio
+    async def test_check(self):
+        """Тестирует одновременную проверку всех сервисов."""
+        checker = await make_checker(
+            {
+                'auth': status.HTTP_200_OK,
+                'transactions': status.HTTP_503_SERVICE_UNAVAILABLE,
+            },
+            [],
+        )
+
+        started_at = time.monotonic()
+        auth, transactions = await checker.check()
+        elapsed = time.monotonic() - started_at
+
+        assert elapsed < upstream_latency * 2
+        assert auth.is_ready
+        assert auth.latency >= upstream_latency
+        assert not transactions.is_ready
+        assert transactions.error
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        """Тестирует проверку дольше таймаута."""
+        checker = await make_checker(
+            {'auth': status.HTTP_200_OK, 'transactions': status.HTTP_200_OK},
+            [],
+        )
+        checker.settings = ReadinessSettings(timeout=0)
+
+        dependencies = await checker.check()
+
+        assert not any(dependency.is_ready for dependency in dependencies)
+        assert 'TimeoutError' in dependencies[0].error
+
+    @pytest.mark.asyncio
+    async def test_unexpected_error(self):
+        """Тестирует фоновую проверку после непредвиденной ошибки."""
+        checker = await make_checker(
+            {'auth': status.HTTP_200_OK, 'transactions': status.HTTP_200_OK},
+            [],
+        )
+        checker.service_clients[0].is_ready = AsyncMock(
+            side_effect=RuntimeError('probe'),
+        )
+
+        checker.start()
+        await asyncio.sleep(upstream_latency * 2)
+        auth, transactions = await checker.current()
+        is_running = not checker._task.done()
+        await checker.stop()
+
+        assert is_running
+        assert not auth.is_ready
+        assert 'RuntimeError' in auth.error
+        assert transactions.is_ready
+
+    @pytest.mark.asyncio
+    async def test_stale(self):
+        """Тестирует устаревание результатов проверки."""
+        checker = await make_checker(
+            {'auth': status.HTTP_200_OK, 'transactions': status.HTTP_200_OK},
+            [],
+        )
+        await checker.check()
+        checker.dependencies['authentication'].checked_at = 0
+
+        auth, transactions = checker.statuses()
+
+        assert not auth.is_ready
+        assert auth.error == stale_error
+        assert transactions.is_ready
+
+    @pytest.mark.asyncio
+    async def test_background(self):
+        """Тестирует ответ по сохраненным результатам фоновой проверки."""
+        calls: list[str] = []
+        checker = await make_checker(
+            {'auth': status.HTTP_200_OK, 'transactions': status.HTTP_200_OK},
+            calls,
+        )
+
+        await checker.current()
+        assert len(calls) == 2
+
+        checker.start()
+        await asyncio.sleep(upstream_latency * 2)
+        dependencies, _ = [await checker.current() for _ in range(2)]
+        await checker.stop()
+
+        assert all(dependency.is_ready for dependency in dependencies)
+        assert len(calls) == 4
@@ -0,0 +1,247 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import status
+
+from app.external.pool import Client
+from app.external.retry import LatencyWindow, RetryBudget, RetryPolicy
+from app.external.stats import retry_stats
+from app.external.transactions import TransactionServiceClient
+from app.system import deadline
+from app.system.errors import CircuitOpenError, ServerError
+from config.config import RetrySettings
+
+test_settings = RetrySettings(max_attempts=3, base_backoff=0, max_backoff=0)
+hedge_settings = test_settings.model_copy(
+    update={'hedging': True, 'hedge_min_samples': 1, 'hedge_min_delay': 0},
+)
+slow = 1
+fast_latency = 0.01
+window_size = 100
+quantile = 0.95
+
+
+def make_send(*outcomes):
+    """Создает функцию запроса, возвращающую результаты по очереди."""
+    calls = iter(outcomes)
+
+    async def send():  # noqa: WPS430 test send
+        delay, outcome = next(calls)
+        await asyncio.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome)
+    return send
+
+
+class TestRetryPolicy:
+    """Тестирует политику повторов запросов."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'outcomes, expected_status, expected_retries',
+        (
+            pytest.param(
+                [(0, status.HTTP_200_OK)],
+                status.HTTP_200_OK,
+                0,
+                id='success',
+            ),
+            pytest.param(
+                [(0, ServerError()), (0, status.HTTP_200_OK)],
+                status.HTTP_200_OK,
+                1,
+                id='connection error',
+            ),
+            pytest.param(
+                [(0, status.HTTP_502_BAD_GATEWAY), (0, status.HTTP_200_OK)],
+                status.HTTP_200_OK,
+                1,
+                id='retryable status',
+            ),
+            pytest.param(
+                [(0, status.HTTP_503_SERVICE_UNAVAILABLE)] * 3,  # noqa: WPS435, E501 immutable items
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                2,
+                id='attempts exhausted',
+            ),
+            pytest.param(
+                [(0, status.HTTP_404_NOT_FOUND)],
+                status.HTTP_404_NOT_FOUND,
+                0,
+                id='not retryable status',
+            ),
+        ),
+    )
+    async def test_retry(self, outcomes, expected_status, expected_retries):
+        """Тестирует повтор запроса."""
+        policy = RetryPolicy('test', test_settings)
+
+        resp = await policy.run(make_send(*outcomes))
+
+        assert resp.status_code == expected_status
+        assert policy.stats().retries == expected_retries
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'error',
+        (
+            pytest.param(CircuitOpenError(), id='circuit open'),
+            pytest.param(ServerError(), id='all attempts failed'),
+        ),
+    )
+    async def test_error(self, error):
+        """Тестирует ошибку после повторов."""
+        policy = RetryPolicy('test', test_settings)
+
+        with pytest.raises(type(error)):
+            await policy.run(make_send(*[(0, error)] * 3))  # noqa: WPS435, E501 immutable items
+
+    @pytest.mark.asyncio
+    async def test_budget_exhausted(self):
+        """Тестирует отказ от повтора при исчерпании бюджета."""
+        policy = RetryPolicy(
+            'test', test_settings.model_copy(update={'budget_max_tokens': 0}),
+        )
+
+        with pytest.raises(ServerError):
+            await policy.run(make_send((0, ServerError())))
+
+        stats = policy.stats()
+        assert (stats.retries, stats.budget_exhausted) == (0, 1)
+
+    @pytest.mark.asyncio
+    async def test_deadline(self):
+        """Тестирует отказ от повтора после истечения срока."""
+        policy = RetryPolicy('test', test_settings)
+        token = deadline.current_deadline.set(time.monotonic() - slow)
+
+        with pytest.raises(ServerError):
+            await policy.run(make_send((0, ServerError())))
+
+        deadline.current_deadline.reset(token)
+        assert policy.stats().retries == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'outcomes, expected_hedge_wins',
+        (
+            pytest.param(
+                [(slow, status.HTTP_200_OK), (0, status.HTTP_200_OK)],
+                1,
+                id='hedge wins',
+            ),
+            pytest.param(
+                [(fast_latency, ServerError()), (0.1, status.HTTP_200_OK)],
+                1,
+                id='primary fails',
+            ),
+            pytest.param(
+                [(fast_latency, status.HTTP_200_OK), (slow, ServerError())],
+                0,
+                id='primary wins',
+            ),
+        ),
+    )
+    async def test_hedging(self, outcomes, expected_hedge_wins):
+        """Тестирует дублирование медленного запроса."""
+        policy = RetryPolicy('test', hedge_settings)
+        policy.latencies.record(0)
+
+        resp = await policy.run(make_send(*outcomes))
+
+        assert resp.status_code == status.HTTP_200_OK
+        stats = policy.stats()
+        assert (stats.hedges, stats.hedge_wins) == (1, expected_hedge_wins)
+        assert stats.retries == 0
+
+    @pytest.mark.asyncio
+    async def test_hedging_not_warmed_up(self):
+        """Тестирует отсутствие дублирования без истории запросов."""
+        policy = RetryPolicy('test', hedge_settings)
+
+        await policy.run(make_send((fast_latency, status.HTTP_200_OK)))
+
+        assert policy.stats().hedges == 0
+        assert len(policy.latencies) == 1
+
+    def test_reset(self):
+        """Тестирует сброс состояния политики."""
+        policy = RetryPolicy('test', test_settings)
+        policy.counters.retries = 1
+        policy.budget.tokens = 0
+
+        policy.reset()
+
+        stats = policy.stats()
+        assert stats.retries == 0
+        assert stats.budget_tokens == test_settings.budget_max_tokens
+
+
+class TestRetryBudget:
+    """Тестирует бюджет повторов."""
+
+    def test_withdraw_and_deposit(self):
+        """Тестирует списание и пополнение бюджета."""
+        budget = RetryBudget(ratio=0.5, max_tokens=1)
+
+        assert budget.withdraw()
+        assert not budget.withdraw()
+        budget.deposit()
+        budget.deposit()
+        budget.deposit()
+        assert budget.tokens == 1
+
+
+class TestLatencyWindow:
+    """Тестирует окно длительностей запросов."""
+
+    def test_percentile(self):
+        """Тестирует расчет перцентиля."""
+        window = LatencyWindow(size=window_size)
+        for latency in range(window_size * 2):
+            window.record(latency)
+
+        assert len(window) == window_size
+        expected = window_size + int(quantile * (window_size - 1))
+        assert window.percentile(quantile) == expected
+
+
+class TestClientRetries:
+    """Тестирует повторы запросов клиента внешнего сервиса."""
+
+    @pytest.mark.asyncio
+    async def test_is_ready_retried(self):
+        """Тестирует повтор проверки готовности сервиса."""
+        responses = iter(
+            [status.HTTP_503_SERVICE_UNAVAILABLE, status.HTTP_200_OK],
+        )
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(next(responses)),
+        )
+        service_client = TransactionServiceClient(
+            Client(base_url='http://test-service', transport=transport),
+            retries={'is_ready': test_settings},
+        )
+        await service_client.client.start()
+
+        await service_client.is_ready()
+
+        assert service_client.retries['is_ready'].stats().retries == 1
+
+    def test_disabled_policy(self):
+        """Тестирует отключение повторов метода."""
+        service_client = TransactionServiceClient(
+            Client(),
+            retries={'is_ready': RetrySettings(enabled=False)},
+        )
+
+        assert not service_client.retries
+
+    def test_retry_stats(self):
+        """Тестирует статистику повторов клиентов."""
+        assert {stats.name for stats in retry_stats()} >= {
+            'authentication.check_token', 'transaction.get_report',
+        }
@@ -0,0 +1,191 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from unittest.mock import AsyncMock, MagicMock
+
+import pydantic_core
+import pytest
+from fastapi import status
+from pydantic import ValidationError
+
+from app.api.models import Report, ReportRequest, Transaction
+from app.external.sharding import (
+    gather_bounded,
+    merge_reports,
+    shard_gap,
+    split_report_request,
+)
+from app.external.transactions import TransactionServiceClient
+from app.system.errors import ServerError
+from config.config import ReportSettings, ReportShardingSettings
+
+shard_days = 10
+sharding_settings = ReportShardingSettings(
+    enabled=True, shard_days=shard_days, max_concurrency=2,
+)
+year_request = ReportRequest(
+    username='max',
+    start_date=datetime(year=2024, month=1, day=1),  # noqa: WPS432 test value
+    end_date=datetime(year=2024, month=12, day=31),  # noqa: WPS432 test value
+)
+
+
+def make_transaction(day: int) -> Transaction:
+    """Создает транзакцию за заданный день 2024 года."""
+    return Transaction(
+        username='max',
+        amount=1,
+        transaction_type=0,
+        timestamp=datetime(year=2024, month=1, day=1) + timedelta(days=day),  # noqa: WPS432, E501 test value
+    )
+
+
+class TestSplitReportRequest:
+    """Тестирует разбиение периода отчета."""
+
+    def test_disabled(self):
+        """Тестирует отчет без разбиения."""
+        shards = split_report_request(
+            year_request, ReportShardingSettings(enabled=False),
+        )
+
+        assert shards == [year_request]
+
+    @pytest.mark.parametrize(
+        'report_request',
+        (
+            pytest.param(year_request, id='naive dates'),
+            pytest.param(
+                year_request.model_copy(update={
+                    'start_date': year_request.start_date.replace(tzinfo=UTC),
+                    'end_date': year_request.end_date.replace(tzinfo=UTC),
+                }),
+                id='aware dates',
+            ),
+        ),
+    )
+    def test_shards_cover_window(self, report_request):
+        """Тестирует покрытие периода непересекающимися периодами."""
+        shards = split_report_request(report_request, sharding_settings)
+
+        assert shards[0].start_date == report_request.start_date
+        assert shards[-1].end_date == report_request.end_date
+        for previous, current in zip(shards, shards[1:]):
+            assert current.start_date - previous.end_date == shard_gap
+        assert all(
+            shard.end_date - shard.start_date < timedelta(days=shard_days)
+            for shard in shards
+        )
+
+    def test_aligned_shards(self):
+        """Тестирует совпадение внутренних периодов разных запросов."""
+        shifted_request = year_request.model_copy(
+            update={'start_date': year_request.start_date + timedelta(days=3)},
+        )
+
+        shards = split_report_request(year_request, sharding_settings)
+        shifted_shards = split_report_request(
+            shifted_request, sharding_settings,
+        )
+
+        assert shards[1:] == shifted_shards[1:]
+
+    def test_too_many_shards(self):
+        """Тестирует запрос слишком длинного периода одним запросом."""
+        narrow_settings = sharding_settings.model_copy(
+            update={'max_shards': 3},
+        )
+
+        shards = split_report_request(year_request, narrow_settings)
+
+        assert shards == [year_request]
+
+    @pytest.mark.parametrize(
+        'field_name', ('shard_days', 'max_concurrency', 'max_shards'),
+    )
+    def test_invalid_settings(self, field_name):
+        """Тестирует отказ в нулевых параметрах разбиения."""
+        with pytest.raises(ValidationError):
+            ReportShardingSettings(**{field_name: 0})
+
+
+class TestGatherBounded:
+    """Тестирует ограниченное параллельное выполнение."""
+
+    @pytest.mark.asyncio
+    async def test_limit_and_order(self):
+        """Тестирует ограничение параллельности и порядок результатов."""
+        running = []
+        tasks_count = len(asyncio.all_tasks())
+
+        async def call(index):  # noqa: WPS430 test call
+            running.append(index)
+            assert len(running) <= 2
+            assert len(asyncio.all_tasks()) <= tasks_count + 2
+            await asyncio.sleep(0)
+            running.remove(index)
+            return index
+
+        results_order = await gather_bounded(
+            [partial(call, index) for index in range(5)], limit=2,
+        )
+
+        assert results_order == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_error_cancels_pending(self):
+        """Тестирует отмену вызовов при ошибке одного из них."""
+        slow_call = partial(asyncio.sleep, 1)
+
+        async def failing():  # noqa: WPS430 test call
+            raise ServerError()
+
+        with pytest.raises(ServerError):
+            await gather_bounded([failing, slow_call], limit=2)
+
+
+def test_merge_reports():
+    """Тестирует объединение отчетов в порядке времени транзакций."""
+    reports = [
+        Report.model_construct(
+            request=year_request,
+            transactions=[make_transaction(3), make_transaction(1)],
+        ),
+        Report.model_construct(
+            request=year_request, transactions=[make_transaction(2)],
+        ),
+    ]
+
+    report = merge_reports(year_request, reports)
+
+    assert report.request == year_request
+    assert [row.timestamp.day for row in report.transactions] == [2, 3, 4]
+
+
+class TestShardedReport:
+    """Тестирует запрос отчета с разбиением на периоды."""
+
+    @pytest.mark.asyncio
+    async def test_get_report(self):
+        """Тестирует запрос и кэширование отчетов за периоды."""
+        client = AsyncMock()
+        response = MagicMock()
+        response.status_code = status.HTTP_200_OK
+        response.content = pydantic_core.to_json({
+            'transactions': [make_transaction(0).model_dump()],
+        })
+        client.post.return_value = response
+        service_client = TransactionServiceClient(
+            client, reports=ReportSettings(sharding=sharding_settings),
+        )
+        shards_count = len(
+            split_report_request(year_request, sharding_settings),
+        )
+
+        report = await service_client.get_report(year_request)
+        await service_client.get_report(year_request)
+
+        assert report.request == year_request
+        assert len(report.transactions) == shards_count
+        assert client.post.await_count == shards_count
+        assert len(service_client.report_cache) == shards_count
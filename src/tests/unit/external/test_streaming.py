@@ -0,0 +1,203 @@
+import json
+from contextlib import AsyncExitStack
+
+import httpx
+import pytest
+from fastapi import status
+
+from app.api.models import ReportFormat, ReportRequest
+from app.external.pool import Client
+from app.external.streaming import JsonArrayParser, ReportStream, open_stream
+from app.external.transactions import TransactionServiceClient
+from app.system.errors import NotFoundError
+from config.config import ReportSettings, ReportStreamSettings
+
+base_url = 'http://test-service'
+row_size = 1024
+test_settings = ReportStreamSettings(chunk_size=2, max_row_size=row_size)
+stub_transaction = {
+    'username': 'max',
+    'amount': 1,
+    'transaction_type': 0,
+    'timestamp': '2024-01-15T00:00:00',
+}
+report_request = ReportRequest(
+    username='max',
+    start_date='2024-01-01T00:00:00',
+    end_date='2024-01-30T00:00:00',
+)
+
+
+def make_body(rows_count: int) -> str:
+    """Создает тело ответа сервиса транзакций."""
+    return json.dumps({
+        'request': {'username': 'transactions'},
+        'transactions': [stub_transaction] * rows_count,  # noqa: WPS435, E501 immutable items
+    })
+
+
+async def make_client(status_code: int, body: str) -> Client:
+    """Создает клиент, возвращающий заданный ответ."""
+    client = Client(
+        base_url=base_url,
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(status_code, text=body),
+        ),
+    )
+    await client.start()
+    return client
+
+
+async def open_report(
+    client: Client, report_format: ReportFormat,
+) -> ReportStream:
+    """Открывает потоковый отчет через клиент."""
+    exit_stack = AsyncExitStack()
+    resp = await open_stream(client, exit_stack, '/create_report')
+    return ReportStream(resp, exit_stack, report_format, test_settings)
+
+
+class TestJsonArrayParser:
+    """Тестирует разбор JSON массива по частям."""
+
+    @pytest.mark.parametrize(
+        'part_size',
+        (
+            pytest.param(1, id='by one symbol'),
+            pytest.param(7, id='small parts'),
+            pytest.param(row_size, id='whole body'),
+        ),
+    )
+    def test_feed(self, part_size):
+        """Тестирует разбор тела ответа, разбитого на части."""
+        body = make_body(3)
+        parser = JsonArrayParser('transactions', row_size)
+
+        rows = []
+        for start in range(0, len(body), part_size):
+            rows.extend(parser.feed(body[start:start + part_size]))
+        parser.close()
+
+        assert rows == [stub_transaction] * 3  # noqa: WPS435 immutable items
+
+    def test_escaped_key(self):
+        """Тестирует пропуск ключа внутри строкового значения."""
+        parser = JsonArrayParser('transactions', row_size)
+
+        rows = parser.feed(r'{"name": "\"transactions\": [1]", "transactions": [{}]}')  # noqa: E501 test body
+
+        assert rows == [{}]
+
+    @pytest.mark.parametrize(
+        'body',
+        (
+            pytest.param('{"transactions": [{}', id='truncated array'),
+            pytest.param('{"transactions": null}', id='no array'),
+        ),
+    )
+    def test_incomplete(self, body):
+        """Тестирует ошибку при неполном массиве."""
+        parser = JsonArrayParser('transactions', row_size)
+        parser.feed(body)
+
+        with pytest.raises(ValueError):
+            parser.close()
+
+    def test_long_preamble(self):
+        """Тестирует разбор массива после длинного начала тела."""
+        parser = JsonArrayParser('transactions', row_size)
+        preamble = '{{"name": "{0}", '.format('"transactions"' * row_size)
+
+        rows = [parser.feed(symbol) for symbol in preamble]
+        rows.append(parser.feed('"transactions": [{}]}'))
+
+        assert rows[-1] == [{}]
+        assert not any(rows[:-1])
+
+    def test_preamble_too_large(self):
+        """Тестирует ошибку при слишком длинном начале тела до массива."""
+        parser = JsonArrayParser('transactions', row_size)
+        body = '{{"transactions": null, "name": "{0}"'.format('x' * row_size)
+
+        with pytest.raises(ValueError):
+            parser.feed(body)
+
+    def test_row_too_large(self):
+        """Тестирует ошибку при слишком большом элементе массива."""
+        parser = JsonArrayParser('transactions', max_item_size=4)
+
+        with pytest.raises(ValueError):
+            parser.feed('{"transactions": [{"username": "max"')
+
+
+class TestReportStream:
+    """Тестирует потоковую выдачу отчета."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'report_format, rows_count',
+        (
+            pytest.param(ReportFormat.ndjson, 3, id='ndjson'),
+            pytest.param(ReportFormat.json, 3, id='json'),
+            pytest.param(ReportFormat.json, 0, id='empty json'),
+        ),
+    )
+    async def test_encode(self, report_format, rows_count):
+        """Тестирует формат тела потокового ответа."""
+        client = await make_client(status.HTTP_200_OK, make_body(rows_count))
+        report = await open_report(client, report_format)
+
+        body = b''.join([part async for part in report.encode()])
+
+        if report_format is ReportFormat.ndjson:
+            rows = [json.loads(line) for line in body.splitlines()]
+        else:
+            rows = json.loads(body)
+        assert rows == [stub_transaction] * rows_count  # noqa: WPS435, E501 immutable items
+        assert client.stats().in_flight == 0
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_chunks(self):
+        """Тестирует разбиение транзакций на пачки."""
+        client = await make_client(status.HTTP_200_OK, make_body(5))
+        report = await open_report(client, ReportFormat.ndjson)
+
+        sizes = [len(chunk) async for chunk in report.chunks()]
+
+        assert sizes == [2, 2, 1]
+        await report.close()
+        await client.close()
+
+
+class TestStreamReport:
+    """Тестирует открытие потокового отчета клиентом сервиса транзакций."""
+
+    @pytest.mark.asyncio
+    async def test_stream_report(self):
+        """Тестирует открытие потокового отчета."""
+        service_client = TransactionServiceClient(
+            await make_client(status.HTTP_200_OK, make_body(1)),
+            reports=ReportSettings(stream=test_settings),
+        )
+
+        report = await service_client.stream_report(
+            report_request, ReportFormat.json,
+        )
+
+        assert report.media_type == 'application/json'
+        assert service_client.client.stats().in_flight == 1
+        await report.close()
+        assert service_client.client.stats().in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_bad_status_closes_response(self):
+        """Тестирует закрытие ответа при ошибке сервиса транзакций."""
+        service_client = TransactionServiceClient(
+            await make_client(status.HTTP_404_NOT_FOUND, ''),
+        )
+
+        with pytest.raises(NotFoundError):
+            await service_client.stream_report(report_request)
+
+        assert service_client.client.stats().in_flight == 0
@@ -0,0 +1,188 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+import pytest
+
+from app.external.tokens import LocalTokenVerifier, TokenDecision
+from config.config import ConfigError, LocalJwtSettings
+
+test_secret = 'test_secret'  # noqa: S105 test data
+hour = 3600
+
+
+def encode_segment(segment: dict | str) -> str:
+    """Кодирует сегмент токена."""
+    raw = segment if isinstance(segment, str) else json.dumps(segment)
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b'=').decode()
+
+
+def make_token(
+    payload: dict, secret: str = test_secret, algorithm: str = 'HS256',
+) -> str:
+    """Создает подписанный токен."""
+    signing_input = '.'.join((
+        encode_segment({'alg': algorithm, 'typ': 'JWT'}),
+        encode_segment(payload),
+    ))
+    signature = hmac.digest(
+        secret.encode(), signing_input.encode(), hashlib.sha256,
+    )
+    encoded_signature = base64.urlsafe_b64encode(signature).rstrip(b'=')
+    return f'{signing_input}.{encoded_signature.decode()}'
+
+
+def make_secrets_file(tmp_path, secrets_content: str) -> str:
+    """Создает файл секретов."""
+    secrets_file = tmp_path / 'secrets'
+    secrets_file.write_text(secrets_content)
+    return str(secrets_file)
+
+
+class TestLocalTokenVerifier:
+    """Тестирует локальную проверку токенов."""
+
+    verifier = LocalTokenVerifier(test_secret, 'HS256')
+
+    @pytest.mark.parametrize(
+        'token, expected',
+        (
+            pytest.param(
+                make_token({'sub': 'george', 'exp': time.time() + hour}),
+                TokenDecision.valid,
+                id='valid token',
+            ),
+            pytest.param(
+                'Bearer {0}'.format(
+                    make_token({'sub': 'george', 'exp': time.time() + hour}),
+                ),
+                TokenDecision.valid,
+                id='valid bearer token',
+            ),
+            pytest.param(
+                make_token({'sub': 'george', 'exp': time.time() - hour}),
+                TokenDecision.invalid,
+                id='expired token',
+            ),
+            pytest.param(
+                make_token(
+                    {
+                        'sub': 'george',
+                        'exp': time.time() + hour,
+                        'nbf': time.time() + hour,
+                    },
+                ),
+                TokenDecision.invalid,
+                id='token not valid yet',
+            ),
+            pytest.param(
+                make_token(
+                    {'sub': 'george', 'exp': time.time() + hour},
+                    secret='other_secret',  # noqa: S106 test data
+                ),
+                TokenDecision.invalid,
+                id='invalid signature',
+            ),
+            pytest.param(
+                make_token({'sub': 'george'}),
+                TokenDecision.undecided,
+                id='token without exp',
+            ),
+            pytest.param(
+                make_token(
+                    {'sub': 'george', 'exp': time.time() + hour},
+                    algorithm='RS256',
+                ),
+                TokenDecision.undecided,
+                id='other algorithm',
+            ),
+            pytest.param(
+                'not.a.token',
+                TokenDecision.undecided,
+                id='invalid json',
+            ),
+            pytest.param(
+                '{0}.{1}.c2ln'.format(
+                    encode_segment('[]'), encode_segment('[]'),
+                ),
+                TokenDecision.undecided,
+                id='json segment is not an object',
+            ),
+            pytest.param(
+                'a.b.c.d',
+                TokenDecision.undecided,
+                id='wrong number of parts',
+            ),
+            pytest.param(
+                'a!.b.c',
+                TokenDecision.undecided,
+                id='invalid base64',
+            ),
+        ),
+    )
+    def test_verify(self, token, expected):
+        """Тестирует решения локальной проверки токена."""
+        assert self.verifier.verify(token) is expected
+
+    def test_unsupported_algorithm(self):
+        """Тестирует неподдерживаемый алгоритм."""
+        with pytest.raises(ConfigError):
+            LocalTokenVerifier(test_secret, 'RS256')
+
+    def test_from_file(self, tmp_path):
+        """Тестирует загрузку секрета из файла."""
+        secrets_path = make_secrets_file(
+            tmp_path,
+            f'SECRET_KEY={test_secret}\nTOKEN_ALGORITHM=HS256\n',
+        )
+        verifier = LocalTokenVerifier.from_file(secrets_path)
+        token = make_token({'exp': time.time() + hour})
+
+        assert verifier.verify(token) is TokenDecision.valid
+
+    @pytest.mark.parametrize(
+        'secrets_content',
+        (
+            pytest.param(None, id='file not found'),
+            pytest.param('TOKEN_ALGORITHM=HS256\n', id='no secret key'),
+        ),
+    )
+    def test_from_invalid_file(self, secrets_content, tmp_path):
+        """Тестирует ошибки загрузки секрета из файла."""
+        secrets_path = str(tmp_path / 'secrets')
+        if secrets_content is not None:
+            secrets_path = make_secrets_file(tmp_path, secrets_content)
+
+        with pytest.raises(ConfigError):
+            LocalTokenVerifier.from_file(secrets_path)
+
+
+class TestTokenVerifierFromSettings:
+    """Тестирует создание объекта локальной проверки токенов."""
+
+    def test_disabled(self):
+        """Тестирует выключенный режим локальной проверки."""
+        jwt_settings = LocalJwtSettings(enabled=False)
+
+        assert LocalTokenVerifier.from_settings(jwt_settings) is None
+
+    def test_secrets_path_from_env(self, tmp_path, monkeypatch):
+        """Тестирует путь к файлу секретов из переменной окружения."""
+        secrets_path = make_secrets_file(
+            tmp_path, f'SECRET_KEY={test_secret}',
+        )
+        monkeypatch.setenv('SECRETS_PATH', secrets_path)
+        jwt_settings = LocalJwtSettings(enabled=True)
+
+        verifier = LocalTokenVerifier.from_settings(jwt_settings)
+
+        assert isinstance(verifier, LocalTokenVerifier)
+
+    def test_no_secrets_path(self, monkeypatch):
+        """Тестирует отсутствие пути к файлу секретов."""
+        monkeypatch.delenv('SECRETS_PATH', raising=False)
+
+        with pytest.raises(ConfigError):
+            LocalTokenVerifier.from_settings(LocalJwtSettings(enabled=True))
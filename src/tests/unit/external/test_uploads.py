@@ -0,0 +1,264 @@
+import io
+
+import httpx
+import pytest
+from fastapi import Request, UploadFile, status
+from starlette.datastructures import Headers
+
+from app.external.auth import AuthServiceClient
+from app.external.clients import clients
+from app.external.pool import Client
+from app.external.uploads import MultipartRelay
+from app.system.errors import PayloadTooLargeError, UnprocessableError
+from config.config import VerifyUploadSettings
+
+chunk_size = 7
+upload_settings = VerifyUploadSettings(max_size=1024, max_field_size=100)
+renames = {'upload_file': 'image'}
+upload = httpx.Request(
+    'POST',
+    'http://gateway/auth/verify',
+    data={'username': 'george'},
+    files={'upload_file': ('face.png', b'image-bytes' * 10, 'image/png')},
+)
+upload_body = upload.read()
+expected_body = upload_body.replace(b'name="upload_file"', b'name="image"')
+
+
+def make_request(body: bytes, headers: dict[str, str]) -> Request:
+    """Создает запрос, тело которого приходит частями по chunk_size."""
+    chunks = [
+        body[position:position + chunk_size]
+        for position in range(0, len(body), chunk_size)
+    ]
+    messages = [
+        {'type': 'http.request', 'body': chunk, 'more_body': True}
+        for chunk in chunks
+    ]
+    messages.append({'type': 'http.request', 'body': b'', 'more_body': False})
+
+    async def receive():  # noqa: WPS430 test receive channel
+        return messages.pop(0)
+
+    scope = {
+        'type': 'http',
+        'method': 'POST',
+        'headers': [
+            (name.lower().encode(), header.encode())
+            for name, header in headers.items()
+        ],
+    }
+    return Request(scope, receive)
+
+
+def make_upload_request(
+    body: bytes = upload_body, content_length: int | None = None,
+) -> Request:
+    """Создает запрос с multipart телом загрузки."""
+    headers = {'Content-Type': upload.headers['Content-Type']}
+    if content_length is not None:
+        headers['Content-Length'] = str(content_length)
+    return make_request(body, headers)
+
+
+async def read_relay(relay: MultipartRelay) -> bytes:
+    """Читает все тело, передаваемое внешнему сервису."""
+    return b''.join([chunk async for chunk in relay])
+
+
+class TestMultipartRelay:
+    """Тестирует потоковую передачу multipart тела."""
+
+    @pytest.mark.asyncio
+    async def test_relay(self):
+        """Тестирует передачу тела с переименованием части."""
+        relay = MultipartRelay(
+            make_upload_request(), upload_settings, renames,
+        )
+
+        assert await read_relay(relay) == expected_body
+        assert relay.fields == {'username': 'george'}
+        assert relay.content_type == upload.headers['Content-Type']
+
+    @pytest.mark.parametrize(
+        'headers',
+        (
+            pytest.param({'Content-Type': 'application/json'}, id='json'),
+            pytest.param(
+                {'Content-Type': 'multipart/form-data'}, id='no boundary',
+            ),
+        ),
+    )
+    def test_not_multipart(self, headers):
+        """Тестирует отказ для тела не в формате multipart."""
+        with pytest.raises(UnprocessableError):
+            MultipartRelay(
+                make_request(upload_body, headers), upload_settings, renames,
+            )
+
+    def test_content_length_rejected(self):
+        """Тестирует отказ до чтения тела по заголовку Content-Length."""
+        request = make_upload_request(
+            content_length=upload_settings.max_size + 1,
+        )
+
+        with pytest.raises(PayloadTooLargeError):
+            MultipartRelay(request, upload_settings, renames)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'verify_upload, expected_error',
+        (
+            pytest.param(
+                VerifyUploadSettings(max_size=len(upload_body) - 1),
+                PayloadTooLargeError,
+                id='body too large',
+            ),
+            pytest.param(
+                VerifyUploadSettings(max_field_size=1),
+                PayloadTooLargeError,
+                id='field too large',
+            ),
+        ),
+    )
+    async def test_streamed_size_rejected(self, verify_upload, expected_error):
+        """Тестирует отказ при превышении размера во время передачи."""
+        relay = MultipartRelay(make_upload_request(), verify_upload, renames)
+
+        with pytest.raises(expected_error):
+            await read_relay(relay)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'body',
+        (
+            pytest.param(upload_body[:-chunk_size], id='truncated'),
+            pytest.param(b'garbage', id='garbage'),
+        ),
+    )
+    async def test_invalid_body(self, body):
+        """Тестирует отказ для неполного или неверного тела."""
+        relay = MultipartRelay(
+            make_upload_request(body), upload_settings, renames,
+        )
+
+        with pytest.raises(UnprocessableError):
+            await read_relay(relay)
+
+
+class TestVerify:
+    """Тестирует верификацию пользователя с чтением изображения целиком."""
+
+    @pytest.mark.asyncio
+    async def test_client(self):
+        """Тестирует передачу изображения сервису auth."""
+        received = []
+
+        def respond(request):  # noqa: WPS430 test transport
+            received.append(request)
+            return httpx.Response(status.HTTP_200_OK)
+
+        auth_client = AuthServiceClient(
+            Client(
+                base_url='http://auth',
+                transport=httpx.MockTransport(respond),
+            ),
+        )
+        await auth_client.client.start()
+        upload_file = UploadFile(
+            io.BytesIO(b'image'),
+            filename='face.png',
+            headers=Headers({'content-type': 'image/png'}),
+        )
+
+        message = await auth_client.verify('george', upload_file)
+
+        assert message == {'message': 'ok'}
+        body = received[0].read()
+        assert b'name="image"; filename="face.png"' in body
+        assert b'Content-Type: image/png' in body
+        assert b'\r\n\r\nimage\r\n' in body
+
+
+class TestVerifyStream:
+    """Тестирует потоковую верификацию пользователя."""
+
+    @pytest.mark.asyncio
+    async def test_client(self):
+        """Тестирует передачу тела сервису auth."""
+        received = []
+
+        def respond(request):  # noqa: WPS430 test transport
+            received.append(request)
+            return httpx.Response(status.HTTP_200_OK)
+
+        auth_client = AuthServiceClient(
+            Client(
+                base_url='http://auth',
+                transport=httpx.MockTransport(respond),
+            ),
+            verify_upload=upload_settings,
+        )
+        await auth_client.client.start()
+
+        message = await auth_client.verify_stream(make_upload_request())
+
+        assert message == {'message': 'ok'}
+        assert received[0].url.path == '/verify'
+        assert received[0].content == expected_body
+        assert received[0].headers['Content-Type'] == (
+            upload.headers['Content-Type']
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.anyio
+    @pytest.mark.parametrize(
+        'verify_upload, expected_status, expected_paths',
+        (
+            pytest.param(
+                upload_settings,
+                status.HTTP_200_OK,
+                ['/check_token', '/verify'],
+                id='uploaded',
+            ),
+            pytest.param(
+                VerifyUploadSettings(max_size=1),
+                status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                ['/check_token'],
+                id='rejected before upload',
+            ),
+        ),
+    )
+    async def test_handler(  # noqa: WPS211 test parameters
+        self,
+        monkeypatch,
+        test_client,
+        verify_upload,
+        expected_status,
+        expected_paths,
+    ):
+        """Тестирует хэндлер auth/verify в потоковом режиме."""
+        paths = []
+
+        def respond(request):  # noqa: WPS430 test transport
+            paths.append(request.url.path)
+            return httpx.Response(status.HTTP_200_OK)
+
+        upstream = Client(
+            base_url='http://auth', transport=httpx.MockTransport(respond),
+        )
+        await upstream.start()
+        monkeypatch.setattr(clients.auth_client, 'client', upstream)
+        monkeypatch.setattr(
+            clients.auth_client, 'verify_upload', verify_upload,
+        )
+
+        response = await test_client.post(
+            'auth/verify',
+            data={'username': 'george'},
+            files={'upload_file': ('face.png', b'image', 'image/png')},
+            headers={'Authorization': 'Bearer token'},
+        )
+
+        assert response.status_code == expected_status
+        assert paths == expected_paths
@@ -0,0 +1 @@
+"""Тесты пакета app.metrics."""
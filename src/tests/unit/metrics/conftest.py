@@ -0,0 +1,11 @@
+import opentracing
+import pytest
+from opentracing.mocktracer import MockTracer
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    """Подменяет глобальный трейсер тестовым."""
+    mock_tracer = MockTracer()
+    monkeypatch.setattr(opentracing, 'tracer', mock_tracer)
+    return mock_tracer
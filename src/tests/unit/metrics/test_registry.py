@@ -0,0 +1,84 @@
+import pytest
+from fastapi import status
+
+from app.metrics.registry import Counter, Gauge, Histogram, Metric, Registry
+
+buckets = (0.1, 1)
+
+
+class TestMetrics:
+    """Тестирует метрики."""
+
+    def test_counter(self):
+        """Тестирует выгрузку счетчика."""
+        counter = Counter('requests_total', 'Requests.', ('route',))
+        counter.labels('/a').inc()
+        counter.labels('/a').inc()
+
+        assert list(counter.collect()) == [
+            '# HELP requests_total Requests.\n# TYPE requests_total counter',
+            'requests_total{route="/a"} 2',
+        ]
+
+    def test_gauge(self):
+        """Тестирует выгрузку датчика без меток."""
+        gauge = Gauge('in_flight', 'In flight.')
+        gauge.labels().inc()
+        gauge.labels().dec()
+        gauge.labels().set(3)
+
+        assert list(gauge.collect())[1:] == ['in_flight 3']
+
+    def test_histogram(self):
+        """Тестирует выгрузку гистограммы."""
+        histogram = Histogram('latency', 'Latency.', ('route',), buckets)
+        for latency in (0.1, 0.5, 2):
+            histogram.labels('/a').observe(latency)
+
+        assert list(histogram.collect())[1:] == [
+            'latency_bucket{route="/a",le="0.1"} 1',
+            'latency_bucket{route="/a",le="1"} 2',
+            'latency_bucket{route="/a",le="+Inf"} 3',
+            'latency_sum{route="/a"} 2.6',
+            'latency_count{route="/a"} 3',
+        ]
+
+    def test_labels_reused(self):
+        """Тестирует переиспользование значения метрики."""
+        counter = Counter('requests_total', 'Requests.', ('status',))
+
+        assert counter.labels(status.HTTP_200_OK) is counter.labels(
+            status.HTTP_200_OK,
+        )
+
+    def test_label_escaping(self):
+        """Тестирует экранирование значений меток."""
+        counter = Counter('requests_total', 'Requests.', ('route',))
+        counter.labels('{0}\n'.format(r'a"b\c')).inc()
+
+        assert list(counter.collect())[1] == (
+            r'requests_total{route="a\"b\\c\n"} 1'
+        )
+
+    def test_wrong_labels(self):
+        """Тестирует ошибку при неверном числе меток."""
+        counter = Counter('requests_total', 'Requests.', ('route',))
+
+        with pytest.raises(ValueError, match='expects labels'):
+            counter.labels('/a', status.HTTP_200_OK)
+
+
+def test_registry_render():
+    """Тестирует выгрузку набора метрик."""
+    gauge = Gauge('in_flight', 'In flight.')
+    gauge.labels().set(1)
+
+    rendered = Registry(gauge).render()
+
+    assert rendered.endswith('in_flight 1\n')
+
+
+def test_incomplete_metric():
+    """Тестирует ошибку создания метрики без значений и выгрузки."""
+    with pytest.raises(TypeError, match='abstract'):
+        Metric('requests_total', 'Requests.')  # type: ignore[abstract]
@@ -0,0 +1,92 @@
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import status
+
+from app.metrics import sampling
+from app.metrics.tracing import ChildSpan
+from config.config import TracingSettings
+
+max_traces_per_second = 2
+sample_rate = 0.5
+random_step = 0.1
+
+
+class TestSamplers:
+    """Тестирует выборки запросов для трейсинга."""
+
+    @pytest.mark.parametrize(
+        'tracing, expected_type',
+        (
+            pytest.param(
+                TracingSettings(), sampling.ConstSampler, id='const',
+            ),
+            pytest.param(
+                TracingSettings(sampler_type='probabilistic'),
+                sampling.ProbabilisticSampler,
+                id='probabilistic',
+            ),
+            pytest.param(
+                TracingSettings(sampler_type='ratelimiting'),
+                sampling.RateLimitingSampler,
+                id='rate limiting',
+            ),
+        ),
+    )
+    def test_make_sampler(self, tracing, expected_type):
+        """Тестирует создание выборки по конфигурации."""
+        assert sampling.make_sampler(tracing).__class__ is expected_type
+
+    def test_unknown_sampler(self):
+        """Тестирует ошибку при неизвестном типе выборки."""
+        with pytest.raises(ValueError, match='unknown'):
+            sampling.make_sampler(TracingSettings(sampler_type='unknown'))
+
+    def test_probabilistic(self, monkeypatch):
+        """Тестирует выборку с заданной вероятностью."""
+        sampler = sampling.ProbabilisticSampler(rate=sample_rate)
+        draw = MagicMock(return_value=sample_rate - random_step)
+        monkeypatch.setattr(sampling.random, 'random', draw)
+        assert sampler.is_sampled()
+        draw.return_value = sample_rate + random_step
+        assert not sampler.is_sampled()
+
+    def test_rate_limiting(self, monkeypatch):
+        """Тестирует ограничение числа трейсов в секунду."""
+        now = MagicMock(return_value=0)
+        monkeypatch.setattr(sampling.time, 'monotonic', now)
+        sampler = sampling.RateLimitingSampler(max_traces_per_second)
+
+        decisions = [sampler.is_sampled() for _ in range(3)]
+        now.return_value = 1 / max_traces_per_second
+
+        assert decisions == [True, True, False]
+        assert sampler.is_sampled()
+        assert not sampler.is_sampled()
+
+
+class TestChildSpan:
+    """Тестирует дочерние спаны операций."""
+
+    def test_without_active_span(self, tracer):
+        """Тестирует отсутствие спана вне выборки."""
+        serialize = MagicMock()
+
+        with ChildSpan('operation') as span:
+            span.set_tag('data', serialize)
+
+        serialize.assert_not_called()
+        assert not tracer.finished_spans()
+
+    def test_with_active_span(self, tracer):
+        """Тестирует спан с отложенным вычислением тега."""
+        with tracer.start_active_span('request'):
+            with ChildSpan('operation') as span:
+                span.set_tag('data', lambda: 'serialized')
+                span.set_tag('status', status.HTTP_200_OK)
+
+        child = tracer.finished_spans()[0]
+        assert child.operation_name == 'operation'
+        assert child.tags == {
+            'data': 'serialized', 'status': status.HTTP_200_OK,
+        }
@@ -0,0 +1,166 @@
+import opentracing
+import pytest
+from fastapi import FastAPI, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from httpx import AsyncClient
+from jaeger_client import SpanContext
+from jaeger_client.codecs import TextCodec
+from opentracing import tags as span_tags
+
+from app.metrics.tracing import TracingMiddleware, is_business_route
+from config.config import TracingSettings
+
+test_app = FastAPI()
+traced = True
+excluded = False
+unsampled_settings = TracingSettings(
+    sampler_param=0, slow_request_threshold=0,
+)
+
+
+@test_app.get('/healthz/up')
+@test_app.get('/items')
+async def get_items() -> dict[str, str]:
+    """Бизнес маршрут тестового приложения."""
+    return {'message': 'ok'}
+
+
+@test_app.get('/items/stream')
+async def stream_items() -> StreamingResponse:
+    """Потоковый маршрут тестового приложения."""
+    async def body():  # noqa: WPS430 test body
+        span = opentracing.global_tracer().active_span
+        yield b'open' if span is not None else b'closed'
+    return StreamingResponse(body())
+
+
+@test_app.get('/items/error')
+async def get_error(crash: bool = False) -> JSONResponse:
+    """Маршрут тестового приложения, завершающийся ошибкой."""
+    if crash:
+        raise RuntimeError('crash')
+    return JSONResponse(
+        {'detail': 'error'}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+
+
+def make_client(tracing: TracingSettings) -> AsyncClient:
+    """Создает клиент приложения с middleware трейсинга."""
+    return AsyncClient(
+        app=TracingMiddleware(test_app, tracing), base_url='http://test',
+    )
+
+
+@pytest.fixture
+def traced_client():
+    """Создает клиент приложения, трейсящего все запросы."""
+    return make_client(TracingSettings())
+
+
+class TestTracingMiddleware:
+    """Тестирует middleware трейсинга."""
+
+    @pytest.mark.parametrize(
+        'path, expected',
+        (
+            pytest.param('/items', traced, id='business route'),
+            pytest.param('/healthz/ready', excluded, id='healthz'),
+            pytest.param('/metrics', excluded, id='metrics'),
+        ),
+    )
+    def test_is_business_route(self, path, expected):
+        """Тестирует определение служебных маршрутов."""
+        assert is_business_route(path) is expected
+
+    @pytest.mark.asyncio
+    async def test_span(self, tracer, traced_client):
+        """Тестирует спан запроса к бизнес маршруту."""
+        response = await traced_client.get('/items?page=1')
+
+        assert response.status_code == status.HTTP_200_OK
+        span = tracer.finished_spans()[0]
+        assert span.operation_name == 'api_gateway_GET_/items'
+        assert span.tags[span_tags.HTTP_URL] == 'http://test/items?page=1'
+        assert span.tags[span_tags.HTTP_STATUS_CODE] == status.HTTP_200_OK
+        assert span.tags[span_tags.SPAN_KIND] == span_tags.SPAN_KIND_RPC_SERVER
+
+    @pytest.mark.asyncio
+    async def test_excluded_route(self, tracer, traced_client):
+        """Тестирует отсутствие спана для служебного маршрута."""
+        await traced_client.get('/healthz/up')
+
+        assert not tracer.finished_spans()
+
+    @pytest.mark.asyncio
+    async def test_streaming_response(self, tracer, traced_client):
+        """Тестирует закрытие спана после отправки потокового ответа."""
+        response = await traced_client.get('/items/stream')
+
+        assert response.content == b'open'
+        assert len(tracer.finished_spans()) == 1
+
+    @pytest.mark.asyncio
+    async def test_unsampled_parent(self, tracer, traced_client):
+        """Тестирует отсутствие спана, если родитель не в выборке."""
+        headers = {}
+        TextCodec(url_encoding=True).inject(
+            SpanContext(trace_id=1, span_id=1, parent_id=None, flags=0),
+            headers,
+        )
+        tracer.register_propagator(
+            opentracing.Format.HTTP_HEADERS, TextCodec(url_encoding=True),
+        )
+
+        await traced_client.get('/items', headers=headers)
+
+        assert not tracer.finished_spans()
+
+
+class TestTailSampling:
+    """Тестирует трейсинг запросов вне выборки."""
+
+    @pytest.mark.asyncio
+    async def test_unsampled_request(self, tracer):
+        """Тестирует отсутствие спана для запроса вне выборки."""
+        await make_client(unsampled_settings).get('/items')
+
+        assert not tracer.finished_spans()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'tracing, path, expected_reason',
+        (
+            pytest.param(
+                unsampled_settings, '/items/error', 'error', id='error',
+            ),
+            pytest.param(
+                unsampled_settings.model_copy(
+                    update={'slow_request_threshold': 1e-9},
+                ),
+                '/items',
+                'slow',
+                id='slow request',
+            ),
+        ),
+    )
+    async def test_notable_request(
+        self, tracer, tracing, path, expected_reason,
+    ):
+        """Тестирует спан для ошибки или медленного запроса вне выборки."""
+        await make_client(tracing).get(path)
+
+        span = tracer.finished_spans()[0]
+        assert span.tags['sampling.reason'] == expected_reason
+        assert span.tags[span_tags.SAMPLING_PRIORITY] == 1
+
+    @pytest.mark.asyncio
+    async def test_unsampled_exception(self, tracer):
+        """Тестирует спан для запроса вне выборки с исключением."""
+        with pytest.raises(RuntimeError):
+            await make_client(unsampled_settings).get('/items/error?crash=true')
+
+        span = tracer.finished_spans()[0]
+        assert span.tags[span_tags.ERROR] is True
+        assert span.tags[span_tags.HTTP_STATUS_CODE] == (
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
@@ -0,0 +1,254 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import status
+from fastapi.responses import JSONResponse
+
+from app.system import errors
+from app.system.admission import AdaptiveLimiter, AdmissionMiddleware
+from app.system.deadline import DeadlineMiddleware
+from config.config import AdmissionSettings, DeadlineSettings
+
+test_admission = AdmissionSettings(
+    initial_limit=2,
+    min_limit=1,
+    max_limit=4,
+    target_latency=0.1,
+    target_latencies={0: 0.005},
+    max_adaptive_priority=2,
+    max_queue=2,
+    max_wait=0.5,
+    retry_after=3,
+)
+fast = 0.01
+slow = 1
+decreased_limit = 1.8
+increased_limit = 2.5
+expired = 'expired'
+request_budget = 0.05
+test_deadlines = DeadlineSettings(default_budget=request_budget)
+
+
+async def queue_request(
+    limiter: AdaptiveLimiter, priority: int, admitted: list[int],
+) -> None:
+    """Ожидает места в очереди и запоминает принятый запрос."""
+    await limiter.acquire(priority)
+    admitted.append(priority)
+
+
+async def settle() -> None:
+    """Дает ожидающим задачам выполниться."""
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def make_busy_limiter(admission: AdmissionSettings) -> AdaptiveLimiter:
+    """Создает ограничение без свободных мест."""
+    limiter = AdaptiveLimiter(admission)
+    limiter.in_flight = int(admission.initial_limit)
+    return limiter
+
+
+async def cancel(*tasks: asyncio.Task) -> None:
+    """Отменяет задачи ожидания места."""
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def make_client(app, limiter: AdaptiveLimiter) -> httpx.AsyncClient:
+    """Создает тестовый клиент для приложения с middleware."""
+    return httpx.AsyncClient(
+        app=DeadlineMiddleware(
+            AdmissionMiddleware(app, limiter=limiter),
+            deadlines=test_deadlines,
+        ),
+        base_url='http://test',
+    )
+
+
+class TestAdaptiveLimiter:
+    """Тестирует адаптивное ограничение одновременных запросов."""
+
+    @pytest.mark.asyncio
+    async def test_priority_order(self):
+        """Тестирует выдачу освободившихся мест по приоритету."""
+        limiter = make_busy_limiter(test_admission)
+        admitted: list[int] = []
+        waiters = [
+            asyncio.create_task(queue_request(limiter, priority, admitted))
+            for priority in (3, 1)
+        ]
+        await settle()
+        assert limiter.stats().queued == 2
+
+        limiter.release(0, fast, is_overloaded=False)
+        await settle()
+        limiter.release(0, fast, is_overloaded=False)
+        await asyncio.gather(*waiters)
+
+        assert admitted == [1, 3]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter(self):
+        """Тестирует пропуск отмененного ожидания при выдаче места."""
+        limiter = make_busy_limiter(test_admission)
+        admitted: list[int] = []
+        cancelled, waiting = (
+            asyncio.create_task(queue_request(limiter, priority, admitted))
+            for priority in (1, 3)
+        )
+        await settle()
+
+        cancelled.cancel()
+        limiter.release(0, fast, is_overloaded=False)
+        await asyncio.gather(cancelled, waiting, return_exceptions=True)
+
+        assert admitted == [3]
+        assert limiter.stats().in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_shedding(self):
+        """Тестирует вытеснение и отклонение при полной очереди."""
+        limiter = make_busy_limiter(test_admission)
+        lowest, highest = (
+            asyncio.create_task(limiter.acquire(priority))
+            for priority in (3, 1)
+        )
+        await settle()
+
+        with pytest.raises(errors.OverloadedError):
+            await limiter.acquire(3)
+        urgent = asyncio.create_task(limiter.acquire(0))
+        await settle()
+
+        with pytest.raises(errors.OverloadedError, match='503'):
+            await lowest
+        assert limiter.stats().rejected == {3: 2}
+        await cancel(highest, urgent)
+        assert limiter.stats().queued == 0
+
+    @pytest.mark.asyncio
+    async def test_wait_timeout(self):
+        """Тестирует отклонение после предельного времени ожидания."""
+        limiter = make_busy_limiter(
+            test_admission.model_copy(update={'max_wait': fast}),
+        )
+
+        with pytest.raises(errors.OverloadedError):
+            await limiter.acquire(1)
+        assert limiter.stats().queued == 0
+        assert limiter.stats().in_flight == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'priority, latency, outcome, expected_limit',
+        (
+            pytest.param(
+                1, fast, expired, decreased_limit, id='deadline exceeded',
+            ),
+            pytest.param(1, slow, 'ok', decreased_limit, id='slow response'),
+            pytest.param(1, fast, 'ok', increased_limit, id='fast response'),
+            pytest.param(
+                0, fast, 'ok', decreased_limit, id='priority target',
+            ),
+            pytest.param(3, slow, expired, 2, id='not adaptive priority'),
+        ),
+    )
+    async def test_limit_adaptation(
+        self, priority, latency, outcome, expected_limit,
+    ):
+        """Тестирует изменение предела по результату запроса."""
+        limiter = make_busy_limiter(test_admission)
+
+        limiter.release(priority, latency, is_overloaded=outcome == expired)
+
+        assert limiter.limit == pytest.approx(expected_limit)
+
+    @pytest.mark.asyncio
+    async def test_decrease_interval(self):
+        """Тестирует уменьшение предела не чаще раза за интервал."""
+        limiter = AdaptiveLimiter(test_admission)
+        for _ in range(10):
+            await limiter.acquire(0)
+            limiter.release(0, slow, is_overloaded=True)
+
+        assert limiter.limit == pytest.approx(decreased_limit)
+
+    @pytest.mark.asyncio
+    async def test_limit_bounds(self):
+        """Тестирует границы предела."""
+        limiter = AdaptiveLimiter(
+            test_admission.model_copy(update={'decrease_interval': 0}),
+        )
+        for _ in range(100):
+            await limiter.acquire(0)
+            limiter.release(0, slow, is_overloaded=True)
+
+        assert limiter.limit == test_admission.min_limit
+
+
+class TestAdmissionMiddleware:
+    """Тестирует middleware ограничения одновременных запросов."""
+
+    @pytest.mark.asyncio
+    async def test_admitted(self):
+        """Тестирует обработку запроса при наличии места."""
+        limiter = AdaptiveLimiter(test_admission)
+        async with make_client(JSONResponse({}), limiter) as client:
+            response = await client.get('/items')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert limiter.stats().in_flight == 0
+        assert limiter.stats().admitted == 1
+
+    @pytest.mark.asyncio
+    async def test_overloaded(self):
+        """Тестирует ответ 503 с Retry-After при перегрузке."""
+        limiter = make_busy_limiter(
+            test_admission.model_copy(update={'max_queue': 0}),
+        )
+        async with make_client(JSONResponse({}), limiter) as client:
+            response = await client.get('/items')
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers['Retry-After'] == '3'
+
+    @pytest.mark.asyncio
+    async def test_upstream_status(self):
+        """Тестирует, что ответ 503 приложения не уменьшает предел."""
+        limiter = AdaptiveLimiter(test_admission)
+        upstream_failure = JSONResponse(
+            {}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+        async with make_client(upstream_failure, limiter) as client:
+            await client.get('/items')
+
+        assert limiter.limit == test_admission.initial_limit
+
+    @pytest.mark.asyncio
+    async def test_deadline_exceeded(self):
+        """Тестирует уменьшение предела при превышении срока запроса."""
+        limiter = AdaptiveLimiter(test_admission)
+
+        async def expired_app(scope, receive, send):  # noqa: WPS430 for tests
+            await asyncio.sleep(slow)
+
+        async with make_client(expired_app, limiter) as client:
+            response = await client.get('/items')
+
+        assert response.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+        assert limiter.limit < test_admission.initial_limit
+        assert limiter.stats().in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_wait_in_deadline(self):
+        """Тестирует учет ожидания в очереди в сроке запроса."""
+        limiter = make_busy_limiter(test_admission)
+        async with make_client(JSONResponse({}), limiter) as client:
+            response = await client.get('/items')
+
+        assert response.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+        assert limiter.stats().queued == 0
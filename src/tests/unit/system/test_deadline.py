@@ -0,0 +1,237 @@
+import asyncio
+import time
+from contextlib import contextmanager
+
+import httpx
+import pytest
+from fastapi import status
+from fastapi.responses import JSONResponse
+
+from app.external.pool import Client
+from app.external.service_client import ServiceClient
+from app.system import deadline, errors
+from config.config import DeadlineSettings
+
+route_budget = 0.05
+header_budget = 0.2
+test_deadlines = DeadlineSettings(
+    default_budget=1, routes={'/slow': route_budget},
+)
+upstream_budget = 0.5
+
+
+@contextmanager
+def deadline_in(seconds: float):
+    """Задает срок обработки запроса на время блока."""
+    token = deadline.current_deadline.set(time.monotonic() + seconds)
+    yield
+    deadline.current_deadline.reset(token)
+
+
+class ScriptedApp:
+    """Тестовое приложение с задержками до и после начала ответа."""
+
+    def __init__(
+        self,
+        delay: float = 0,
+        body_delay: float = 0,
+        error: Exception | None = None,
+    ) -> None:
+        """Метод инициализации."""
+        self.delay = delay
+        self.body_delay = body_delay
+        self.error = error
+
+    async def __call__(self, scope, receive, send):
+        """Отвечает после задержек или завершается ошибкой."""
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        await send({
+            'type': 'http.response.start',
+            'status': status.HTTP_200_OK,
+        })
+        await asyncio.sleep(self.body_delay)
+        await send({'type': 'http.response.body', 'body': b'complete'})
+
+
+async def budget_app(scope, receive, send):
+    """Тестовое приложение, возвращающее оставшееся время."""
+    await JSONResponse({'remaining': deadline.remaining()})(
+        scope, receive, send,
+    )
+
+
+def make_client(app, settings: DeadlineSettings) -> httpx.AsyncClient:
+    """Создает тестовый клиент для приложения с middleware."""
+    return httpx.AsyncClient(
+        app=deadline.DeadlineMiddleware(app, deadlines=settings),
+        base_url='http://test',
+    )
+
+
+class TestDeadlineMiddleware:
+    """Тестирует middleware сроков обработки запросов."""
+
+    @pytest.mark.asyncio
+    async def test_timeout_response(self):
+        """Тестирует ответ 504 при истечении бюджета маршрута."""
+        async with make_client(ScriptedApp(delay=1), test_deadlines) as client:
+            response = await client.get('/slow')
+
+        assert response.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+        assert response.json() == {
+            'detail': errors.GatewayTimeoutError().detail,
+        }
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'path, headers, expected',
+        (
+            pytest.param('/fast', {}, 1, id='default budget'),
+            pytest.param('/slow', {}, route_budget, id='route budget'),
+            pytest.param(
+                '/fast',
+                {deadline.deadline_header: '200'},
+                header_budget,
+                id='header reduces budget',
+            ),
+            pytest.param(
+                '/slow',
+                {deadline.deadline_header: '200'},
+                route_budget,
+                id='header does not extend budget',
+            ),
+            pytest.param(
+                '/fast',
+                {deadline.deadline_header: 'invalid'},
+                1,
+                id='invalid header',
+            ),
+        ),
+    )
+    async def test_budget(self, path, headers, expected):
+        """Тестирует выбор бюджета времени обработки запроса."""
+        async with make_client(budget_app, test_deadlines) as client:
+            response = await client.get(path, headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        remaining = response.json()['remaining']
+        assert expected - route_budget < remaining <= expected
+
+    @pytest.mark.asyncio
+    async def test_started_response(self):
+        """Тестирует, что срок не обрывает начатый ответ."""
+        async with make_client(
+            ScriptedApp(body_delay=route_budget * 2), test_deadlines,
+        ) as client:
+            response = await client.get('/slow')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == b'complete'
+
+    @pytest.mark.asyncio
+    async def test_foreign_timeout(self):
+        """Тестирует, что чужой TimeoutError не превращается в 504."""
+        async with make_client(
+            ScriptedApp(error=TimeoutError('upstream')), test_deadlines,
+        ) as client:
+            with pytest.raises(TimeoutError, match='upstream'):
+                await client.get('/slow')
+
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        """Тестирует работу без ограничения времени обработки."""
+        settings = DeadlineSettings(enabled=False)
+        async with make_client(budget_app, settings) as client:
+            response = await client.get('/slow')
+
+        assert response.json() == {'remaining': None}
+
+
+class TestDeadline:
+    """Тестирует функции проверки срока обработки запроса."""
+
+    def test_without_deadline(self):
+        """Тестирует проверки без заданного срока."""
+        assert deadline.remaining() is None
+        assert deadline.check() is None
+        assert not deadline.is_expired()
+
+    def test_expired(self):
+        """Тестирует проверки при истекшем сроке."""
+        with deadline_in(-1):
+            assert deadline.is_expired()
+            with pytest.raises(errors.GatewayTimeoutError):
+                deadline.check()
+
+
+class TestDeadlinePropagation:
+    """Тестирует передачу срока обработки во внешние сервисы."""
+
+    @pytest.mark.asyncio
+    async def test_upstream_timeout_and_header(self):
+        """Тестирует таймаут и заголовок запроса к внешнему сервису."""
+        requests = []
+
+        def respond(request):  # noqa: WPS430 test transport
+            requests.append(request)
+            return httpx.Response(status.HTTP_200_OK)
+
+        client = Client(
+            base_url='http://test-service',
+            transport=httpx.MockTransport(respond),
+        )
+        await client.start()
+        with deadline_in(upstream_budget):
+            await client.get('/healthz/ready')
+
+        header = int(requests[0].headers[deadline.deadline_header])
+        assert header <= upstream_budget * deadline.milliseconds_in_second
+        read_timeout = requests[0].extensions['timeout']['read']
+        assert read_timeout <= upstream_budget
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_expired_before_call(self):
+        """Тестирует отказ от запроса при истекшем сроке."""
+        service_client = ServiceClient(Client())
+        with deadline_in(-1):
+            with pytest.raises(errors.GatewayTimeoutError):
+                await service_client.is_ready()
+        assert service_client.client.stats().requests_total == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'error, expected_error',
+        (
+            pytest.param(
+                httpx.ReadTimeout('timeout'),
+                errors.UpstreamTimeoutError,
+                id='sent',
+            ),
+            pytest.param(
+                httpx.ConnectError('refused'),
+                errors.GatewayTimeoutError,
+                id='unsent',
+            ),
+        ),
+    )
+    async def test_expired_during_call(self, error, expected_error):
+        """Тестирует ответ 504 при ошибке соединения после срока."""
+        def expire(request):  # noqa: WPS430 test transport
+            deadline.current_deadline.set(time.monotonic() - 1)
+            raise error
+
+        service_client = ServiceClient(
+            Client(
+                base_url='http://test-service',
+                transport=httpx.MockTransport(expire),
+            ),
+        )
+        await service_client.client.start()
+        with deadline_in(1):
+            with pytest.raises(
+                errors.GatewayTimeoutError, match=expected_error().detail,
+            ):
+                await service_client.is_ready()
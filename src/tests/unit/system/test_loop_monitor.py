@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+import pytest
+from anyio.to_thread import run_sync
+
+from app.system.loop_monitor import LoopMonitor
+from config.config import LoopMonitorSettings
+
+interval = 0.01
+block_threshold = 0.05
+block_duration = 0.2
+test_settings = LoopMonitorSettings(
+    interval=interval, block_threshold=block_threshold,
+)
+
+
+def blocking_call() -> None:
+    """Блокирует цикл событий."""
+    time.sleep(block_duration)
+
+
+class TestLoopMonitor:
+    """Тестирует монитор цикла событий."""
+
+    @pytest.mark.asyncio
+    async def test_blocking_call(self):
+        """Тестирует снимок стека блокирующего вызова."""
+        monitor = LoopMonitor(test_settings)
+        monitor.start()
+        await asyncio.sleep(block_threshold)
+
+        blocking_call()
+        await asyncio.sleep(block_threshold)
+        await monitor.stop()
+
+        stats = monitor.stats()
+        assert stats.stalls >= 1
+        assert stats.max_lag >= block_threshold
+        blocked_call = stats.blocked_calls[-1]
+        assert 'blocking_call' in ''.join(blocked_call.stack)
+        assert blocked_call.blocked_for >= block_threshold
+
+    @pytest.mark.asyncio
+    async def test_threadpool(self):
+        """Тестирует учет занятости пула потоков."""
+        monitor = LoopMonitor(test_settings)
+        monitor.start()
+
+        task = asyncio.create_task(run_sync(time.sleep, block_threshold))
+        await asyncio.sleep(block_threshold / 2)
+        stats = monitor.stats()
+        await task
+        await monitor.stop()
+
+        assert stats.threadpool_limit > 0
+        assert stats.threadpool_in_use >= 1
+        assert not monitor.stats().is_running
+
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        """Тестирует выключенный мониторинг."""
+        monitor = LoopMonitor(LoopMonitorSettings(enabled=False))
+
+        monitor.start()
+        await monitor.stop()
+
+        assert not monitor.stats().is_running
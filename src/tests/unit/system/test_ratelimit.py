@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+from fastapi import status
+from pydantic import ValidationError
+
+from app.system import errors
+from app.system.ratelimit import LocalBucketStore, RateLimiter
+from config.config import BucketSettings, RateLimitSettings, get_settings
+from tests.unit.api.test_handlers import (
+    stub_resp_body,
+    valid_request_body,
+    valid_request_headers,
+)
+
+fast_bucket = BucketSettings(rate=100, burst=2)
+slow_bucket = BucketSettings(rate=0.5, burst=1)
+route = '/items'
+test_rate_limits = RateLimitSettings(routes={route: slow_bucket})
+login_bucket = get_settings().rate_limits.routes['/auth/login']
+
+
+class TestLocalBucketStore:
+    """Тестирует хранилище корзин токенов в памяти процесса."""
+
+    @pytest.mark.asyncio
+    async def test_take(self):
+        """Тестирует расход и пополнение токенов."""
+        store = LocalBucketStore(max_buckets=100)
+
+        waits = [await store.take('user', fast_bucket) for _ in range(3)]
+        await asyncio.sleep(waits[-1])
+
+        assert waits[:2] == [0, 0]
+        assert 0 < waits[-1] <= 1 / fast_bucket.rate
+        assert await store.take('user', fast_bucket) == 0
+
+    @pytest.mark.asyncio
+    async def test_workers_share(self):
+        """Тестирует долю корзины одного из процессов сервиса."""
+        store = LocalBucketStore(max_buckets=100, workers=2)
+
+        waits = [await store.take('user', fast_bucket) for _ in range(2)]
+
+        assert waits[0] == 0
+        assert waits[1] > 0
+
+    @pytest.mark.asyncio
+    async def test_max_buckets(self):
+        """Тестирует ограничение числа корзин."""
+        store = LocalBucketStore(max_buckets=2)
+
+        for key in ('first', 'second', 'third'):
+            await store.take(key, slow_bucket)
+
+        assert len(store) == 2
+
+    @pytest.mark.asyncio
+    async def test_idle_eviction(self):
+        """Тестирует удаление наполнившихся корзин."""
+        store = LocalBucketStore(max_buckets=100)
+        await store.take('idle', fast_bucket)
+        await asyncio.sleep(1 / fast_bucket.rate)
+
+        await store.take('active', fast_bucket)
+
+        assert len(store) == 1
+
+
+@pytest.mark.parametrize(
+    'bucket',
+    (
+        pytest.param({'rate': 0}, id='zero rate'),
+        pytest.param({'burst': -1}, id='negative burst'),
+    ),
+)
+def test_invalid_bucket(bucket):
+    """Тестирует отказ в загрузке конфигурации корзины без токенов."""
+    with pytest.raises(ValidationError):
+        RateLimitSettings(routes={route: bucket})
+
+
+class TestRateLimiter:
+    """Тестирует ограничение частоты запросов по ключам."""
+
+    @pytest.mark.asyncio
+    async def test_check(self):
+        """Тестирует отклонение запроса при пустой корзине ключа."""
+        limiter = RateLimiter(test_rate_limits)
+        await limiter.check(route, 'user')
+        await limiter.check(route, 'other user')
+
+        with pytest.raises(errors.TooManyRequestsError, match='429'):
+            await limiter.check(route, 'user')
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'rate_limits, checked_route',
+        (
+            pytest.param(test_rate_limits, '/other', id='route not limited'),
+            pytest.param(
+                test_rate_limits.model_copy(update={'enabled': False}),
+                route,
+                id='disabled',
+            ),
+        ),
+    )
+    async def test_not_limited(self, rate_limits, checked_route):
+        """Тестирует запросы без ограничения частоты."""
+        store = LocalBucketStore(max_buckets=100)
+        limiter = RateLimiter(rate_limits, store)
+
+        for _ in range(3):
+            await limiter.check(checked_route, 'user')
+
+        assert not len(store)
+
+
+class TestRateLimitedRoutes:
+    """Тестирует ограничение частоты запросов к маршрутам сервиса."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.anyio
+    async def test_login(self, test_client, auth_client_mocker):
+        """Тестирует ответ 429 после исчерпания корзины пользователя."""
+        auth_client_mocker(status_code=status.HTTP_200_OK, json=stub_resp_body)
+        responses = [
+            await test_client.post(
+                'auth/login',
+                json=valid_request_body,
+                headers=valid_request_headers,
+            )
+            for _ in range(int(login_bucket.burst) + 1)
+        ]
+
+        assert all(
+            resp.status_code == status.HTTP_200_OK for resp in responses[:-1]
+        )
+        assert responses[-1].status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert responses[-1].headers['Retry-After'] == '1'
@@ -0,0 +1,103 @@
+from datetime import datetime
+
+import pytest
+from fastapi import status
+from pydantic import ValidationError
+
+from app.api.models import Report, ReportRequest, Token, Transaction
+from app.external.payloads import ReportPayload
+from app.service import app
+from app.system import serialization
+
+report_request = ReportRequest(
+    username='max',
+    start_date=datetime(year=2024, month=1, day=1),  # noqa: WPS432 test value
+    end_date=datetime(year=2024, month=1, day=31),  # noqa: WPS432 test value
+)
+transaction = Transaction(
+    username='max',
+    amount=1,
+    transaction_type=0,
+    timestamp=datetime(year=2024, month=1, day=15),  # noqa: WPS432 test value
+)
+report = Report(request=report_request, transactions=[transaction])
+
+
+class TestSerialization:
+    """Тестирует сериализацию JSON."""
+
+    @pytest.mark.parametrize(
+        'model',
+        (
+            pytest.param(report, id='report'),
+            pytest.param(Token(token='token'), id='token'),  # noqa: S106 test
+        ),
+    )
+    def test_dump_json(self, model):
+        """Тестирует сериализацию модели в байты."""
+        assert serialization.dump_json(model) == model.model_dump_json(
+        ).encode()
+
+    def test_adapter_cached(self):
+        """Тестирует переиспользование TypeAdapter типа."""
+        assert serialization.get_adapter(Report) is serialization.get_adapter(
+            Report,
+        )
+
+    def test_validate_json(self):
+        """Тестирует разбор ответа сервиса транзакций из байтов."""
+        payload = serialization.validate_json(
+            ReportPayload, serialization.dump_json(report),
+        )
+
+        assert payload.transactions == [transaction]
+
+    @pytest.mark.parametrize(
+        'json_data',
+        (
+            pytest.param(b'{"transactions": null}', id='null transactions'),
+            pytest.param(b'{"transactions": [', id='broken json'),
+        ),
+    )
+    def test_validate_json_invalid(self, json_data):
+        """Тестирует ошибку разбора некорректного ответа."""
+        with pytest.raises(ValidationError):
+            serialization.validate_json(ReportPayload, json_data)
+
+    def test_json_request(self):
+        """Тестирует параметры запроса с телом JSON."""
+        request_kwargs = serialization.json_request(
+            report_request, {'Authorization': 'token'},
+        )
+
+        assert request_kwargs['content'] == report_request.model_dump_json(
+        ).encode()
+        assert request_kwargs['headers'] == {
+            'Content-Type': serialization.json_media_type,
+            'Authorization': 'token',
+        }
+
+
+class TestModelResponse:
+    """Тестирует ответ ModelResponse."""
+
+    def test_render(self):
+        """Тестирует тело и заголовки ответа."""
+        response = serialization.ModelResponse(
+            report, status_code=status.HTTP_201_CREATED,
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.body == serialization.dump_json(report)
+        assert response.headers['content-type'] == (
+            serialization.json_media_type
+        )
+
+    def test_openapi_schema(self):
+        """Тестирует модель ответа маршрута в документации."""
+        route = app.openapi()['paths']['/transaction/report']['post']
+        response_content = route['responses']['200']['content']
+
+        assert response_content[serialization.json_media_type]['schema'] == {
+            '$ref': '#/components/schemas/Report',
+        }